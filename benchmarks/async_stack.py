@@ -0,0 +1,162 @@
+"""同期スタックと非同期スタックの負荷ベンチマーク
+
+一時ディレクトリでアプリを1ワーカーで起動し、読み取り中心の混在リクエストを同時に送って
+リクエスト/秒とp50/p99レイテンシを比較する。
+同期スタックは変更前と同じく def ハンドラ＋同期セッション（スレッドプール上で実行）で、
+このモジュールの sync_app として同じCRUDを呼ぶ。
+
+    python -m benchmarks.async_stack --requests 5000 --concurrency 200
+"""
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from typing import List
+import httpx
+from fastapi import Depends, FastAPI
+from sqlalchemy.orm import Session
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def build_sync_app() -> FastAPI:
+    """変更前の構成（def ハンドラ＋同期セッション）で主要ルートだけを持つアプリ"""
+    import main  # noqa: F401  スキーマの作成
+    from core.database import SessionLocal, ReadSession
+    from core.ledger_writer import writer
+    from crud import coins as coin_crud
+    from crud import tasks as task_crud
+    from schemas import coins as coin_schemas
+    from schemas import tasks as task_schemas
+
+    def get_db():
+        db = SessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    def get_read_db():
+        db = ReadSession()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app = FastAPI()
+
+    @app.get("/coins/", response_model=List[coin_schemas.Coin])
+    def read_coins(limit: int = 100, db: Session = Depends(get_read_db)):
+        return coin_crud.get_coins(db, limit=limit)
+
+    @app.get("/coins/balance/")
+    def get_current_balance(db: Session = Depends(get_read_db)):
+        return {"balance": coin_crud.get_current_balance(db)}
+
+    @app.post("/coins/", response_model=coin_schemas.Coin)
+    def create_coin(coin: coin_schemas.CoinCreate):
+        return writer.run(coin_crud.create_coin, coin)
+
+    @app.get("/tasks/", response_model=List[task_schemas.Task])
+    def read_tasks(db: Session = Depends(get_read_db)):
+        return task_crud.get_tasks(db)
+
+    @app.post("/tasks/", response_model=task_schemas.Task)
+    def create_task(task: task_schemas.TaskCreate, db: Session = Depends(get_db)):
+        return task_crud.create_task(db, task)
+
+    return app
+
+if os.getenv("BENCH_SYNC_APP"):
+    sync_app = build_sync_app()
+
+def start_server(workdir: str, port: int, stack: str):
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    target = "main:app"
+    if stack == "sync":
+        env["BENCH_SYNC_APP"] = "1"
+        target = "benchmarks.async_stack:sync_app"
+    # 変更前と同じくサンプルデータが入った状態で測る
+    subprocess.run([sys.executable, os.path.join(ROOT, "manage.py"), "seed"], cwd=workdir, env=env,
+                   stdout=subprocess.DEVNULL, check=True)
+    return subprocess.Popen(
+        # 高負荷時に待機中のキープアライブ接続を切られないよう、タイムアウトを長めにする
+        [sys.executable, "-m", "uvicorn", target, "--port", str(port), "--timeout-keep-alive", "120", "--log-level", "warning"],
+        cwd=workdir, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+
+async def wait_ready(client: httpx.AsyncClient, timeout: float = 30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if (await client.get("/coins/balance/")).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        await asyncio.sleep(0.2)
+    raise RuntimeError("server did not start")
+
+def make_request(i: int):
+    """読み取り8割・書き込み2割の混在"""
+    kind = i % 10
+    if kind == 0:
+        return "POST", "/coins/", {"amount": 1, "coin_type": "earned", "category": "other"}
+    if kind == 1:
+        return "POST", "/tasks/", {"title": f"bench {i}"}
+    if kind < 5:
+        return "GET", "/coins/?limit=50", None
+    if kind < 8:
+        return "GET", "/tasks/", None
+    return "GET", "/coins/balance/", None
+
+async def load(port: int, requests: int, concurrency: int):
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", timeout=120, limits=limits) as client:
+        await wait_ready(client)
+        semaphore = asyncio.Semaphore(concurrency)
+        latencies = []
+        errors = 0
+
+        async def one(i):
+            nonlocal errors
+            method, path, body = make_request(i)
+            async with semaphore:
+                started = time.perf_counter()
+                response = await client.request(method, path, json=body)
+                latencies.append(time.perf_counter() - started)
+                if response.status_code >= 400:
+                    errors += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*[one(i) for i in range(requests)])
+        elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "rps": requests / elapsed,
+        "p50": latencies[len(latencies) // 2] * 1000,
+        "p99": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+        "errors": errors,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--stack", choices=["sync", "async"], action="append")
+    args = parser.parse_args()
+
+    for stack in args.stack or ["sync", "async"]:
+        with tempfile.TemporaryDirectory() as workdir:
+            server = start_server(workdir, args.port, stack)
+            try:
+                result = asyncio.run(load(args.port, args.requests, args.concurrency))
+            finally:
+                server.terminate()
+                server.wait()
+        print(f"{stack:>5}: {result['rps']:7.0f} req/s  p50 {result['p50']:7.1f} ms  p99 {result['p99']:7.1f} ms  errors={result['errors']}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,502 @@
+"""全ルーターのHTTPベンチマーク
+
+データ規模ごとに一時ディレクトリへ合成データ（manage.py generate）を作り、routers/ の全エンドポイントを
+ルートごとに一定数・一定の同時実行数で叩いて、スループットとp50/p95/p99レイテンシを測る。
+既定はプロセス内のASGIクライアントで、--http を付けると uvicorn（--workers）を起動し、
+複数のクライアントプロセスから実際のHTTPで負荷をかける。
+結果はJSONに保存し、--baseline を渡すと前回の結果と比べて悪化したルートを表示して終了コード1を返す。
+レスポンスの X-Query-Count からルートごとの最大クエリ数も記録し、--query-budgets のファイル
+（ルート → 上限）を超えたルートがあれば終了コード1を返す（N+1 の混入を検出する）。
+2xx を1件も返さなかったルート（測れていないルート）があっても終了コード1を返す。
+benchmarks/query_budgets.json は既定のデータ規模で --write-query-budgets により書き出したもの
+（残高チェーンを直す取引の編集・削除はデータ量に応じてクエリ数が増えるため含めない）。
+
+    python -m benchmarks.http_suite --scales 0.01 0.1 --requests 50 --concurrency 10
+    python -m benchmarks.http_suite --scales 0.1 --http --workers 2 --clients 4
+    python -m benchmarks.http_suite --scales 0.01 --baseline benchmarks/results/baseline.json
+    python -m benchmarks.http_suite --scales 0.01 --query-budgets benchmarks/query_budgets.json
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime, timedelta
+import httpx
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(ROOT, "benchmarks", "results")
+QUERY_BUDGETS = os.path.join(ROOT, "benchmarks", "query_budgets.json")
+# 計測対象のルーター（URLの先頭）
+ROUTERS = {"tasks", "reminders", "schedules", "study", "meals", "points", "coins", "search"}
+# 1リクエストで終わらないルート（配信は benchmarks/sse_idle.py で測る）
+STREAMING_ROUTES = {"GET /reminders/stream"}
+# クエリ数がデータ量（直す残高チェーンの長さ）で変わるルート。クエリ数の上限は持たず、
+# tests/test_query_budgets.py で決まった件数の取引に対して確かめる
+DATA_DEPENDENT_ROUTES = {"PUT /coins/{coin_id}", "DELETE /coins/{coin_id}", "PUT /points/{point_id}", "DELETE /points/{point_id}"}
+
+class Scenario:
+    """リクエストの組み立てに使うID・作成済みIDなどの状態"""
+
+    def __init__(self, counts: dict, seed: int):
+        self.counts = counts
+        self.rng = random.Random(seed)
+        self.created = {}
+        self.today = date.today()
+
+    def pick(self, table: str) -> int:
+        """生成済みの行のIDを1つ選ぶ"""
+        return self.rng.randint(1, self.counts[table])
+
+    def take(self, kind: str, table: str) -> int:
+        """ベンチマーク中に作成した行のIDを1つ取り出す（削除用。無ければ生成済みの行から選ぶ）"""
+        ids = self.created.get(kind)
+        return ids.pop() if ids else self.pick(table)
+
+    def remember(self, kind: str, response: httpx.Response):
+        if response.status_code == 200:
+            self.created.setdefault(kind, []).append(response.json()["id"])
+
+    def day(self, offset: int = 0) -> str:
+        return (self.today + timedelta(days=offset)).isoformat()
+
+def task_body(s):
+    return {"title": f"bench {s.rng.random():.6f}", "priority": s.rng.randint(0, 5),
+            "deadline": (datetime.now() + timedelta(hours=s.rng.randint(1, 72))).isoformat()}
+
+def task_batch_body(s):
+    """50件の一括操作（作成10・完了20・取り消し10・期限の変更10）"""
+    operations = [{"op": "create", "task": task_body(s)} for _ in range(10)]
+    operations += [{"op": "complete", "id": s.pick("tasks")} for _ in range(20)]
+    operations += [{"op": "undo", "id": s.pick("tasks")} for _ in range(10)]
+    operations += [{"op": "update", "id": s.pick("tasks"), "changes": {"deadline": task_body(s)["deadline"]}} for _ in range(10)]
+    return {"operations": operations}
+
+def schedule_body(s):
+    start = datetime.combine(s.today, datetime.min.time()) + timedelta(hours=s.rng.randint(7, 20))
+    return {"title": "bench", "start_time": start.isoformat(), "end_time": (start + timedelta(hours=1)).isoformat()}
+
+def study_body(s):
+    return {"title": "bench", "subject": "math", "estimated_hours": 2.0}
+
+def timetable_body(s):
+    return {"day_of_week": s.rng.randint(0, 4), "start_time": "09:00", "end_time": "10:30", "subject": "math", "title": "bench"}
+
+def meal_body(s):
+    return {"name": f"bench {s.rng.random():.6f}", "meal_type": "lunch", "category": "japanese", "calories": 500}
+
+def meal_history_body(s):
+    return {"meal_id": s.pick("meals"), "meal_name": "bench", "meal_type": "lunch", "category": "japanese", "calories": 500}
+
+def ledger_body(type_field):
+    return lambda s: {"amount": s.rng.randint(1, 50), type_field: "earned", "category": "other"}
+
+def goal_body(s):
+    return {"title": "bench", "target_amount": 1000}
+
+def catalog_body(s):
+    return {"title": "bench", "cost": 10}
+
+def import_body(type_field):
+    def body(s):
+        lines = [json.dumps({"amount": s.rng.randint(1, 50), type_field: "earned", "category": "other"}) for _ in range(20)]
+        return "\n".join(lines).encode()
+    return body
+
+# (メソッド, ルートのパス, URLを作る関数, リクエストボディを作る関数, 作成したIDを覚える種類)
+# 読み取り → 作成・更新 → 削除 の順で測る（削除はベンチマーク中に作成した行を消す）
+ROUTES = [
+    # tasks
+    ("GET", "/tasks/", lambda s: "/tasks/", None, None),
+    ("GET", "/tasks/daily", lambda s: "/tasks/daily", None, None),
+    ("GET", "/tasks/overdue", lambda s: "/tasks/overdue", None, None),
+    ("GET", "/tasks/deadline/{days}", lambda s: "/tasks/deadline/7", None, None),
+    ("GET", "/tasks/history", lambda s: "/tasks/history", None, None),
+    ("GET", "/tasks/statistics", lambda s: "/tasks/statistics", None, None),
+    ("GET", "/tasks/{task_id}", lambda s: f"/tasks/{s.pick('tasks')}", None, None),
+    ("POST", "/tasks/", lambda s: "/tasks/", task_body, "tasks"),
+    ("PUT", "/tasks/{task_id}", lambda s: f"/tasks/{s.pick('tasks')}", lambda s: {"priority": s.rng.randint(0, 5)}, None),
+    ("PATCH", "/tasks/{task_id}/complete", lambda s: f"/tasks/{s.pick('tasks')}/complete", None, None),
+    ("PATCH", "/tasks/{task_id}/undo", lambda s: f"/tasks/{s.pick('tasks')}/undo", None, None),
+    ("POST", "/tasks/from-history/{task_id}", lambda s: f"/tasks/from-history/{s.pick('tasks')}", None, "tasks"),
+    ("POST", "/tasks/batch", lambda s: "/tasks/batch", task_batch_body, None),
+    ("DELETE", "/tasks/{task_id}", lambda s: f"/tasks/{s.take('tasks', 'tasks')}", None, None),
+    # reminders
+    ("GET", "/reminders/upcoming", lambda s: "/reminders/upcoming?hours=48", None, None),
+    ("GET", "/reminders/overdue", lambda s: "/reminders/overdue", None, None),
+    ("GET", "/reminders/daily-reset", lambda s: "/reminders/daily-reset", None, None),
+    ("GET", "/reminders/daily-reset/last-run", lambda s: "/reminders/daily-reset/last-run", None, None),
+    # schedules
+    ("GET", "/schedules/", lambda s: f"/schedules/?start_date={s.day(-7)}&end_date={s.day()}", None, None),
+    ("GET", "/schedules/{schedule_id}", lambda s: f"/schedules/{s.pick('schedules')}", None, None),
+    ("GET", "/schedules/free-time/{date}", lambda s: f"/schedules/free-time/{s.day(s.rng.randint(-30, 0))}", None, None),
+    ("GET", "/schedules/today", lambda s: "/schedules/today", None, None),
+    ("GET", "/schedules/week", lambda s: "/schedules/week", None, None),
+    ("POST", "/schedules/", lambda s: "/schedules/", schedule_body, "schedules"),
+    ("PUT", "/schedules/{schedule_id}", lambda s: f"/schedules/{s.pick('schedules')}", lambda s: {"priority": 1}, None),
+    ("PATCH", "/schedules/{schedule_id}/complete", lambda s: f"/schedules/{s.pick('schedules')}/complete", None, None),
+    ("PATCH", "/schedules/{schedule_id}/undo", lambda s: f"/schedules/{s.pick('schedules')}/undo", None, None),
+    ("DELETE", "/schedules/{schedule_id}", lambda s: f"/schedules/{s.take('schedules', 'schedules')}", None, None),
+    # study
+    ("GET", "/study/", lambda s: "/study/?completed=false", None, None),
+    ("GET", "/study/{study_id}", lambda s: f"/study/{s.pick('studies')}", None, None),
+    ("GET", "/study/recommendations", lambda s: "/study/recommendations", None, None),
+    ("GET", "/study/history", lambda s: "/study/history", None, None),
+    ("GET", "/study/statistics", lambda s: "/study/statistics", None, None),
+    ("GET", "/study/timetable", lambda s: "/study/timetable", None, None),
+    ("POST", "/study/", lambda s: "/study/", study_body, "studies"),
+    ("PUT", "/study/{study_id}", lambda s: f"/study/{s.pick('studies')}", lambda s: {"completed_hours": 0.5}, None),
+    ("POST", "/study/timetable", lambda s: "/study/timetable", timetable_body, "timetable"),
+    ("PUT", "/study/timetable/{timetable_id}", lambda s: f"/study/timetable/{s.pick('timetable')}", lambda s: {"room": "A101"}, None),
+    ("DELETE", "/study/{study_id}", lambda s: f"/study/{s.take('studies', 'studies')}", None, None),
+    ("DELETE", "/study/timetable/{timetable_id}", lambda s: f"/study/timetable/{s.take('timetable', 'timetable')}", None, None),
+    # meals
+    ("GET", "/meals/", lambda s: "/meals/", None, None),
+    ("GET", "/meals/{meal_id}", lambda s: f"/meals/{s.pick('meals')}", None, None),
+    ("GET", "/meals/recommendations/", lambda s: "/meals/recommendations/?meal_type=lunch", None, None),
+    ("GET", "/meals/history/", lambda s: "/meals/history/?days=30", None, None),
+    ("GET", "/meals/statistics/", lambda s: "/meals/statistics/?days=30", None, None),
+    ("POST", "/meals/", lambda s: "/meals/", meal_body, "meals"),
+    ("PUT", "/meals/{meal_id}", lambda s: f"/meals/{s.pick('meals')}", lambda s: {"calories": 600}, None),
+    ("POST", "/meals/history/", lambda s: "/meals/history/", meal_history_body, None),
+    ("DELETE", "/meals/{meal_id}", lambda s: f"/meals/{s.take('meals', 'meals')}", None, None),
+    # search
+    ("GET", "/search", lambda s: "/search?q=レポート&limit=20", None, None),
+]
+
+def ledger_routes(prefix: str, table: str, type_field: str, goals: str, catalog: str, catalog_path: str, use: str):
+    """コイン・ポイントで共通のルート"""
+    return [
+        ("GET", f"/{prefix}/", lambda s: f"/{prefix}/?limit=50", None, None),
+        ("GET", f"/{prefix}/{{{table}_id}}", lambda s: f"/{prefix}/{s.pick(prefix)}", None, None),
+        ("GET", f"/{prefix}/balance/", lambda s: f"/{prefix}/balance/", None, None),
+        ("GET", f"/{prefix}/goals/", lambda s: f"/{prefix}/goals/", None, None),
+        ("GET", f"/{prefix}/goals/{{goal_id}}", lambda s: f"/{prefix}/goals/{s.pick(goals)}", None, None),
+        ("GET", f"/{prefix}/{catalog_path}/", lambda s: f"/{prefix}/{catalog_path}/", None, None),
+        ("GET", f"/{prefix}/{catalog_path}/{{{catalog}}}", lambda s: f"/{prefix}/{catalog_path}/{s.pick(catalog_path_table(prefix))}", None, None),
+        ("GET", f"/{prefix}/statistics/", lambda s: f"/{prefix}/statistics/", None, None),
+        ("POST", f"/{prefix}/", lambda s: f"/{prefix}/", ledger_body(type_field), prefix),
+        ("PUT", f"/{prefix}/{{{table}_id}}", lambda s: f"/{prefix}/{s.pick(prefix)}", lambda s: {"description": "bench"}, None),
+        ("POST", f"/{prefix}/import", lambda s: f"/{prefix}/import", import_body(type_field), None),
+        ("POST", f"/{prefix}/goals/", lambda s: f"/{prefix}/goals/", goal_body, goals),
+        ("PUT", f"/{prefix}/goals/{{goal_id}}", lambda s: f"/{prefix}/goals/{s.pick(goals)}", lambda s: {"description": "bench"}, None),
+        ("POST", f"/{prefix}/{catalog_path}/", lambda s: f"/{prefix}/{catalog_path}/", catalog_body, catalog),
+        ("PUT", f"/{prefix}/{catalog_path}/{{{catalog}}}", lambda s: f"/{prefix}/{catalog_path}/{s.pick(catalog_path_table(prefix))}", lambda s: {"description": "bench"}, None),
+        ("POST", f"/{prefix}/{catalog_path}/{{{catalog}}}/{use}", lambda s: f"/{prefix}/{catalog_path}/{s.pick(catalog_path_table(prefix))}/{use}", None, None),
+        ("DELETE", f"/{prefix}/{{{table}_id}}", lambda s: f"/{prefix}/{s.take(prefix, prefix)}", None, None),
+        ("DELETE", f"/{prefix}/goals/{{goal_id}}", lambda s: f"/{prefix}/goals/{s.take(goals, goals)}", None, None),
+        ("DELETE", f"/{prefix}/{catalog_path}/{{{catalog}}}", lambda s: f"/{prefix}/{catalog_path}/{s.take(catalog, catalog_path_table(prefix))}", None, None),
+    ]
+
+def catalog_path_table(prefix: str) -> str:
+    return "coin_shop" if prefix == "coins" else "point_rewards"
+
+ROUTES += ledger_routes("points", "point", "point_type", "point_goals", "reward_id", "rewards", "use")
+ROUTES += ledger_routes("coins", "coin", "coin_type", "coin_goals", "item_id", "shop", "purchase")
+ROUTES += [
+    ("GET", "/coins/exchanges/", lambda s: "/coins/exchanges/", None, None),
+    ("POST", "/coins/exchanges/", lambda s: "/coins/exchanges/",
+     lambda s: {"from_amount": 10, "to_amount": 10, "description": "bench"}, None),
+    ("POST", "/coins/exchange-to-points/", lambda s: "/coins/exchange-to-points/?coin_amount=1", None, None),
+]
+
+PHASES = ["GET", "POST", "PUT", "PATCH", "DELETE"]
+
+def ordered_routes() -> list:
+    """読み取り → 作成 → 更新 → 削除 の順に並べる（同じメソッド内は定義順）"""
+    return sorted(ROUTES, key=lambda route: PHASES.index(route[0]))
+
+def route_name(route) -> str:
+    return f"{route[0]} {route[1]}"
+
+def uncovered_routes(app) -> list:
+    """ベンチマークに含まれていないアプリのルート"""
+    covered = {route_name(route) for route in ROUTES} | STREAMING_ROUTES
+    missing = []
+    for route in app.routes:
+        for method in sorted(getattr(route, "methods", None) or []):
+            name = f"{method} {route.path}"
+            if method != "HEAD" and route.path.split("/")[1] in ROUTERS and name not in covered:
+                missing.append(name)
+    return missing
+
+def build_request(scenario: Scenario, route):
+    method, _, make_url, make_body, _ = route
+    body = make_body(scenario) if make_body else None
+    if isinstance(body, bytes):
+        return method, make_url(scenario), {"content": body}
+    return method, make_url(scenario), {"json": body} if body is not None else {}
+
+def percentile(latencies: list, fraction: float) -> float:
+    return latencies[min(len(latencies) - 1, int(len(latencies) * fraction))] * 1000
+
+def summarize(latencies: list, errors: int, elapsed: float, queries: list) -> dict:
+    latencies = sorted(latencies)
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 0.50), 2),
+        "p95_ms": round(percentile(latencies, 0.95), 2),
+        "p99_ms": round(percentile(latencies, 0.99), 2),
+        "max_queries": max(queries, default=0),
+    }
+
+async def run_phase(client: httpx.AsyncClient, scenario: Scenario, route, requests: int, concurrency: int):
+    """1ルートを requests 回、同時 concurrency 件で叩き、(レイテンシ一覧, エラー数, クエリ数一覧) を返す"""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    queries = []
+    errors = 0
+
+    async def one():
+        nonlocal errors
+        method, url, kwargs = build_request(scenario, route)
+        async with semaphore:
+            started = time.perf_counter()
+            response = await client.request(method, url, **kwargs)
+            latencies.append(time.perf_counter() - started)
+        if "x-query-count" in response.headers:
+            queries.append(int(response.headers["x-query-count"]))
+        if not response.is_success:
+            errors += 1
+        elif route[4]:
+            scenario.remember(route[4], response)
+
+    await asyncio.gather(*[one() for _ in range(requests)])
+    return latencies, errors, queries
+
+def run_asgi(database_url: str, counts: dict, requests: int, concurrency: int, seed: int) -> dict:
+    """プロセス内のASGIクライアントで全ルートを測る（データベースごとに別プロセスで呼ぶ）"""
+    os.environ["DATABASE_URL"] = database_url
+    import main
+
+    missing = uncovered_routes(main.app)
+    if missing:
+        print("ベンチマークに含まれていないルート: " + ", ".join(missing))
+
+    async def run():
+        scenario = Scenario(counts, seed)
+        results = {}
+        transport = httpx.ASGITransport(app=main.app)
+        async with main.app.router.lifespan_context(main.app):
+            async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=300) as client:
+                for route in ordered_routes():
+                    started = time.perf_counter()
+                    latencies, errors, queries = await run_phase(client, scenario, route, requests, concurrency)
+                    results[route_name(route)] = summarize(latencies, errors, time.perf_counter() - started, queries)
+        return results
+
+    return asyncio.run(run())
+
+def http_client_share(port: int, route_index: int, requests: int, concurrency: int, seed: int, counts: dict, created: dict):
+    """--http モードのクライアントプロセス1つ分の負荷（作成済みIDは呼び出し元とやり取りする）"""
+    route = ordered_routes()[route_index]
+    scenario = Scenario(counts, seed)
+    scenario.created = created
+
+    async def run():
+        limits = httpx.Limits(max_connections=concurrency)
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", timeout=300, limits=limits) as client:
+            return await run_phase(client, scenario, route, requests, concurrency)
+
+    latencies, errors, queries = asyncio.run(run())
+    return latencies, errors, queries, scenario.created
+
+def wait_ready(port: int, timeout: float = 60):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/coins/balance/").status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError("server did not start")
+
+def run_http(database_url: str, counts: dict, requests: int, concurrency: int, seed: int,
+             port: int, workers: int, clients: int) -> dict:
+    """uvicorn を --workers で起動し、複数のクライアントプロセスから全ルートを測る"""
+    env = dict(os.environ, DATABASE_URL=database_url, PYTHONPATH=ROOT)
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--workers", str(workers),
+         "--timeout-keep-alive", "120", "--log-level", "warning"],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    results = {}
+    try:
+        wait_ready(port)
+        share = max(1, requests // clients)
+        per_client = max(1, concurrency // clients)
+        created = {}
+        with multiprocessing.get_context("spawn").Pool(clients) as pool:
+            for index, route in enumerate(ordered_routes()):
+                started = time.perf_counter()
+                shares = pool.starmap(http_client_share, [
+                    (port, index, share, per_client, seed * 1000 + client, counts,
+                     {kind: ids[client::clients] for kind, ids in created.items()})
+                    for client in range(clients)
+                ])
+                elapsed = time.perf_counter() - started
+                latencies = [latency for client_latencies, _, _, _ in shares for latency in client_latencies]
+                queries = [count for _, _, client_queries, _ in shares for count in client_queries]
+                results[route_name(route)] = summarize(latencies, sum(errors for _, errors, _, _ in shares), elapsed, queries)
+                created = {}
+                for _, _, _, client_created in shares:
+                    for kind, ids in client_created.items():
+                        created.setdefault(kind, []).extend(ids)
+    finally:
+        server.terminate()
+        server.wait()
+    return results
+
+def generate_dataset(workdir: str, scale: float, seed: int) -> str:
+    """一時ディレクトリのSQLiteに合成データを作り、そのDBのURLを返す"""
+    database_url = f"sqlite:///{os.path.join(workdir, 'app.db')}"
+    env = dict(os.environ, DATABASE_URL=database_url)
+    subprocess.run([sys.executable, os.path.join(ROOT, "manage.py"), "generate", "--scale", str(scale), "--seed", str(seed)],
+                   cwd=workdir, env=env, stdout=subprocess.DEVNULL, check=True)
+    return database_url
+
+def compare(results: dict, baseline: dict, tolerance: float, min_ms: float) -> list:
+    """基準より p95 が tolerance 以上遅い、またはスループットが落ちたルート"""
+    regressions = []
+    for scale, scale_results in results["scales"].items():
+        base_routes = baseline.get("scales", {}).get(scale, {}).get("routes", {})
+        for name, current in scale_results["routes"].items():
+            base = base_routes.get(name)
+            if base is None:
+                continue
+            slower = current["p95_ms"] > base["p95_ms"] * (1 + tolerance) and current["p95_ms"] - base["p95_ms"] > min_ms
+            fewer = current["rps"] < base["rps"] / (1 + tolerance)
+            if slower or fewer:
+                regressions.append((scale, name, base, current))
+    return regressions
+
+def over_budget(results: dict, budgets: dict) -> list:
+    """最大クエリ数が上限を超えたルート（上限のないルートは見ない）"""
+    exceeded = []
+    for scale, scale_results in results["scales"].items():
+        for name, current in scale_results["routes"].items():
+            budget = budgets.get(name)
+            if budget is not None and current["max_queries"] > budget:
+                exceeded.append((scale, name, budget, current["max_queries"]))
+    return exceeded
+
+def failing_routes(results: dict) -> list:
+    """1件も2xxを返さなかったルート（パスの解釈違いなどで測れていない）"""
+    return [(scale, name) for scale, scale_results in results["scales"].items()
+            for name, current in scale_results["routes"].items() if current["errors"] >= current["requests"]]
+
+def query_maxima(results: dict) -> dict:
+    """全データ規模を通したルートごとの最大クエリ数（--write-query-budgets 用、全件エラーとデータ量次第のルートは除く）"""
+    maxima = {}
+    for scale_results in results["scales"].values():
+        for name, current in scale_results["routes"].items():
+            if current["errors"] < current["requests"] and name not in DATA_DEPENDENT_ROUTES:
+                maxima[name] = max(maxima.get(name, 0), current["max_queries"])
+    return maxima
+
+def print_results(scale: str, routes: dict):
+    print(f"\n== scale {scale} ==")
+    print(f"{'route':<48} {'req/s':>8} {'p50':>8} {'p95':>8} {'p99':>8} {'errors':>7} {'queries':>8}")
+    for name, result in routes.items():
+        print(f"{name:<48} {result['rps']:8.1f} {result['p50_ms']:8.1f} {result['p95_ms']:8.1f} {result['p99_ms']:8.1f} "
+              f"{result['errors']:7d} {result['max_queries']:8d}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scales", type=float, nargs="+", default=[0.01, 0.1], help="manage.py generate の --scale")
+    parser.add_argument("--requests", type=int, default=50, help="ルートごとのリクエスト数")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--http", action="store_true", help="uvicorn を起動して実際のHTTPで測る")
+    parser.add_argument("--workers", type=int, default=1, help="--http のときの uvicorn ワーカー数")
+    parser.add_argument("--clients", type=int, default=2, help="--http のときのクライアントプロセス数")
+    parser.add_argument("--port", type=int, default=8767)
+    parser.add_argument("--output", default=None, help="結果のJSON（省略時は benchmarks/results/ に保存）")
+    parser.add_argument("--baseline", default=None, help="比較する前回の結果のJSON")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="悪化とみなす割合")
+    parser.add_argument("--min-ms", type=float, default=1.0, help="これ未満の p95 の差は悪化とみなさない")
+    parser.add_argument("--query-budgets", nargs="?", const=QUERY_BUDGETS, default=None,
+                        help="ルートごとのクエリ数の上限のJSON（ファイル省略時は benchmarks/query_budgets.json）")
+    parser.add_argument("--write-query-budgets", default=None, help="今回の最大クエリ数を上限のJSONとして書き出す")
+    args = parser.parse_args()
+    # アプリのモジュールはDBのURLを読み込み時に決めるため、子プロセスでも読み込まれるトップレベルでは読み込まない
+    from crud.generate import scaled_counts
+
+    results = {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "mode": "http" if args.http else "asgi",
+        "requests": args.requests,
+        "concurrency": args.concurrency,
+        "seed": args.seed,
+        "scales": {},
+    }
+    for scale in args.scales:
+        counts = scaled_counts(scale)
+        with tempfile.TemporaryDirectory() as workdir:
+            database_url = generate_dataset(workdir, scale, args.seed)
+            if args.http:
+                routes = run_http(database_url, counts, args.requests, args.concurrency, args.seed,
+                                  args.port, args.workers, args.clients)
+            else:
+                # アプリはDBのURLを読み込み時に決めるため、データ規模ごとに別プロセスで読み込む
+                with ProcessPoolExecutor(1, mp_context=multiprocessing.get_context("spawn")) as executor:
+                    routes = executor.submit(run_asgi, database_url, counts, args.requests, args.concurrency, args.seed).result()
+        results["scales"][str(scale)] = {"rows": sum(counts.values()), "routes": routes}
+        print_results(str(scale), routes)
+
+    output = args.output or os.path.join(RESULTS_DIR, f"http_suite-{datetime.now():%Y%m%d-%H%M%S}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(results, f, ensure_ascii=False, indent=2)
+    print(f"\n結果を保存しました: {output}")
+
+    if args.write_query_budgets:
+        with open(args.write_query_budgets, "w", encoding="utf-8") as f:
+            json.dump(query_maxima(results), f, ensure_ascii=False, indent=2)
+            f.write("\n")
+        print(f"クエリ数の上限を保存しました: {args.write_query_budgets}")
+
+    failed = False
+    failing = failing_routes(results)
+    for scale, name in failing:
+        print(f"全件エラー scale {scale} {name}: 2xx の応答が1件もありません")
+    if failing:
+        failed = True
+
+    if args.query_budgets:
+        with open(args.query_budgets, encoding="utf-8") as f:
+            budgets = json.load(f)
+        exceeded = over_budget(results, budgets)
+        for scale, name, budget, count in exceeded:
+            print(f"クエリ数超過 scale {scale} {name}: {count} 件（上限 {budget} 件）")
+        if exceeded:
+            failed = True
+        else:
+            print("クエリ数はすべて上限以内です")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance, args.min_ms)
+        for scale, name, base, current in regressions:
+            print(f"悪化 scale {scale} {name}: p95 {base['p95_ms']:.1f} → {current['p95_ms']:.1f} ms, "
+                  f"{base['rps']:.1f} → {current['rps']:.1f} req/s")
+        if regressions:
+            failed = True
+        else:
+            print("基準からの悪化はありません")
+
+    if failed:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
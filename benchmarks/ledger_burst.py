@@ -0,0 +1,82 @@
+"""コイン取引のバースト書き込みベンチマーク
+
+1件ずつコミットする方式と単一ライターのグループコミットを比較し、
+書き込み後に残高チェーン（balance_after）が正しいかを確認する。
+
+    python -m benchmarks.ledger_burst --threads 32 --requests 2000
+"""
+import argparse
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from core.database import Base
+from core.ledger_writer import LedgerWriter
+from crud import coins as crud
+from crud import ledger
+from models import coins as models
+from schemas import coins as schemas
+
+def make_session_factory(path: str):
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False, "timeout": 30})
+    Base.metadata.create_all(bind=engine)
+    return sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
+
+def per_request_commit(session_factory, coin):
+    """従来方式: リクエストごとにセッションを開いてコミット"""
+    db = session_factory()
+    try:
+        result = crud.create_coin(db, coin)
+        db.commit()
+        return result
+    finally:
+        db.close()
+
+def verify_chain(session_factory) -> bool:
+    """created_at, id 順に残高を積み上げて balance_after と一致するか確認"""
+    db = session_factory()
+    try:
+        balance = 0
+        query = db.query(models.Coin).order_by(models.Coin.created_at, models.Coin.id)
+        for coin in query.yield_per(1000):
+            balance += ledger.signed_amount(coin.coin_type, coin.amount)
+            if coin.balance_after != balance:
+                return False
+        return balance == ledger.get_balance(db, "coin")
+    finally:
+        db.close()
+
+def run(mode: str, threads: int, requests: int):
+    with tempfile.TemporaryDirectory() as tmp:
+        session_factory = make_session_factory(os.path.join(tmp, "bench.db"))
+        writer = LedgerWriter(session_factory)
+        coin = schemas.CoinCreate(amount=1, coin_type="earned", category="other")
+
+        if mode == "group":
+            job = lambda _: writer.run(crud.create_coin, coin)
+        else:
+            job = lambda _: per_request_commit(session_factory, coin)
+
+        errors = 0
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            futures = [pool.submit(job, i) for i in range(requests)]
+            for future in futures:
+                try:
+                    future.result()
+                except Exception:
+                    errors += 1
+        elapsed = time.perf_counter() - start
+
+        print(f"{mode:>10}: {requests / elapsed:8.0f} tx/s  errors={errors}  chain_ok={verify_chain(session_factory)}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+
+    for mode in ("per-commit", "group"):
+        run(mode, args.threads, args.requests)
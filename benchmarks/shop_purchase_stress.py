@@ -0,0 +1,96 @@
+"""ショップ同時購入のストレステスト
+
+一時ディレクトリでアプリを複数ワーカーで起動し、在庫付きアイテムに大量の同時購入を送る。
+成功件数が在庫数と一致し（売り越しなし）、在庫・使用回数・残高チェーンが整合しているかを確認する。
+
+    python -m benchmarks.shop_purchase_stress --requests 500 --stock 100 --workers 4
+"""
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import httpx
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def start_server(workdir: str, port: int, workers: int):
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--workers", str(workers), "--log-level", "warning"],
+        cwd=workdir, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+
+async def wait_ready(client: httpx.AsyncClient, timeout: float = 30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if (await client.get("/coins/balance/")).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        await asyncio.sleep(0.2)
+    raise RuntimeError("server did not start")
+
+async def run(args):
+    base_url = f"http://127.0.0.1:{args.port}"
+    limits = httpx.Limits(max_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=base_url, timeout=60, limits=limits) as client:
+        await wait_ready(client)
+        # 全員が買えるだけのコインを用意し、在庫付きアイテムを作る
+        await client.post("/coins/", json={"amount": args.cost * args.requests, "coin_type": "earned"})
+        item = (await client.post("/coins/shop/", json={"title": "stress", "cost": args.cost, "stock": args.stock})).json()
+        balance_before = (await client.get("/coins/balance/")).json()["balance"]
+
+        started = time.perf_counter()
+        responses = await asyncio.gather(*[client.post(f"/coins/shop/{item['id']}/purchase") for _ in range(args.requests)])
+        elapsed = time.perf_counter() - started
+
+        statuses = {}
+        for response in responses:
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+        item = (await client.get(f"/coins/shop/{item['id']}")).json()
+        balance_after = (await client.get("/coins/balance/")).json()["balance"]
+
+    sold = statuses.get(200, 0)
+    print(f"requests={args.requests} stock={args.stock} workers={args.workers}")
+    print(f"status: {statuses}")
+    print(f"throughput: {args.requests / elapsed:.0f} req/s, {sold / elapsed:.0f} purchases/s")
+    print(f"item: stock={item['stock']} used_count={item['used_count']} is_available={item['is_available']}")
+
+    checks = {
+        "no_oversell": sold == min(args.stock, args.requests),
+        "stock_consistent": item["stock"] == args.stock - sold and item["used_count"] == sold,
+        "balance_consistent": balance_before - balance_after == sold * args.cost,
+    }
+    print(f"checks: {checks}")
+    return all(checks.values())
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--stock", type=int, default=100)
+    parser.add_argument("--cost", type=int, default=10)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        server = start_server(workdir, args.port, args.workers)
+        try:
+            ok = asyncio.run(run(args))
+        finally:
+            server.terminate()
+            server.wait()
+        # 残高チェーンの検証
+        verify = subprocess.run(
+            [sys.executable, os.path.join(ROOT, "manage.py"), "verify-ledger", "--currency", "coin"],
+            cwd=workdir, env=dict(os.environ, PYTHONPATH=ROOT)
+        )
+    sys.exit(0 if ok and verify.returncode == 0 else 1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""SQLiteのプラグマ設定ごとの読み書き混在ベンチマーク
+
+読み取りスレッド（取引一覧・残高）と書き込みスレッド（取引の追加）を同時に一定時間動かし、
+DB_PROFILE ごとのスループットと "database is locked" エラー数を比較する。
+
+    python -m benchmarks.sqlite_pragmas --readers 8 --writers 4 --seconds 10
+"""
+import argparse
+import os
+import tempfile
+import threading
+import time
+from sqlalchemy import create_engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+from core.database import Base, SQLITE_PROFILES, configure_sqlite
+from crud import coins as crud
+from crud import ledger
+from schemas import coins as schemas
+
+def make_session_factory(path: str, profile: str):
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    configure_sqlite(engine, SQLITE_PROFILES[profile])
+    Base.metadata.create_all(bind=engine)
+    return sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
+
+def reader(session_factory, stop, counts):
+    while not stop.is_set():
+        db = session_factory()
+        try:
+            crud.get_coins(db, limit=50)
+            ledger.get_balance(db, "coin")
+            counts["reads"] += 1
+        except OperationalError:
+            counts["read_errors"] += 1
+        finally:
+            db.close()
+
+def writer(session_factory, stop, counts):
+    coin = schemas.CoinCreate(amount=1, coin_type="earned", category="other")
+    while not stop.is_set():
+        db = session_factory()
+        try:
+            crud.create_coin(db, coin)
+            db.commit()
+            counts["writes"] += 1
+        except OperationalError:
+            db.rollback()
+            counts["write_errors"] += 1
+        finally:
+            db.close()
+
+def run(profile: str, readers: int, writers: int, seconds: float, seed_rows: int):
+    with tempfile.TemporaryDirectory() as tmp:
+        session_factory = make_session_factory(os.path.join(tmp, "bench.db"), profile)
+        db = session_factory()
+        coin = schemas.CoinCreate(amount=1, coin_type="earned", category="other")
+        for _ in range(seed_rows):
+            crud.create_coin(db, coin)
+        db.commit()
+        db.close()
+
+        stop = threading.Event()
+        counts = {"reads": 0, "writes": 0, "read_errors": 0, "write_errors": 0}
+        threads = [threading.Thread(target=reader, args=(session_factory, stop, counts)) for _ in range(readers)]
+        threads += [threading.Thread(target=writer, args=(session_factory, stop, counts)) for _ in range(writers)]
+        for thread in threads:
+            thread.start()
+        time.sleep(seconds)
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+        print(f"{profile:>10}: reads {counts['reads'] / seconds:8.0f}/s  writes {counts['writes'] / seconds:6.0f}/s  "
+              f"errors read={counts['read_errors']} write={counts['write_errors']}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--seed-rows", type=int, default=2000)
+    parser.add_argument("--profile", choices=list(SQLITE_PROFILES), action="append")
+    args = parser.parse_args()
+
+    for profile in args.profile or list(SQLITE_PROFILES):
+        run(profile, args.readers, args.writers, args.seconds, args.seed_rows)
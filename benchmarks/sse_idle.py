@@ -0,0 +1,170 @@
+"""/reminders/stream のアイドル接続ベンチマーク
+
+一時ディレクトリでアプリを1ワーカーで起動し、--connections 本のSSE接続を張ったまま --hold 秒待って、
+サーバープロセスのCPU使用率とメモリを1秒ごとに測る（接続なしの状態とも比べる）。
+最後に数秒後に期限の来るタスクを作り、期限切れイベントが全接続に届くまでの時間を測る。
+psutil が必要。
+
+    python -m benchmarks.sse_idle --connections 5000 --hold 30
+"""
+import argparse
+import asyncio
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+import httpx
+import psutil
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def raise_file_limit():
+    """接続数ぶんのファイルディスクリプタを使えるようにする（ソフト上限をハード上限まで上げる）"""
+    _, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+
+def start_server(workdir: str, port: int):
+    env = dict(os.environ, PYTHONPATH=ROOT, DATABASE_URL=f"sqlite:///{os.path.join(workdir, 'app.db')}")
+    subprocess.run([sys.executable, os.path.join(ROOT, "manage.py"), "seed"], cwd=workdir, env=env,
+                   stdout=subprocess.DEVNULL, check=True)
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--backlog", "4096", "--log-level", "warning"],
+        cwd=workdir, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, preexec_fn=raise_file_limit
+    )
+
+def stop_server(server: subprocess.Popen):
+    # 配信中の接続は自分から閉じないため、猶予を過ぎたら強制終了する
+    server.terminate()
+    try:
+        server.wait(10)
+    except subprocess.TimeoutExpired:
+        server.kill()
+        server.wait()
+
+async def wait_ready(port: int, timeout: float = 30):
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}") as client:
+        while time.monotonic() < deadline:
+            try:
+                if (await client.get("/coins/balance/")).status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.2)
+    raise RuntimeError("server did not start")
+
+class Connection:
+    """生のソケットで張るSSE接続（数千本でもクライアント側が重くならないように）"""
+
+    def __init__(self, port: int):
+        self.port = port
+        self.writer = None
+        self.events = []  # (受信時刻, イベント名)
+        self.keepalives = 0
+
+    async def open(self):
+        reader, self.writer = await asyncio.open_connection("127.0.0.1", self.port)
+        self.writer.write(b"GET /reminders/stream HTTP/1.1\r\nHost: bench\r\nAccept: text/event-stream\r\n\r\n")
+        await self.writer.drain()
+        await reader.readuntil(b"\r\n\r\n")
+        return reader
+
+    async def read(self, reader):
+        try:
+            while True:
+                block = await reader.readuntil(b"\n\n")
+                if b"event: " in block:
+                    name = block.split(b"event: ", 1)[1].split(b"\n", 1)[0].decode()
+                    self.events.append((time.perf_counter(), name))
+                elif b": keepalive" in block:
+                    self.keepalives += 1
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+def sample(process: psutil.Process, seconds: int) -> list:
+    """1秒ごとの (CPU%, RSS MB)"""
+    process.cpu_percent(None)
+    samples = []
+    for _ in range(seconds):
+        time.sleep(1)
+        samples.append((process.cpu_percent(None), process.memory_info().rss / 1024 / 1024))
+    return samples
+
+def describe(samples: list) -> str:
+    cpu = [c for c, _ in samples]
+    return (f"CPU 平均 {sum(cpu) / len(cpu):5.1f}%  最大 {max(cpu):5.1f}%  "
+            f"RSS {samples[-1][1]:7.1f} MB")
+
+async def run(port: int, connections: int, hold: int, opening_concurrency: int, server_pid: int):
+    process = psutil.Process(server_pid)
+    await wait_ready(port)
+
+    idle = await asyncio.to_thread(sample, process, min(hold, 5))
+    print(f"接続なし       : {describe(idle)}")
+
+    clients = [Connection(port) for _ in range(connections)]
+    semaphore = asyncio.Semaphore(opening_concurrency)
+    readers = []
+
+    async def open_one(connection):
+        async with semaphore:
+            reader = await connection.open()
+        readers.append(asyncio.create_task(connection.read(reader)))
+
+    started = time.perf_counter()
+    await asyncio.gather(*[open_one(c) for c in clients])
+    print(f"{connections}接続を開きました ({time.perf_counter() - started:.1f}秒)")
+
+    held = await asyncio.to_thread(sample, process, hold)
+    print(f"{connections}接続を保持 : {describe(held)}")
+    for second, (cpu, rss) in enumerate(held, 1):
+        print(f"  {second:3d}s  CPU {cpu:5.1f}%  RSS {rss:7.1f} MB")
+
+    # 期限切れイベントの一斉配信
+    deadline = datetime.now() + timedelta(seconds=2)
+    async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}") as client:
+        await client.post("/tasks/", json={"title": "sse bench", "deadline": deadline.isoformat()})
+    fire_at = time.perf_counter() + (deadline - datetime.now()).total_seconds()
+    timeout = time.perf_counter() + 30
+    while time.perf_counter() < timeout and not all(any(name == "overdue" for _, name in c.events) for c in clients):
+        await asyncio.sleep(0.1)
+    arrivals = sorted(next(at for at, name in c.events if name == "overdue") - fire_at
+                      for c in clients if any(name == "overdue" for _, name in c.events))
+    if arrivals:
+        print(f"期限切れイベント: {len(arrivals)}/{connections}接続に到達  "
+              f"最初 {arrivals[0] * 1000:.0f} ms  中央値 {arrivals[len(arrivals) // 2] * 1000:.0f} ms  "
+              f"最後 {arrivals[-1] * 1000:.0f} ms")
+    else:
+        print("期限切れイベントが届きませんでした")
+    print(f"キープアライブ受信: 1接続あたり {sum(c.keepalives for c in clients) / connections:.1f} 回")
+
+    for connection in clients:
+        connection.close()
+    for reader in readers:
+        reader.cancel()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--connections", type=int, default=5000)
+    parser.add_argument("--hold", type=int, default=30, help="接続を保持して測る秒数")
+    parser.add_argument("--opening-concurrency", type=int, default=200, help="同時に張る接続数")
+    parser.add_argument("--port", type=int, default=8768)
+    args = parser.parse_args()
+    raise_file_limit()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        server = start_server(workdir, args.port)
+        try:
+            asyncio.run(run(args.port, args.connections, args.hold, args.opening_concurrency, server.pid))
+        finally:
+            stop_server(server)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+import os
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from sqlalchemy import event
+from core.slow_queries import slow_query_log
+
+# リクエスト単位のSQL計測。エンジンのイベントで発行したクエリの数と時間を、
+# リクエストごとの QueryStats（コンテキスト変数）に積み上げる。
+
+# 計測を有効にするか（無効にするとイベントを登録しない）
+INSTRUMENTATION_ENABLED = os.getenv("DB_INSTRUMENTATION", "true").lower() in ("1", "true", "yes")
+
+class QueryStats:
+    """1リクエスト（または assert_max_queries のブロック）で発行したクエリ"""
+
+    def __init__(self, keep_statements: bool = False, scope: dict = None):
+        self.scope = scope
+        self.count = 0
+        self.time = 0.0  # 秒
+        self.statements = [] if keep_statements else None
+
+    def record(self, statement: str, elapsed: float):
+        self.count += 1
+        self.time += elapsed
+        if self.statements is not None:
+            self.statements.append(statement)
+
+    def route(self):
+        """発行元のルート（"GET /tasks/{task_id}"。ルーティング前やリクエスト外ならNone）"""
+        if self.scope is None or self.scope.get("route") is None:
+            return None
+        return f"{self.scope['method']} {self.scope['route'].path}"
+
+class SharedQueryStats:
+    """複数のリクエストの分をまとめて発行した文（単一ライターがまとめた目標の加算など）を、それぞれに数える"""
+
+    def __init__(self, stats: list):
+        self.stats = stats
+
+    def record(self, statement: str, elapsed: float):
+        for stats in self.stats:
+            stats.record(statement, elapsed)
+
+    def route(self):
+        """発行元のルート（複数あれば ", " でつなぐ）"""
+        routes = list(dict.fromkeys(route for route in (stats.route() for stats in self.stats) if route is not None))
+        return ", ".join(routes) or None
+
+current_stats: ContextVar = ContextVar("query_stats", default=None)
+
+@contextmanager
+def charged_to(stats: list):
+    """ブロック内で発行したクエリを stats（各リクエストの QueryStats）のすべてに数える（空なら今のまま）"""
+    stats = [s for s in dict.fromkeys(stats) if s is not None]
+    if not stats:
+        yield
+        return
+    token = current_stats.set(SharedQueryStats(stats))
+    try:
+        yield
+    finally:
+        current_stats.reset(token)
+
+def instrument(target_engine):
+    """エンジンにクエリ計測のイベントを登録（非同期エンジンは sync_engine を渡す）"""
+    if not INSTRUMENTATION_ENABLED and slow_query_log is None:
+        return
+
+    @event.listens_for(target_engine, "before_cursor_execute")
+    def start_timer(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(target_engine, "after_cursor_execute")
+    def stop_timer(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_started"].pop()
+        stats = current_stats.get()
+        if stats is not None:
+            stats.record(statement, elapsed)
+        if slow_query_log is not None:
+            slow_query_log.record(conn, statement, parameters, executemany, elapsed, stats.route() if stats else None)
+
+class RouteTotals:
+    """ルートごとの累計（プロセス内、デバッグ用エンドポイントで参照する）"""
+
+    def __init__(self):
+        self.routes = defaultdict(lambda: {"requests": 0, "queries": 0, "query_time_ms": 0.0, "max_queries": 0})
+
+    def add(self, stats: QueryStats):
+        totals = self.routes[stats.route()]
+        totals["requests"] += 1
+        totals["queries"] += stats.count
+        totals["query_time_ms"] += stats.time * 1000
+        totals["max_queries"] = max(totals["max_queries"], stats.count)
+
+    def snapshot(self) -> dict:
+        return {
+            route: dict(totals, avg_queries=round(totals["queries"] / totals["requests"], 2),
+                        query_time_ms=round(totals["query_time_ms"], 2))
+            for route, totals in sorted(self.routes.items())
+        }
+
+    def reset(self):
+        self.routes.clear()
+
+route_totals = RouteTotals()
+
+class QueryCountMiddleware:
+    """リクエストごとのクエリ数・時間をレスポンスヘッダ（X-Query-Count / X-Query-Time ミリ秒）に付ける"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or (not INSTRUMENTATION_ENABLED and slow_query_log is None):
+            await self.app(scope, receive, send)
+            return
+        # 計測を切っていても、遅いクエリのログに発行元のルートを残すためにコンテキストは設定する
+        stats = QueryStats(scope=scope)
+        token = current_stats.set(stats)
+
+        async def send_with_headers(message):
+            if message["type"] == "http.response.start" and INSTRUMENTATION_ENABLED:
+                headers = list(message.get("headers", []))
+                headers.append((b"x-query-count", str(stats.count).encode()))
+                headers.append((b"x-query-time", f"{stats.time * 1000:.2f}".encode()))
+                message = dict(message, headers=headers)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_headers)
+        finally:
+            current_stats.reset(token)
+            if INSTRUMENTATION_ENABLED and stats.route() is not None:
+                route_totals.add(stats)
+
+@contextmanager
+def assert_max_queries(max_queries: int):
+    """ブロック内のクエリ数が上限を超えたらAssertionError（テスト用）
+
+        with assert_max_queries(2):
+            crud.get_study_statistics(db)
+    """
+    stats = QueryStats(keep_statements=True)
+    token = current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        current_stats.reset(token)
+    if stats.count > max_queries:
+        raise AssertionError(
+            f"{stats.count} queries (max {max_queries}):\n" + "\n".join(stats.statements)
+        )
+
+def assert_route_queries(response, max_queries: int):
+    """レスポンスの X-Query-Count が上限以内か（テストクライアント用）"""
+    count = int(response.headers["x-query-count"])
+    if count > max_queries:
+        raise AssertionError(f"{response.request.method} {response.request.url.path}: {count} queries (max {max_queries})")
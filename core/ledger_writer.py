@@ -0,0 +1,122 @@
+import asyncio
+import contextvars
+import queue
+import threading
+from concurrent.futures import Future
+from sqlalchemy.orm import sessionmaker
+from core.database import engine
+
+# 単一ライター用のセッション（コミット後も結果を呼び出し元へ返せるように期限切れにしない）
+WriterSession = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
+
+class LedgerWriter:
+    """台帳への書き込みを1本のスレッドに集約し、溜まった書き込みをまとめてコミットする"""
+
+    def __init__(self, session_factory=WriterSession, max_batch: int = 500):
+        self.session_factory = session_factory
+        self.max_batch = max_batch
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def submit(self, fn, *args, batch: bool = True) -> Future:
+        """fn(db, *args) を書き込みキューに積む（呼び出し元のコンテキストで実行し、クエリ数を依頼元のリクエストに数える）
+
+        batch=False の書き込みは他の書き込みとまとめず、単独のトランザクションで実行する
+        （自分でコミット・ロールバックするCRUD向け）。
+        """
+        self._ensure_started()
+        future = Future()
+        self._queue.put((contextvars.copy_context(), fn, args, future, batch))
+        return future
+
+    def run(self, fn, *args, batch: bool = True):
+        """書き込みを依頼し、コミット済みの結果を待って返す"""
+        return self.submit(fn, *args, batch=batch).result()
+
+    async def run_async(self, fn, *args, batch: bool = True):
+        """run の非同期版（イベントループを止めずにコミットを待つ）"""
+        return await asyncio.wrap_future(self.submit(fn, *args, batch=batch))
+
+    def _ensure_started(self):
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._loop, name="ledger-writer", daemon=True)
+                self._thread.start()
+
+    def _loop(self):
+        pending = None
+        while True:
+            job, pending = pending or self._queue.get(), None
+            batch = [job]
+            while job[4] and len(batch) < self.max_batch:
+                try:
+                    job = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if not job[4]:
+                    # 単独で実行する書き込みは、ここまでのバッチをコミットしてから
+                    pending = job
+                    break
+                batch.append(job)
+            # 依頼元が待つのをやめた（キャンセルした）書き込みは実行しない
+            batch = [job for job in batch if job[3].set_running_or_notify_cancel()]
+            if batch:
+                self._commit_batch(batch)
+
+    @staticmethod
+    def _run_job(db, fn, args):
+        """fn(db, *args) を実行し、書き込みも依頼元のコンテキストの中でフラッシュする
+
+        コミットまでフラッシュを遅らせると、その文がどのリクエストのクエリ数にも遅いクエリのログのルートにも載らない。
+        """
+        result = fn(db, *args)
+        db.flush()
+        return result
+
+    def _commit_batch(self, batch):
+        """バッチを1トランザクションで実行してコミット"""
+        db = self.session_factory()
+        try:
+            results = [context.run(self._run_job, db, fn, args) for context, fn, args, _, _ in batch]
+            # コミット時に発行する文（まとめた目標の加算）は、依頼元のリクエストへ数える側（crud.ledger）が振り分ける
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            if len(batch) == 1:
+                batch[0][3].set_exception(e)
+                return
+            results = None
+        finally:
+            db.close()
+
+        if results is None:
+            # 失敗した書き込みを特定するため1件ずつやり直す
+            for job in batch:
+                self._commit_batch([job])
+            return
+
+        for (_, _, _, future, _), result in zip(batch, results):
+            future.set_result(result)
+
+writer = LedgerWriter()
+
+class WriterProxy:
+    """変更系ルート用のセッションの代わり（get_db が返す）
+
+    run_sync は AsyncSession.run_sync と同じ呼び方で、fn(db, *args) を単一ライターのスレッドで
+    単独のトランザクションとして実行し、コミットを待つ。CRUDは同期のままで、
+    イベントループを止めないよう処理をライターのスレッドへ渡すだけの窓口。
+    """
+
+    def __init__(self, writer: LedgerWriter):
+        self.writer = writer
+
+    async def run_sync(self, fn, *args):
+        return await self.writer.run_async(fn, *args, batch=False)
+
+async def get_db():
+    """変更系ルート用の依存関係。書き込みはすべて単一ライターの接続を通る"""
+    yield WriterProxy(writer)
@@ -0,0 +1,30 @@
+import os
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import inspect
+from core.database import engine
+
+ALEMBIC_INI = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "alembic.ini")
+# create_all で作っていたスキーマに相当するリビジョン
+BASELINE_REVISION = "0001"
+
+def alembic_config(connection=None) -> Config:
+    config = Config(ALEMBIC_INI)
+    # アプリ側のログ設定を上書きしない
+    config.attributes["configure_logger"] = False
+    if connection is not None:
+        config.attributes["connection"] = connection
+    return config
+
+def upgrade_database(revision: str = "head", target_engine=engine):
+    """スキーマを指定リビジョンまで上げる
+
+    マイグレーション導入前に create_all で作られたDB（alembic_version が無く既存テーブルがある）は
+    ベースラインとして記録してから残りを適用する。
+    """
+    with target_engine.begin() as connection:
+        tables = set(inspect(connection).get_table_names())
+        config = alembic_config(connection)
+        if "alembic_version" not in tables and "tasks" in tables:
+            command.stamp(config, BASELINE_REVISION)
+        command.upgrade(config, revision)
@@ -0,0 +1,129 @@
+import re
+from datetime import datetime
+from types import SimpleNamespace
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from core.database import Base
+from crud import tasks, schedules, study, meals, coins, points, ledger, archive, jobs, search
+from crud.pagination import encode_cursor
+
+# 実行計画を確認するCRUDの呼び出し（代表的な引数で呼ぶ。書き込みを含むものは最後にロールバックする）
+PROBES = [
+    ("tasks.get_tasks", lambda db: tasks.get_tasks(db)),
+    ("tasks.get_tasks(completed)", lambda db: tasks.get_tasks(db, completed=False)),
+    ("tasks.get_task", lambda db: tasks.get_task(db, 1)),
+    ("tasks.get_tasks_by_deadline", lambda db: tasks.get_tasks_by_deadline(db, 7)),
+    ("tasks.get_overdue_tasks", lambda db: tasks.get_overdue_tasks(db)),
+    ("tasks.get_daily_tasks", lambda db: tasks.get_daily_tasks(db)),
+    ("tasks.get_task_history", lambda db: tasks.get_task_history(db)),
+    ("tasks.get_task_statistics", lambda db: tasks.get_task_statistics(db)),
+    ("tasks.get_upcoming_reminders", lambda db: tasks.get_upcoming_reminders(db, datetime(2025, 1, 1), datetime(2025, 1, 2))),
+    ("schedules.get_schedules", lambda db: schedules.get_schedules(db)),
+    ("schedules.get_schedules(range)", lambda db: schedules.get_schedules(db, datetime(2025, 1, 1), datetime(2025, 1, 2))),
+    ("schedules.find_free_time_slots", lambda db: schedules.find_free_time_slots(db, datetime(2025, 1, 1))),
+    ("study.get_studies", lambda db: study.get_studies(db)),
+    ("study.get_study_recommendations", lambda db: study.get_study_recommendations(db)),
+    ("study.get_study_history", lambda db: study.get_study_history(db)),
+    ("study.get_study_statistics", lambda db: study.get_study_statistics(db)),
+    ("study.get_timetable", lambda db: study.get_timetable(db)),
+    ("study.get_timetable(day)", lambda db: study.get_timetable(db, 0)),
+    ("meals.get_meals", lambda db: meals.get_meals(db)),
+    ("meals.get_meal_recommendations", lambda db: meals.get_meal_recommendations(db, meal_type="lunch")),
+    ("meals.get_meal_history", lambda db: meals.get_meal_history(db)),
+    ("meals.get_meal_statistics", lambda db: meals.get_meal_statistics(db)),
+    ("coins.get_coins", lambda db: coins.get_coins(db)),
+    ("coins.get_coins(type)", lambda db: coins.get_coins(db, coin_type="earned")),
+    ("coins.get_coins(before)", lambda db: coins.get_coins(db, before=encode_cursor(SimpleNamespace(created_at=datetime.now(), id=1)))),
+    ("coins.get_coins(range)", lambda db: coins.get_coins(db, from_date=datetime(2025, 1, 1), to_date=datetime(2025, 2, 1))),
+    ("coins.get_coin", lambda db: coins.get_coin(db, 1)),
+    ("coins.get_coin_goals", lambda db: coins.get_coin_goals(db)),
+    ("coins.get_coin_goals(completed)", lambda db: coins.get_coin_goals(db, False)),
+    ("coins.get_coin_shop_items", lambda db: coins.get_coin_shop_items(db)),
+    ("coins.get_coin_shop_items(available)", lambda db: coins.get_coin_shop_items(db, True)),
+    ("coins.get_coin_exchanges", lambda db: coins.get_coin_exchanges(db)),
+    ("coins.get_coin_statistics", lambda db: coins.get_coin_statistics(db)),
+    ("points.get_points", lambda db: points.get_points(db)),
+    ("points.get_point_goals(completed)", lambda db: points.get_point_goals(db, False)),
+    ("points.get_point_rewards(available)", lambda db: points.get_point_rewards(db, True)),
+    ("points.get_point_statistics", lambda db: points.get_point_statistics(db)),
+    ("ledger.add_entry", lambda db: ledger.add_entry(db, "coin", amount=1, coin_type="earned", category="other")),
+    ("ledger.apply_pending_goals", lambda db: ledger.apply_pending_goals(db)),
+    ("coins.purchase_coin_shop_item", lambda db: coins.purchase_coin_shop_item(db, 1)),
+    ("coins.exchange_coins_to_points", lambda db: coins.exchange_coins_to_points(db, 1, 1.0)),
+    ("ledger.partial_day_totals", lambda db: ledger.partial_day_totals(db, "coin", datetime(2025, 1, 1, 12), datetime(2025, 1, 2))),
+    ("ledger.repair_chain", lambda db: ledger.repair_chain(db, "coin", datetime.now())),
+    ("archive.get_watermark", lambda db: archive.get_watermark(db, "coins")),
+    ("jobs.get_last_run", lambda db: jobs.get_last_run(db, jobs.DAILY_RESET)),
+    ("search.search", lambda db: search.search(db, "report")),
+    ("search.search(types)", lambda db: search.search(db, "report", ["task", "study"])),
+    ("search.search(short)", lambda db: search.search(db, "report ab")),
+]
+
+# 全件走査になると分かっているプローブ（プローブ名 → 方言）。
+# PostgreSQLの検索は索引のない部分一致（ILIKE）で各テーブルを読む（crud.search.search_tables）
+EXPECTED_FULL_SCANS = {
+    "search.search": {"postgresql"},
+    "search.search(types)": {"postgresql"},
+    "search.search(short)": {"postgresql"},
+}
+
+def capture_statements(db: Session, fn) -> list:
+    """fn(db) の実行中に発行されたSQLとパラメータを集める"""
+    statements = []
+    connection = db.connection()
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if not executemany:
+            statements.append((statement, parameters))
+
+    event.listen(connection, "before_cursor_execute", record)
+    try:
+        fn(db)
+        db.flush()
+    finally:
+        event.remove(connection, "before_cursor_execute", record)
+    return statements
+
+def explain(db: Session, statement: str, parameters) -> list:
+    """実行計画を行ごとの文字列で返す"""
+    connection = db.connection()
+    if connection.dialect.name == "sqlite":
+        rows = connection.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters).all()
+        return [row[-1] for row in rows]
+    return [row[0] for row in connection.exec_driver_sql("EXPLAIN " + statement, parameters).all()]
+
+def full_scans(plan: list, dialect: str) -> list:
+    """インデックスを使わずに全件を読むテーブル"""
+    pattern = re.compile(r"^SCAN (\w+)$") if dialect == "sqlite" else re.compile(r"Seq Scan on (\w+)")
+    tables = []
+    for line in plan:
+        match = pattern.search(line.strip().lstrip("-> ").strip())
+        if match and match.group(1) in Base.metadata.tables:
+            tables.append(match.group(1))
+    return tables
+
+def needs_index(statement: str) -> bool:
+    """絞り込みか並び替えがあるクエリか（条件なしの集計・全件取得はもともと全件を読む）"""
+    return re.search(r"\b(WHERE|ORDER BY)\b", statement, re.IGNORECASE) is not None
+
+def check_query_plans(db: Session) -> list:
+    """各CRUDクエリの実行計画を調べる（書き込みはロールバックする）"""
+    dialect = db.connection().dialect.name
+    if dialect == "postgresql":
+        # 小さなテーブルでは常にシーケンシャルスキャンが選ばれるため、インデックスが使えるかだけを見る
+        db.connection().exec_driver_sql("SET LOCAL enable_seqscan = off")
+    results = []
+    try:
+        for name, fn in PROBES:
+            seen = set()
+            for statement, parameters in capture_statements(db, fn):
+                if not statement.lstrip().upper().startswith(("SELECT", "UPDATE", "DELETE", "WITH")) or statement in seen:
+                    continue
+                seen.add(statement)
+                plan = explain(db, statement, parameters)
+                expected = dialect in EXPECTED_FULL_SCANS.get(name, ())
+                scans = full_scans(plan, dialect) if needs_index(statement) and not expected else []
+                results.append({"probe": name, "statement": statement, "plan": plan, "full_scans": scans})
+    finally:
+        db.rollback()
+    return results
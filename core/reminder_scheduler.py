@@ -0,0 +1,241 @@
+import asyncio
+import heapq
+import itertools
+import logging
+import os
+from datetime import datetime, timedelta
+from core.database import AsyncReadSession
+from core.ledger_writer import writer as ledger_writer
+from crud import tasks as crud
+from crud import jobs as job_crud
+
+# リマインダーの配信（/reminders/stream）。発火時刻の最小ヒープを1本のタスクで待ち、
+# 時刻が来たらDBで最新の状態を確かめてから、接続中のクライアント全員のキューへ積む。
+
+# 先読みする期間（時間）。これより先の発火は定期的な読み直しで拾う
+REMINDER_HORIZON_HOURS = int(os.getenv("REMINDER_HORIZON_HOURS", "24"))
+# 定期的に読み直す間隔（秒）。他のワーカーでの変更もこの間隔で反映される
+REMINDER_RELOAD_SECONDS = int(os.getenv("REMINDER_RELOAD_SECONDS", "300"))
+# クライアントごとの未送信イベントの上限（超えたら古いものから捨てる）
+SUBSCRIBER_QUEUE_SIZE = 100
+# 読み込みに失敗したときの再試行までの秒数
+RETRY_SECONDS = 5
+
+logger = logging.getLogger(__name__)
+
+def reminder_event(task, reminder_time: datetime) -> dict:
+    return {
+        "task_id": task.id,
+        "task_title": task.title,
+        "deadline": task.deadline.isoformat(),
+        "reminder_time": reminder_time.isoformat(),
+        "type": "deadline_reminder",
+        "message": f"タスク「{task.title}」の期限が近づいています"
+    }
+
+def overdue_event(task, now: datetime) -> dict:
+    return {
+        "task_id": task.id,
+        "task_title": task.title,
+        "deadline": task.deadline.isoformat() if task.deadline else None,
+        "overdue_hours": int((now - task.deadline).total_seconds() / 3600) if task.deadline else 0,
+        "type": "overdue_reminder",
+        "message": f"タスク「{task.title}」の期限が過ぎています"
+    }
+
+def daily_reset_event(task) -> dict:
+    return {
+        "task_id": task.id,
+        "task_title": task.title,
+        "completed_at": task.completed_at.isoformat() if task.completed_at else None,
+        "type": "daily_reset",
+        "message": f"毎日タスク「{task.title}」をリセットできます"
+    }
+
+def daily_reset_done_event(run) -> dict:
+    return {
+        "run_key": run.run_key,
+        "reset_tasks": run.rows,
+        "finished_at": run.finished_at.isoformat() if run.finished_at else None,
+        "type": "daily_reset",
+        "message": f"毎日タスクを{run.rows}件リセットしました"
+    }
+
+class ReminderScheduler:
+    """発火時刻の最小ヒープ。(種類, タスクID) ごとに最新の発火時刻だけを有効とし、古いエントリは取り出した時に捨てる"""
+
+    def __init__(self, session_factory=AsyncReadSession, writer=ledger_writer,
+                 horizon_hours: int = REMINDER_HORIZON_HOURS, reload_seconds: int = REMINDER_RELOAD_SECONDS):
+        self.session_factory = session_factory
+        self.writer = writer
+        self.horizon = timedelta(hours=horizon_hours)
+        self.reload_interval = timedelta(seconds=reload_seconds)
+        self._heap = []
+        self._scheduled = {}
+        self._sequence = itertools.count()
+        self._event_ids = itertools.count(1)
+        self._subscribers = set()
+        self._wakeup = asyncio.Event()
+        self._task = None
+        self._loaded_until = None
+        self._next_reload = None
+        # 次に毎日タスクのリセットを試みる時刻（起動直後は止まっている間に過ぎた回をすぐ実行する）
+        self._next_daily_reset = None
+
+    async def start(self):
+        if self._task is None:
+            # イベントは作ったときのイベントループに結び付くので、起動ごとに作り直す
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._run(), name="reminder-scheduler")
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    # 配信先
+
+    def subscribe(self) -> asyncio.Queue:
+        queue = asyncio.Queue(SUBSCRIBER_QUEUE_SIZE)
+        self._subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue):
+        self._subscribers.discard(queue)
+
+    @property
+    def subscribers(self) -> int:
+        return len(self._subscribers)
+
+    def publish(self, kind: str, payload: dict):
+        event = (next(self._event_ids), kind, payload)
+        for queue in self._subscribers:
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(event)
+
+    # 予定
+
+    @property
+    def ready(self) -> bool:
+        """先読み期間の予定を読み込み済みか（読み込むまでは task_changed を無視する）"""
+        return self._loaded_until is not None
+
+    def scheduled(self, kind: str, task_id):
+        """(種類, タスクID) の有効な発火時刻（予定に無ければNone）"""
+        return self._scheduled.get((kind, task_id))
+
+    def schedule(self, kind: str, task_id, fire_at: datetime):
+        key = (kind, task_id)
+        if self._scheduled.get(key) == fire_at:
+            return
+        self._scheduled[key] = fire_at
+        heapq.heappush(self._heap, (fire_at, next(self._sequence), kind, task_id))
+        if self._heap[0][0] == fire_at:
+            self._wakeup.set()
+
+    def task_changed(self, task):
+        """タスクの作成・更新・完了後に呼ぶ（先読み期間内の発火を予定に加え、リマインダーが要らなくなったら外す）"""
+        if not self.ready:
+            return
+        if not crud.needs_reminder(task):
+            self.task_removed(task.id)
+            return
+        now = datetime.now()
+        reminder_time = crud.reminder_time_for(task.deadline)
+        if now <= reminder_time <= self._loaded_until:
+            self.schedule("reminder", task.id, reminder_time)
+        if now <= task.deadline <= self._loaded_until:
+            self.schedule("overdue", task.id, task.deadline)
+
+    def task_removed(self, task_id):
+        """タスクの完了・削除後に呼ぶ（予定から外す。ヒープに残ったエントリは取り出した時に捨てる）"""
+        for kind in ("reminder", "overdue"):
+            self._scheduled.pop((kind, task_id), None)
+
+    async def reload(self):
+        """先読み期間内の発火を読み直して予定を作り直す"""
+        now = datetime.now()
+        until = now + self.horizon
+        async with self.session_factory() as db:
+            reminders = await db.run_sync(crud.get_upcoming_reminders, now, until)
+            deadlines = await db.run_sync(crud.get_open_deadlines, now, until)
+        self._heap = []
+        self._scheduled = {}
+        for task in reminders:
+            self.schedule("reminder", task.id, task.reminder_time)
+        for task in deadlines:
+            self.schedule("overdue", task.id, task.deadline)
+        self.schedule("daily_reset", None, self._next_daily_reset or now)
+        self._loaded_until = until
+        self._next_reload = now + self.reload_interval
+
+    async def _run(self):
+        while True:
+            try:
+                await self._step()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("reminder scheduler failed")
+                self._next_reload = datetime.now()
+                await asyncio.sleep(RETRY_SECONDS)
+
+    async def _step(self):
+        now = datetime.now()
+        if self._next_reload is None or now >= self._next_reload:
+            await self.reload()
+            return
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            fire_at, _, kind, task_id = heapq.heappop(self._heap)
+            if self._scheduled.get((kind, task_id)) == fire_at:
+                del self._scheduled[(kind, task_id)]
+                due.append((kind, task_id, fire_at))
+        if due:
+            await self._fire(due, now)
+            return
+        wake_at = min(self._heap[0][0], self._next_reload) if self._heap else self._next_reload
+        self._wakeup.clear()
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), max((wake_at - now).total_seconds(), 0))
+        except asyncio.TimeoutError:
+            pass
+
+    async def _fire(self, due: list, now: datetime):
+        """期限の来た予定を、DBの最新の状態と一致するものだけ配信する"""
+        reminders = {task_id: fire_at for kind, task_id, fire_at in due if kind == "reminder"}
+        overdue = {task_id: fire_at for kind, task_id, fire_at in due if kind == "overdue"}
+        daily_reset = any(kind == "daily_reset" for kind, _, _ in due)
+        if daily_reset:
+            await self._reset_daily_tasks(now)
+        async with self.session_factory() as db:
+            if reminders:
+                for task in await db.run_sync(crud.get_reminder_tasks, list(reminders)):
+                    if task.reminder_time == reminders[task.id]:
+                        self.publish("reminder", reminder_event(task, task.reminder_time))
+            if overdue:
+                for task in await db.run_sync(crud.get_open_tasks, list(overdue)):
+                    if task.deadline == overdue[task.id]:
+                        self.publish("overdue", overdue_event(task, now))
+
+    async def _reset_daily_tasks(self, now: datetime):
+        """毎日タスクのリセット（全ワーカーが呼び、実行するのは最初の1つ。完了の通知はどのワーカーの接続にも送る）"""
+        catching_up = self._next_daily_reset is None
+        try:
+            run, executed = await self.writer.run_async(job_crud.reset_daily_tasks, now, batch=False)
+        except Exception:
+            logger.exception("daily reset failed")
+            self._next_daily_reset = now + timedelta(seconds=RETRY_SECONDS)
+        else:
+            # 起動時の確認で実行済みだった回は通知しない
+            if run.finished_at is not None and (executed or not catching_up):
+                self.publish("daily_reset", daily_reset_done_event(run))
+            self._next_daily_reset = job_crud.next_reset(now)
+        self.schedule("daily_reset", None, self._next_daily_reset)
+
+reminder_scheduler = ReminderScheduler()
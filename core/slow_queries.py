@@ -0,0 +1,89 @@
+import json
+import logging
+import os
+import re
+from collections import deque
+from datetime import datetime
+from logging.handlers import RotatingFileHandler
+
+# 遅いクエリのログ（環境変数 SLOW_QUERY_MS を指定したときだけ有効）。
+# しきい値を超えた文をパラメータ・発行元のルート・所要時間・実行計画つきで、
+# ローテートするファイル（1行1件のJSON）とメモリ上のリングバッファ（/debug/slow-queries）に残す。
+# 単一ライターが複数のリクエストの分をまとめて発行した文（目標の加算）は、ルートを ", " でつないで記録する。
+
+SLOW_QUERY_MS = os.getenv("SLOW_QUERY_MS")
+SLOW_QUERY_LOG = os.getenv("SLOW_QUERY_LOG", "slow_queries.log")  # 空にするとファイルには書かない
+SLOW_QUERY_LOG_MAX_BYTES = int(os.getenv("SLOW_QUERY_LOG_MAX_BYTES", str(10 * 1024 * 1024)))
+SLOW_QUERY_LOG_BACKUPS = int(os.getenv("SLOW_QUERY_LOG_BACKUPS", "5"))
+SLOW_QUERY_BUFFER = int(os.getenv("SLOW_QUERY_BUFFER", "200"))
+
+# 実行計画を取る文（PRAGMA や SAVEPOINT などは取らない）
+EXPLAINABLE = re.compile(r"^\s*(SELECT|INSERT|UPDATE|DELETE|WITH)\b", re.IGNORECASE)
+
+def plain(value):
+    """パラメータをJSONに書ける値にする"""
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    if isinstance(value, (list, tuple)):
+        return [plain(v) for v in value]
+    if isinstance(value, dict):
+        return {str(k): plain(v) for k, v in value.items()}
+    return str(value)
+
+def query_plan(conn, statement: str, parameters) -> list:
+    """文の実行計画（元のカーソルの結果を壊さないよう、同じ接続の別カーソルで取る）"""
+    if not EXPLAINABLE.match(statement):
+        return []
+    sqlite = conn.dialect.name == "sqlite"
+    cursor = conn.connection.cursor()
+    try:
+        cursor.execute(("EXPLAIN QUERY PLAN " if sqlite else "EXPLAIN ") + statement, parameters)
+        return [row[-1] if sqlite else row[0] for row in cursor.fetchall()]
+    except Exception as e:
+        return [f"(EXPLAIN failed: {e})"]
+    finally:
+        cursor.close()
+
+class SlowQueryLog:
+    """しきい値を超えたクエリの記録（ファイルとリングバッファ）"""
+
+    def __init__(self, threshold_ms: float, path: str = None, buffer_size: int = SLOW_QUERY_BUFFER):
+        self.threshold = threshold_ms / 1000
+        self.entries = deque(maxlen=buffer_size)
+        self.logger = None
+        if path:
+            self.logger = logging.getLogger(f"slow_queries.{path}")
+            self.logger.setLevel(logging.INFO)
+            self.logger.propagate = False
+            if not self.logger.handlers:
+                handler = RotatingFileHandler(
+                    path, maxBytes=SLOW_QUERY_LOG_MAX_BYTES, backupCount=SLOW_QUERY_LOG_BACKUPS, encoding="utf-8"
+                )
+                self.logger.addHandler(handler)
+
+    def record(self, conn, statement: str, parameters, executemany: bool, elapsed: float, route: str = None):
+        if elapsed < self.threshold:
+            return
+        entry = {
+            "at": datetime.now().isoformat(timespec="milliseconds"),
+            "route": route,
+            "duration_ms": round(elapsed * 1000, 2),
+            "statement": statement,
+            "parameters": plain(parameters),
+            "executemany": executemany,
+            # executemany はパラメータが複数組あるので計画は取らない
+            "plan": [] if executemany else query_plan(conn, statement, parameters),
+        }
+        self.entries.append(entry)
+        if self.logger is not None:
+            self.logger.info(json.dumps(entry, ensure_ascii=False))
+
+    def recent(self, limit: int = None) -> list:
+        """新しい順"""
+        entries = list(reversed(self.entries))
+        return entries[:limit] if limit else entries
+
+    def clear(self):
+        self.entries.clear()
+
+slow_query_log = SlowQueryLog(float(SLOW_QUERY_MS), SLOW_QUERY_LOG) if SLOW_QUERY_MS else None
@@ -0,0 +1,102 @@
+import os
+from datetime import datetime, timedelta
+from sqlalchemy import insert, select, delete
+from sqlalchemy.orm import Session
+from models import archive as models
+from models import coins as coin_models
+from models import points as point_models
+from models import meals as meal_models
+from models.ledger import BalanceCheckpoint
+from crud.pagination import paginate, decode_cursor
+
+# この日数より古い行をアーカイブへ移す（環境変数 ARCHIVE_HORIZON_DAYS で変更可能）
+ARCHIVE_HORIZON_DAYS = int(os.getenv("ARCHIVE_HORIZON_DAYS", "365"))
+
+# 元テーブル名 → (元モデル, アーカイブモデル, 日時カラム名)
+ARCHIVES = {
+    "coins": (coin_models.Coin, models.CoinArchive, "created_at"),
+    "points": (point_models.Point, models.PointArchive, "created_at"),
+    "coin_exchanges": (coin_models.CoinExchange, models.CoinExchangeArchive, "created_at"),
+    "meal_history": (meal_models.MealHistory, models.MealHistoryArchive, "consumed_at"),
+}
+
+# 残高チェーンを持つテーブルの通貨
+LEDGER_CURRENCIES = {"coins": "coin", "points": "point"}
+
+def get_watermark(db: Session, table_name: str):
+    """この日時より前の行はアーカイブ済み（未アーカイブならNone）"""
+    state = models.ArchiveState
+    return db.execute(select(state.archived_before).where(state.table_name == table_name)).scalar()
+
+def reaches_archive(db: Session, table_name: str, since: datetime = None) -> bool:
+    """since まで遡る読み取りがアーカイブ済みの範囲に届くか"""
+    watermark = get_watermark(db, table_name)
+    return watermark is not None and (since is None or since < watermark)
+
+def archive_table(db: Session, table_name: str, cutoff: datetime) -> int:
+    """cutoff より古い行をアーカイブテーブルへ移し、移した件数を返す
+
+    台帳への書き込みと競合しないよう core.ledger_writer の単一ライターから呼ぶ（コミットもライター）。
+    """
+    model, archive_model, time_field = ARCHIVES[table_name]
+    source_time = getattr(model, time_field)
+
+    # 残高チェーンの境界にチェックポイントを置き、以降の修復がアーカイブを読まずに済むようにする
+    if table_name in LEDGER_CURRENCIES:
+        last = db.execute(
+            select(model.id, model.created_at, model.balance_after)
+            .where(source_time < cutoff)
+            .order_by(model.created_at.desc(), model.id.desc()).limit(1)
+        ).first()
+        currency = LEDGER_CURRENCIES[table_name]
+        if last is not None and db.get(BalanceCheckpoint, (currency, last.id)) is None:
+            db.add(BalanceCheckpoint(currency=currency, entry_id=last.id, entry_created_at=last.created_at, balance=last.balance_after))
+            db.flush()
+
+    columns = [column.name for column in archive_model.__table__.columns]
+    db.execute(insert(archive_model.__table__).from_select(
+        columns, select(*[model.__table__.c[name] for name in columns]).where(source_time < cutoff)
+    ))
+    moved = db.execute(delete(model.__table__).where(source_time < cutoff)).rowcount
+
+    state = db.get(models.ArchiveState, table_name)
+    if state is None:
+        db.add(models.ArchiveState(table_name=table_name, archived_before=cutoff, archived_rows=moved))
+    else:
+        state.archived_before = max(state.archived_before, cutoff)
+        state.archived_rows += moved
+    return moved
+
+def archive_cutoff(horizon_days: int = ARCHIVE_HORIZON_DAYS) -> datetime:
+    """アーカイブ対象とする日時の境界"""
+    return datetime.now() - timedelta(days=horizon_days)
+
+def get_archived(db: Session, table_name: str, row_id: int):
+    """アーカイブ済みの行をIDで取得"""
+    _, archive_model, _ = ARCHIVES[table_name]
+    return db.query(archive_model).filter(archive_model.id == row_id).first()
+
+def paginate_with_archive(db: Session, table_name: str, build_query, limit: int = 100, before: str = None,
+                          after: str = None, from_date: datetime = None, to_date: datetime = None):
+    """キーセットページングをアーカイブまで透過的に延長する
+
+    build_query はモデルを受け取りフィルタ済みのクエリを返す関数。
+    アーカイブを読むのは、ページが埋まらずアーカイブ済みの範囲まで遡る場合だけ。
+    """
+    model, archive_model, _ = ARCHIVES[table_name]
+    rows = paginate(build_query(model), model, limit, before, after, from_date, to_date)
+    watermark = get_watermark(db, table_name)
+    if watermark is None or (from_date is not None and from_date >= watermark):
+        return rows
+
+    if after:
+        # 新しい側へ向かうページ: カーソルがアーカイブ範囲内なら、アーカイブの行が先に来る
+        if decode_cursor(after)[0] >= watermark:
+            return rows
+        archived = paginate(build_query(archive_model), archive_model, limit, None, after, from_date, to_date)
+        return (archived[::-1] + rows[::-1])[:limit][::-1]
+
+    if len(rows) >= limit:
+        return rows
+    archived = paginate(build_query(archive_model), archive_model, limit - len(rows), before, None, from_date, to_date)
+    return rows + archived
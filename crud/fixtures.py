@@ -0,0 +1,111 @@
+import glob
+import json
+import os
+import re
+from datetime import datetime, timedelta
+from sqlalchemy import DateTime, insert, select
+from sqlalchemy.orm import Session
+from core.database import Base
+from models.fixtures import FixtureVersion
+# 全モデルを読み込んでテーブル名から引けるようにする
+from models import tasks, schedules, study, meals  # noqa: F401
+from crud import ledger
+from crud import tasks as task_crud
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "fixtures")
+
+# 日時は投入時点からの相対指定で書く（"now", "now+7d", "now-2h", "today 09:00", "today+1d 16:00"）
+RELATIVE_TIME = re.compile(r"^(now|today)(?:([+-]\d+)([dhm]))?(?: (\d{1,2}):(\d{2}))?$")
+TIME_UNITS = {"d": "days", "h": "hours", "m": "minutes"}
+
+# テーブル名 → モデル
+MODELS = {mapper.local_table.name: mapper.class_ for mapper in Base.registry.mappers}
+# 取引テーブル名 → 通貨
+LEDGER_TABLES = {model.__tablename__: currency for currency, (model, _) in ledger.LEDGERS.items()}
+
+def fixture_files(directory: str = FIXTURES_DIR) -> list:
+    return sorted(glob.glob(os.path.join(directory, "*.json")))
+
+def read_fixture(path: str) -> dict:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+def parse_time(value: str, now: datetime) -> datetime:
+    """相対指定の日時を投入時点の日時に変換"""
+    match = RELATIVE_TIME.match(value)
+    if match is None:
+        return datetime.fromisoformat(value)
+    base, offset, unit, hour, minute = match.groups()
+    result = now if base == "now" else now.replace(hour=0, minute=0, second=0, microsecond=0)
+    if offset:
+        result += timedelta(**{TIME_UNITS[unit]: int(offset)})
+    if hour is not None:
+        result = result.replace(hour=int(hour), minute=int(minute))
+    return result
+
+def prepare_rows(table_name: str, rows: list, now: datetime) -> list:
+    """DateTimeカラムの相対指定を日時に変換した行を返す"""
+    table = MODELS[table_name].__table__
+    datetime_columns = [column.name for column in table.columns if isinstance(column.type, DateTime)]
+    prepared = []
+    for row in rows:
+        row = dict(row)
+        for name in datetime_columns:
+            if isinstance(row.get(name), str):
+                row[name] = parse_time(row[name], now)
+        prepared.append(row)
+    return prepared
+
+def number_ledger_rows(db: Session, currency: str, rows: list, now: datetime):
+    """現在の残高に続けて取引後残高を振り、残高レコード・日次集計・目標の進捗をまとめて更新"""
+    _, type_field = ledger.LEDGERS[currency]
+    start_balance = balance = ledger.get_balance(db, currency)
+    rollups = {}
+    for row in rows:
+        row.setdefault("created_at", now)
+        balance += ledger.signed_amount(row[type_field], row["amount"])
+        row["balance_after"] = balance
+        rollup = rollups.setdefault((row["created_at"].date(), row["category"]), {"earned": 0, "spent": 0, "transactions": 0})
+        if row[type_field] in ("earned", "spent"):
+            rollup[row[type_field]] += row["amount"]
+        rollup["transactions"] += 1
+    ledger.apply_entries(db, currency, balance - start_balance, len(rows))
+    for (day, category), rollup in rollups.items():
+        ledger.bump_rollup(db, currency, day, category, **rollup)
+    # 投入前からある目標に加算する（フィクスチャの目標は進捗を自分で持つので、取引より後に書いて加算の対象にしない）
+    ledger.add_to_goals(db, currency, sum(rollup["earned"] for rollup in rollups.values()))
+
+def is_loaded(db: Session, name: str, version: int) -> bool:
+    return db.execute(
+        select(FixtureVersion.name).where(FixtureVersion.name == name, FixtureVersion.version == version)
+    ).first() is not None
+
+def load_fixture(db: Session, fixture: dict, now: datetime = None):
+    """フィクスチャを1トランザクションで一括投入し、投入した行数を返す（投入済みのバージョンならNone）"""
+    name, version = fixture["name"], fixture["version"]
+    if is_loaded(db, name, version):
+        return None
+    now = now or datetime.now()
+    total = 0
+    try:
+        for table_name, rows in fixture["tables"].items():
+            rows = prepare_rows(table_name, rows, now)
+            if table_name in LEDGER_TABLES:
+                number_ledger_rows(db, LEDGER_TABLES[table_name], rows, now)
+            if rows:
+                db.execute(insert(MODELS[table_name]), rows)
+            total += len(rows)
+        if "tasks" in fixture["tables"]:
+            task_crud.rebuild_reminders(db)
+        db.add(FixtureVersion(name=name, version=version, rows=total))
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return total
+
+def clear_data(db: Session):
+    """全テーブルの行を削除（フィクスチャの記録も消える）"""
+    for table in reversed(Base.metadata.sorted_tables):
+        db.execute(table.delete())
+    db.commit()
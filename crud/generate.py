@@ -0,0 +1,386 @@
+import random
+import time
+from datetime import date, datetime, timedelta
+from sqlalchemy import case, insert, select, text, update
+from sqlalchemy.orm import Session
+from core.database import Base
+from models.tasks import Task
+from models.schedules import Schedule
+from models.study import Study, Timetable, StudySubject, StudyType
+from models.meals import Meal, MealHistory, MealType, MealCategory
+from models.points import Point, PointGoal, PointReward, PointCategory
+from models.coins import Coin, CoinGoal, CoinShop, CoinExchange, CoinCategory
+from models.ledger import LedgerDailyRollup, BalanceCheckpoint
+from crud import ledger
+from crud import tasks as task_crud
+
+# 負荷試験用の合成データ。同じ seed・scale・基準日なら常に同じ行を作る。
+
+# scale=1 のときの行数（合計約50万行。1000万行なら scale=20 程度）
+BASE_ROWS = {
+    "tasks": 20000,
+    "schedules": 10000,
+    "studies": 5000,
+    "timetable": 30,
+    "meals": 200,
+    "meal_history": 30000,
+    "point_goals": 20,
+    "point_rewards": 50,
+    "points": 200000,
+    "coin_goals": 20,
+    "coin_shop": 50,
+    "coins": 200000,
+    "coin_exchanges": 5000,
+}
+# 履歴を散らばらせる期間（基準日より前の日数）
+HISTORY_DAYS = 365
+# 1回のコミットで書く行数
+CHUNK_SIZE = 20000
+
+TASK_WORDS = ["レポート", "買い物", "掃除", "メール返信", "洗濯", "資料作成", "会議準備", "振り込み", "予約", "読書", "運動", "片付け"]
+TASK_CATEGORIES = ["仕事", "家事", "勉強", "買い物", "健康", None]
+SCHEDULE_WORDS = [("大学の授業", "学校", "教室A"), ("アルバイト", "バイト", "コンビニ"), ("勉強時間", "勉強", "自宅"),
+                  ("部活", "部活", "グラウンド"), ("通院", "個人", "病院"), ("飲み会", "個人", "駅前")]
+STUDY_WORDS = ["演習問題", "小テスト対策", "レポート", "予習", "復習", "過去問"]
+TEACHERS = ["田中先生", "佐藤先生", "鈴木先生", "高橋先生", "伊藤先生", "山田先生", "Smith先生"]
+PERIODS = [("09:00", "10:30"), ("10:45", "12:15"), ("13:30", "15:00"), ("15:15", "16:45"), ("17:00", "18:30"), ("18:45", "20:15")]
+MEAL_WORDS = ["定食", "丼", "パスタ", "サラダ", "スープ", "ラーメン", "カレー", "サンドイッチ", "うどん", "セット"]
+
+# 取引カテゴリの出現頻度（獲得・消費）
+LEDGER_CATEGORIES = {
+    "coin": (
+        {CoinCategory.TASK_COMPLETION: 50, CoinCategory.STUDY_PROGRESS: 25, CoinCategory.DAILY_LOGIN: 20,
+         CoinCategory.WEEKLY_GOAL: 4, CoinCategory.MONTHLY_GOAL: 1},
+        {CoinCategory.SHOPPING: 40, CoinCategory.GAMING: 35, CoinCategory.ENTERTAINMENT: 20, CoinCategory.OTHER: 5},
+    ),
+    "point": (
+        {PointCategory.TASK_COMPLETION: 40, PointCategory.STUDY_PROGRESS: 25, PointCategory.MEAL_HEALTHY: 15,
+         PointCategory.EXERCISE: 10, PointCategory.DAILY_GOAL: 8, PointCategory.WEEKLY_GOAL: 2},
+        {PointCategory.ENTERTAINMENT: 50, PointCategory.SHOPPING: 40, PointCategory.OTHER: 10},
+    ),
+}
+# 取引のうち消費の割合
+SPEND_RATIO = 0.45
+
+def scaled_counts(scale: float) -> dict:
+    return {table: max(1, round(rows * scale)) for table, rows in BASE_ROWS.items()}
+
+def table_rng(seed: int, table: str) -> random.Random:
+    """テーブルごとの乱数（生成順や他テーブルの行数に影響されない）"""
+    return random.Random(f"{seed}:{table}")
+
+def random_time(rng: random.Random, anchor: datetime, days_before: float, days_after: float = 0) -> datetime:
+    seconds = rng.uniform(-days_before * 86400, days_after * 86400)
+    return anchor + timedelta(seconds=int(seconds))
+
+def weighted(rng: random.Random, weights: dict):
+    return rng.choices(list(weights), weights=list(weights.values()))[0]
+
+def generate_tasks(rng: random.Random, count: int, anchor: datetime, context: dict):
+    for i in range(count):
+        created_at = random_time(rng, anchor, HISTORY_DAYS)
+        daily = rng.random() < 0.15
+        deadline = None
+        if not daily and rng.random() < 0.7:
+            deadline = created_at + timedelta(hours=rng.randint(1, 24 * 60))
+        completed = rng.random() < (0.3 if daily else 0.6 if deadline is None or deadline > anchor else 0.85)
+        completed_at = None
+        if completed:
+            end = min(deadline or anchor, anchor)
+            completed_at = created_at + (end - created_at) * rng.random() if end > created_at else created_at
+        yield {
+            "title": f"{rng.choice(TASK_WORDS)} #{i + 1}",
+            "description": rng.choice([None, "詳細メモ", "忘れずに", "できれば午前中に"]),
+            "deadline": deadline,
+            "fatigue": rng.randint(0, 10),
+            "reward": rng.choice([5, 10, 15, 20, 30, 50, 100]),
+            "completed": completed,
+            "type": "daily" if daily else "normal",
+            "category": None if daily else rng.choice(TASK_CATEGORIES),
+            "duration": rng.choice([5, 15, 30, 45, 60, 90, 120, 180]),
+            "priority": weighted(rng, {0: 10, 1: 30, 2: 30, 3: 20, 4: 7, 5: 3}),
+            "completed_at": completed_at,
+            "created_at": created_at,
+            "updated_at": completed_at or created_at,
+        }
+
+def generate_schedules(rng: random.Random, count: int, anchor: datetime, context: dict):
+    for i in range(count):
+        title, category, location = rng.choice(SCHEDULE_WORDS)
+        day = random_time(rng, anchor, HISTORY_DAYS, 30).replace(minute=0, second=0)
+        start_time = day.replace(hour=rng.randint(7, 21), minute=rng.choice([0, 15, 30, 45]))
+        created_at = start_time - timedelta(days=rng.randint(0, 30))
+        yield {
+            "title": f"{title} #{i + 1}",
+            "description": None,
+            "start_time": start_time,
+            "end_time": start_time + timedelta(minutes=rng.choice([30, 60, 90, 120, 180, 240])),
+            "schedule_type": "fixed" if rng.random() < 0.6 else "flexible",
+            "priority": rng.randint(0, 3),
+            "fatigue": rng.randint(0, 6),
+            "completed": start_time < anchor and rng.random() < 0.8,
+            "category": category,
+            "location": location,
+            "created_at": created_at,
+            "updated_at": created_at,
+        }
+
+def generate_studies(rng: random.Random, count: int, anchor: datetime, context: dict):
+    subjects = [subject.value for subject in StudySubject]
+    study_types = [study_type.value for study_type in StudyType]
+    for i in range(count):
+        created_at = random_time(rng, anchor, HISTORY_DAYS)
+        estimated_hours = rng.choice([0.5, 1.0, 1.5, 2.0, 3.0, 5.0])
+        completed = rng.random() < 0.4
+        completed_hours = estimated_hours if completed else round(estimated_hours * rng.random(), 1)
+        completed_at = None
+        if completed:
+            completed_at = min(created_at + timedelta(days=rng.uniform(0, 14)), anchor)
+        subject = rng.choice(subjects)
+        yield {
+            "title": f"{subject} {rng.choice(STUDY_WORDS)} #{i + 1}",
+            "description": None,
+            "subject": subject,
+            "study_type": rng.choice(study_types),
+            "priority": rng.randint(1, 5),
+            "difficulty": rng.randint(1, 5),
+            "estimated_hours": estimated_hours,
+            "completed_hours": completed_hours,
+            "deadline": created_at + timedelta(days=rng.randint(1, 30)) if rng.random() < 0.8 else None,
+            "completed": completed,
+            "progress_percentage": min(100, int(completed_hours / estimated_hours * 100)),
+            "created_at": created_at,
+            "updated_at": completed_at or created_at,
+            "completed_at": completed_at,
+        }
+
+def generate_timetable(rng: random.Random, count: int, anchor: datetime, context: dict):
+    subjects = [subject.value for subject in StudySubject]
+    for i in range(count):
+        start_time, end_time = PERIODS[(i // 5) % len(PERIODS)]
+        subject = rng.choice(subjects)
+        yield {
+            "day_of_week": i % 5,
+            "start_time": start_time,
+            "end_time": end_time,
+            "subject": subject,
+            "title": f"{subject} {i + 1}",
+            "room": f"{rng.choice('ABC')}{rng.randint(101, 310)}",
+            "teacher": rng.choice(TEACHERS),
+            "created_at": anchor,
+            "updated_at": anchor,
+        }
+
+def generate_meals(rng: random.Random, count: int, anchor: datetime, context: dict):
+    meal_types = [meal_type.value for meal_type in MealType]
+    categories = [category.value for category in MealCategory]
+    catalog = context["meals"] = []
+    for i in range(count):
+        meal = {
+            "name": f"{rng.choice(MEAL_WORDS)} {i + 1}",
+            "description": None,
+            "meal_type": rng.choice(meal_types),
+            "category": rng.choice(categories),
+            "calories": rng.randint(100, 1200),
+            "protein": round(rng.uniform(2, 50), 1),
+            "carbs": round(rng.uniform(10, 120), 1),
+            "fat": round(rng.uniform(0.5, 40), 1),
+            "energy_boost": rng.randint(5, 40),
+            "fatigue_reduction": rng.randint(5, 30),
+            "is_recommended": rng.random() < 0.3,
+            "created_at": anchor - timedelta(days=HISTORY_DAYS),
+            "updated_at": anchor - timedelta(days=HISTORY_DAYS),
+        }
+        catalog.append(meal)
+        yield meal
+
+def generate_meal_history(rng: random.Random, count: int, anchor: datetime, context: dict):
+    catalog = context["meals"]
+    for _ in range(count):
+        meal_id = rng.randrange(len(catalog))
+        meal = catalog[meal_id]
+        consumed_at = random_time(rng, anchor, HISTORY_DAYS)
+        yield {
+            "meal_id": meal_id + 1,
+            "meal_name": meal["name"],
+            "meal_type": meal["meal_type"],
+            "category": meal["category"],
+            "calories": meal["calories"],
+            "energy_boost": meal["energy_boost"],
+            "fatigue_reduction": meal["fatigue_reduction"],
+            "consumed_at": consumed_at,
+            "created_at": consumed_at,
+        }
+
+def generate_goals(unit: str):
+    def generate(rng: random.Random, count: int, anchor: datetime, context: dict):
+        for i in range(count):
+            target_amount = rng.choice([1000, 5000, 20000, 50000, 100000, 500000])
+            created_at = random_time(rng, anchor, 14)
+            yield {
+                "title": f"目標{i + 1}: {target_amount}{unit}獲得",
+                "description": None,
+                "target_amount": target_amount,
+                # 進捗は取引を書き終えてから計算し直す
+                "current_amount": 0,
+                "deadline": created_at + timedelta(days=rng.choice([7, 30, 90])),
+                "completed": False,
+                "completed_at": None,
+                "created_at": created_at,
+                "updated_at": created_at,
+            }
+    return generate
+
+def generate_catalog(with_stock: bool):
+    def generate(rng: random.Random, count: int, anchor: datetime, context: dict):
+        for i in range(count):
+            row = {
+                "title": f"ご褒美 {i + 1}",
+                "description": None,
+                "cost": rng.choice([20, 30, 50, 100, 200, 300, 500]),
+                "is_available": rng.random() < 0.9,
+                "used_count": rng.randint(0, 50),
+                "created_at": anchor - timedelta(days=HISTORY_DAYS),
+                "updated_at": anchor - timedelta(days=HISTORY_DAYS),
+            }
+            if with_stock:
+                row["stock"] = rng.choice([-1, -1, 0, 5, 10, 50])
+            yield row
+    return generate
+
+def generate_ledger(currency: str):
+    """時刻順に取引を作り、取引後残高・日次集計・チェックポイントも同時に求める"""
+    def generate(rng: random.Random, count: int, anchor: datetime, context: dict):
+        _, type_field = ledger.LEDGERS[currency]
+        earned_categories, spent_categories = LEDGER_CATEGORIES[currency]
+        state = context[currency] = {"balance": 0, "rollups": {}, "checkpoints": [], "entries": count}
+        start = anchor - timedelta(days=HISTORY_DAYS)
+        step = HISTORY_DAYS * 86400 / count
+        created_at = start
+        for i in range(count):
+            created_at = min(created_at + timedelta(seconds=rng.expovariate(1 / step)), anchor)
+            amount = min(int(rng.paretovariate(1.5) * 10), 1000)
+            if rng.random() < SPEND_RATIO and state["balance"] >= amount:
+                entry_type, category = "spent", weighted(rng, spent_categories).value
+                state["balance"] -= amount
+            else:
+                entry_type, category = "earned", weighted(rng, earned_categories).value
+                state["balance"] += amount
+            rollup = state["rollups"].setdefault((created_at.date(), category), [0, 0, 0])
+            rollup[0 if entry_type == "earned" else 1] += amount
+            rollup[2] += 1
+            if (i + 1) % ledger.CHECKPOINT_INTERVAL == 0:
+                state["checkpoints"].append((i + 1, created_at, state["balance"]))
+            yield {
+                "id": i + 1,
+                "amount": amount,
+                type_field: entry_type,
+                "category": category,
+                "description": None,
+                "balance_after": state["balance"],
+                "created_at": created_at,
+            }
+    return generate
+
+def generate_exchanges(rng: random.Random, count: int, anchor: datetime, context: dict):
+    for _ in range(count):
+        from_amount = rng.choice([10, 20, 50, 100, 200])
+        exchange_rate = rng.choice([0.5, 1.0, 1.0, 1.5])
+        yield {
+            "from_currency": "coin",
+            "to_currency": "point",
+            "from_amount": from_amount,
+            "to_amount": int(from_amount * exchange_rate),
+            "exchange_rate": exchange_rate,
+            "description": "コイン→ポイント交換",
+            "created_at": random_time(rng, anchor, HISTORY_DAYS),
+        }
+
+# テーブル → (モデル, 行の生成関数)。meal_history は meals の後に作る
+GENERATORS = {
+    "tasks": (Task, generate_tasks),
+    "schedules": (Schedule, generate_schedules),
+    "studies": (Study, generate_studies),
+    "timetable": (Timetable, generate_timetable),
+    "meals": (Meal, generate_meals),
+    "meal_history": (MealHistory, generate_meal_history),
+    "point_goals": (PointGoal, generate_goals("ポイント")),
+    "point_rewards": (PointReward, generate_catalog(with_stock=False)),
+    "points": (Point, generate_ledger("point")),
+    "coin_goals": (CoinGoal, generate_goals("コイン")),
+    "coin_shop": (CoinShop, generate_catalog(with_stock=True)),
+    "coins": (Coin, generate_ledger("coin")),
+    "coin_exchanges": (CoinExchange, generate_exchanges),
+}
+
+def is_empty(db: Session) -> bool:
+    """全テーブルが空か"""
+    return all(db.execute(select(1).select_from(table).limit(1)).first() is None
+               for table in Base.metadata.sorted_tables)
+
+def write_chunks(db: Session, model, rows, chunk_size: int = CHUNK_SIZE) -> int:
+    """行を chunk_size 件ずつ一括INSERTしてコミット"""
+    table = model.__table__
+    chunk = []
+    written = 0
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= chunk_size:
+            db.execute(insert(table), chunk)
+            db.commit()
+            written += len(chunk)
+            chunk = []
+    if chunk:
+        db.execute(insert(table), chunk)
+        db.commit()
+        written += len(chunk)
+    return written
+
+def sync_sequence(db: Session, model):
+    """IDを明示して書いたテーブルの採番を最大IDの次に合わせる（PostgreSQLのみ。SQLiteは最大ID+1で採番する）"""
+    if db.get_bind().dialect.name == "postgresql":
+        table = model.__tablename__
+        db.execute(text(f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), (SELECT max(id) FROM {table}))"))
+
+def finish_ledger(db: Session, currency: str, state: dict, anchor: datetime):
+    """生成時に求めた残高・日次集計・チェックポイントを書き、目標の進捗を計算し直す"""
+    rollups = [
+        {"currency": currency, "day": day, "category": category, "earned": earned, "spent": spent, "transactions": transactions}
+        for (day, category), (earned, spent, transactions) in state["rollups"].items()
+    ]
+    checkpoints = [
+        {"currency": currency, "entry_id": entry_id, "entry_created_at": created_at, "balance": balance}
+        for entry_id, created_at, balance in state["checkpoints"]
+    ]
+    write_chunks(db, LedgerDailyRollup, rollups)
+    write_chunks(db, BalanceCheckpoint, checkpoints)
+    sync_sequence(db, ledger.LEDGERS[currency][0])
+    ledger.set_balance(db, currency, state["balance"])
+    ledger.set_entries_since_checkpoint(db, currency, state["entries"] % ledger.CHECKPOINT_INTERVAL)
+    ledger.recompute_goals(db, currency)
+    # 更新・達成日時は実行時刻ではなく基準日に揃える（同じ引数なら同じデータになるように）
+    goal = ledger.GOALS[currency]
+    db.execute(update(goal).values(updated_at=anchor, completed_at=case((goal.completed == True, anchor), else_=None)))
+    db.commit()
+
+def generate(db: Session, scale: float = 1.0, seed: int = 0, anchor: datetime = None,
+             chunk_size: int = CHUNK_SIZE, progress=None) -> dict:
+    """空のDBに合成データを書き込み、テーブルごとの行数を返す
+
+    anchor（省略時は今日の0時）を「現在」として、それ以前の HISTORY_DAYS 日に履歴を散らばらせる。
+    """
+    anchor = anchor or datetime.combine(date.today(), datetime.min.time())
+    counts = scaled_counts(scale)
+    context = {}
+    written = {}
+    for table_name, (model, generate_rows) in GENERATORS.items():
+        started = time.perf_counter()
+        rows = generate_rows(table_rng(seed, table_name), counts[table_name], anchor, context)
+        written[table_name] = write_chunks(db, model, rows, chunk_size)
+        if progress:
+            progress(table_name, written[table_name], time.perf_counter() - started)
+    for currency in ledger.LEDGERS:
+        finish_ledger(db, currency, context[currency], anchor)
+    written["task_reminders"] = task_crud.rebuild_reminders(db)
+    db.commit()
+    return written
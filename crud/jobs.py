@@ -0,0 +1,77 @@
+import os
+import time
+from datetime import datetime, timedelta
+from sqlalchemy import insert, or_, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from models import jobs as models
+from models import tasks as task_models
+from crud import tasks as task_crud
+
+# 毎日タスクのリセット時刻（ローカル時刻 HH:MM）
+DAILY_RESET_TIME = os.getenv("DAILY_RESET_TIME", "00:00")
+DAILY_RESET = "daily_reset"
+
+def reset_boundary(now: datetime, reset_time: str = DAILY_RESET_TIME) -> datetime:
+    """now 以前で最後のリセット時刻"""
+    hour, minute = (int(part) for part in reset_time.split(":"))
+    boundary = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    return boundary if boundary <= now else boundary - timedelta(days=1)
+
+def next_reset(now: datetime, reset_time: str = DAILY_RESET_TIME) -> datetime:
+    """now より後で最初のリセット時刻"""
+    return reset_boundary(now, reset_time) + timedelta(days=1)
+
+def get_run(db: Session, job: str, run_key: str):
+    return db.execute(
+        select(models.JobRun).where(models.JobRun.job == job, models.JobRun.run_key == run_key)
+    ).scalar_one_or_none()
+
+def get_last_run(db: Session, job: str):
+    return db.execute(
+        select(models.JobRun).where(models.JobRun.job == job).order_by(models.JobRun.started_at.desc()).limit(1)
+    ).scalar_one_or_none()
+
+def reset_daily_tasks(db: Session, now: datetime = None):
+    """直近のリセット時刻の回がまだなら、そのリセット時刻より前に完了した毎日タスクを1回のUPDATEで未完了に戻す
+
+    再起動後に遅れて実行しても、リセット時刻の後に完了したタスクは次の回まで完了のまま残す。
+
+    (job, run_key) の一意制約で回を取るので、再起動や複数ワーカーから呼んでも1回しかリセットしない。
+    戻り値は (実行記録, 今回実行したか)。
+    """
+    now = now or datetime.now()
+    boundary = reset_boundary(now)
+    run_key = boundary.isoformat(timespec="minutes")
+    started = time.perf_counter()
+    try:
+        db.execute(insert(models.JobRun).values(job=DAILY_RESET, run_key=run_key, started_at=now))
+        db.flush()
+    except IntegrityError:
+        # 他のワーカー（または再起動前）が実行済み
+        db.rollback()
+        return get_run(db, DAILY_RESET, run_key), False
+    try:
+        reset = db.execute(
+            update(task_models.Task)
+            .where(task_models.Task.type == task_models.TaskType.DAILY, task_models.Task.completed == True,
+                   # 完了日時の無い（completed_at より前からある）完了済みタスクも戻す
+                   or_(task_models.Task.completed_at < boundary, task_models.Task.completed_at.is_(None)))
+            .values(completed=False, completed_at=None)
+            .returning(task_models.Task.id, task_models.Task.deadline)
+        ).all()
+        # 期限のある毎日タスクはリマインダーを戻す
+        reminders = [{"task_id": task_id, "reminder_time": task_crud.reminder_time_for(deadline)}
+                     for task_id, deadline in reset if deadline is not None]
+        if reminders:
+            db.execute(insert(task_models.TaskReminder), reminders)
+        db.execute(
+            update(models.JobRun)
+            .where(models.JobRun.job == DAILY_RESET, models.JobRun.run_key == run_key)
+            .values(finished_at=datetime.now(), duration_ms=round((time.perf_counter() - started) * 1000, 2), rows=len(reset))
+        )
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return get_run(db, DAILY_RESET, run_key), True
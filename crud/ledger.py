@@ -0,0 +1,563 @@
+import heapq
+from sqlalchemy.orm import Session
+from sqlalchemy import event, func, insert, select, update, tuple_, literal, case, union_all
+from sqlalchemy.dialects import postgresql, sqlite
+from datetime import date, datetime, timedelta
+from models import coins as coin_models
+from models import points as point_models
+from models import ledger as models
+from models import archive as archive_models
+from crud import archive
+from core.instrumentation import charged_to, current_stats
+
+# チェックポイントを置く間隔（取引件数）
+CHECKPOINT_INTERVAL = 1000
+# 残高チェーンを読み直す際の1回の取得件数
+CHAIN_CHUNK_SIZE = 1000
+
+# コイン・ポイント共通の台帳エンジン。書き込み系の関数は core.ledger_writer の単一ライターから呼ばれ、
+# コミットもライターがまとめて行う。
+
+# 通貨ごとの取引テーブルと取引タイプのカラム名
+LEDGERS = {
+    "coin": (coin_models.Coin, "coin_type"),
+    "point": (point_models.Point, "point_type"),
+}
+
+# 通貨ごとのアーカイブテーブル（古い取引の移動先）とアーカイブの管理名
+LEDGER_ARCHIVES = {
+    "coin": (archive_models.CoinArchive, "coins"),
+    "point": (archive_models.PointArchive, "points"),
+}
+
+# 通貨ごとの目標テーブル
+GOALS = {
+    "coin": coin_models.CoinGoal,
+    "point": point_models.PointGoal,
+}
+
+def enum_value(value):
+    """Enumでも文字列でも値の文字列を返す"""
+    return getattr(value, "value", value)
+
+def signed_amount(entry_type, amount: int) -> int:
+    """取引タイプから残高の増減額を求める（earned以外は減算）"""
+    return amount if enum_value(entry_type) == "earned" else -amount
+
+def get_latest_balance(db: Session, currency: str) -> int:
+    """取引テーブルの最新行から残高を取得（残高レコードが無い場合のみ使用）"""
+    model, _ = LEDGERS[currency]
+    archive_model, _ = LEDGER_ARCHIVES[currency]
+    for source in (model, archive_model):
+        latest = db.query(source).order_by(source.created_at.desc(), source.id.desc()).first()
+        if latest:
+            return latest.balance_after
+    return 0
+
+def get_balance(db: Session, currency: str) -> int:
+    """残高レコードから現在の残高を取得"""
+    account = models.AccountBalance
+    balance = db.execute(select(account.balance).where(account.currency == currency)).scalar()
+    if balance is None:
+        return get_latest_balance(db, currency)
+    return balance
+
+def open_account(db: Session, currency: str):
+    """残高レコードが無ければ取引テーブルから作成"""
+    account = models.AccountBalance
+    if db.execute(select(account.currency).where(account.currency == currency)).scalar() is None:
+        db.add(account(currency=currency, balance=get_latest_balance(db, currency)))
+        db.flush()
+
+def open_accounts(db: Session):
+    """全通貨の残高レコードを用意"""
+    for currency in LEDGERS:
+        open_account(db, currency)
+    db.commit()
+
+def apply_entries(db: Session, currency: str, delta: int, entries: int, require_funds: bool = False):
+    """残高を delta だけ増減し、前回のチェックポイントからの取引件数に entries を加える（1文のUPDATE）
+
+    更新後の (balance, entries_since_checkpoint) を返す。
+    require_funds の場合は「残高 >= 減算額」を条件に更新し、残高不足ならNoneを返す。
+    """
+    account = models.AccountBalance
+    stmt = update(account).where(account.currency == currency).values(
+        balance=account.balance + delta,
+        entries_since_checkpoint=account.entries_since_checkpoint + entries
+    )
+    if require_funds and delta < 0:
+        stmt = stmt.where(account.balance >= -delta)
+    state = db.execute(
+        stmt.returning(account.balance, account.entries_since_checkpoint).execution_options(synchronize_session=False)
+    ).first()
+    if state is None and db.execute(select(account.currency).where(account.currency == currency)).scalar() is None:
+        open_account(db, currency)
+        return apply_entries(db, currency, delta, entries, require_funds)
+    return state
+
+def apply_delta(db: Session, currency: str, delta: int, require_funds: bool = False):
+    """残高を1文のUPDATEで増減して更新後の残高を返す（取引件数は数えない。残高不足ならNone）"""
+    state = apply_entries(db, currency, delta, 0, require_funds)
+    return state.balance if state is not None else None
+
+def set_balance(db: Session, currency: str, balance: int):
+    """残高を再計算した値で上書き"""
+    open_account(db, currency)
+    account = models.AccountBalance
+    db.execute(
+        update(account).where(account.currency == currency).values(balance=balance)
+        .execution_options(synchronize_session=False)
+    )
+
+def set_entries_since_checkpoint(db: Session, currency: str, entries: int):
+    """前回のチェックポイントからの取引件数を上書き（チェックポイントを置き直した後に呼ぶ）"""
+    account = models.AccountBalance
+    db.execute(
+        update(account).where(account.currency == currency).values(entries_since_checkpoint=entries)
+        .execution_options(synchronize_session=False)
+    )
+
+def add_entry(db: Session, currency: str, **fields):
+    """取引を追加し、同じトランザクション内で残高を更新（コミットは呼び出し側）"""
+    _, type_field = LEDGERS[currency]
+    delta = signed_amount(fields[type_field], fields["amount"])
+    state = apply_entries(db, currency, delta, 1)
+    return write_entry(db, currency, fields, delta, state.balance, state.entries_since_checkpoint)
+
+def write_entry(db: Session, currency: str, fields: dict, delta: int, balance_after: int,
+                entries_since_checkpoint: int = 0):
+    """残高更新済みの取引を記録し、日次集計と目標に反映
+
+    前回のチェックポイントから CHECKPOINT_INTERVAL 件目の取引ならチェックポイントも置く。
+    """
+    model, _ = LEDGERS[currency]
+    fields.pop("balance_after", None)
+    fields.setdefault("created_at", datetime.now())
+    db_entry = model(**fields, balance_after=balance_after)
+    db.add(db_entry)
+    record_rollup(db, currency, db_entry)
+    if delta > 0:
+        advance_goals(db, currency, delta)
+    if entries_since_checkpoint >= CHECKPOINT_INTERVAL:
+        # チェックポイントに取引のIDが要る
+        db.flush()
+        db.add(models.BalanceCheckpoint(currency=currency, entry_id=db_entry.id,
+                                        entry_created_at=db_entry.created_at, balance=balance_after))
+        set_entries_since_checkpoint(db, currency, 0)
+    return db_entry
+
+def checkpoint_tail(db: Session, currency: str, count: int, entries_before: int):
+    """末尾に続けて追加した count 件に、CHECKPOINT_INTERVAL 件ごとのチェックポイントを置く（一括取り込み用）
+
+    entries_before は追加前の「前回のチェックポイントからの取引件数」。
+    """
+    due = [k for k in range(count) if (entries_before + k + 1) % CHECKPOINT_INTERVAL == 0]
+    if not due:
+        return
+    model, _ = LEDGERS[currency]
+    tail = db.execute(
+        select(model.id, model.created_at, model.balance_after)
+        .order_by(model.created_at.desc(), model.id.desc()).limit(count)
+    ).all()[::-1]
+    db.execute(insert(models.BalanceCheckpoint), [
+        {"currency": currency, "entry_id": tail[k].id, "entry_created_at": tail[k].created_at,
+         "balance": tail[k].balance_after}
+        for k in due
+    ])
+    set_entries_since_checkpoint(db, currency, count - due[-1] - 1)
+
+def earned_amount(currency: str, entry) -> int:
+    """取引が目標の進捗に数える獲得量（earned以外は0）"""
+    _, type_field = LEDGERS[currency]
+    return entry.amount if enum_value(getattr(entry, type_field)) == "earned" else 0
+
+def advance_goals(db: Session, currency: str, amount: int):
+    """獲得した量を未達成の目標に加算する
+
+    取引ごとにUPDATEを発行しないよう、同じトランザクション内の加算はコミット直前に1文にまとめる。
+    """
+    pending = db.info.setdefault("pending_goal_amounts", {})
+    pending[currency] = pending.get(currency, 0) + amount
+    # まとめたUPDATEは加算を積んだリクエストのクエリとして数える
+    db.info.setdefault("pending_goal_stats", []).append(current_stats.get())
+
+def add_to_goals(db: Session, currency: str, amount: int, created_before: datetime = None):
+    """目標の進捗に amount を足し、目標額に届いたものを達成済みにする（1文のUPDATE）
+
+    正の amount は未達成の目標だけに足す。負の amount（取引の編集・削除で獲得量が減った分）は
+    達成済みの目標からも引き、目標額を割ったものを未達成に戻す。
+    created_before を渡すと、その日時までに作った目標（その取引を進捗に数えている目標）だけを更新する。
+    """
+    if amount == 0:
+        return
+    goal = GOALS[currency]
+    reached = (goal.target_amount > 0) & (goal.current_amount + amount >= goal.target_amount)
+    stmt = update(goal)
+    if amount > 0:
+        stmt = stmt.where(goal.completed == False)
+    if created_before is not None:
+        stmt = stmt.where(goal.created_at <= created_before)
+    db.execute(
+        stmt.values(
+            current_amount=goal.current_amount + amount,
+            completed=case((reached, True), else_=False),
+            completed_at=case((~reached, None), (goal.completed == True, goal.completed_at), else_=datetime.now()),
+        ).execution_options(synchronize_session=False)
+    )
+
+@event.listens_for(Session, "before_commit")
+def apply_pending_goals(db: Session):
+    """溜まった獲得量を目標に加算する（単一ライター以外のセッションでの書き込みも含む）"""
+    pending = db.info.pop("pending_goal_amounts", None)
+    with charged_to(db.info.pop("pending_goal_stats", [])):
+        for currency, amount in (pending or {}).items():
+            add_to_goals(db, currency, amount)
+
+@event.listens_for(Session, "after_rollback")
+def discard_pending_goals(db: Session):
+    db.info.pop("pending_goal_amounts", None)
+    db.info.pop("pending_goal_stats", None)
+
+def complete_reached_goals(db: Session, currency: str):
+    """目標額に届いた未達成の目標を達成済みにする"""
+    goal = GOALS[currency]
+    db.query(goal).filter(
+        goal.completed == False,
+        goal.target_amount > 0,
+        goal.current_amount >= goal.target_amount
+    ).update({goal.completed: True, goal.completed_at: datetime.now()}, synchronize_session=False)
+
+def recompute_goals(db: Session, currency: str = None):
+    """目標の進捗を取引履歴から計算し直す（目標作成以降の獲得量の合計、バックフィル用）"""
+    currencies = [currency] if currency else list(LEDGERS)
+    for cur in currencies:
+        model, type_field = LEDGERS[cur]
+        archive_model, _ = LEDGER_ARCHIVES[cur]
+        goal = GOALS[cur]
+        earned = [
+            select(func.coalesce(func.sum(source.amount), 0)).where(
+                getattr(source, type_field) == "earned",
+                source.created_at >= goal.created_at
+            ).scalar_subquery()
+            for source in (model, archive_model)
+        ]
+        db.query(goal).update({goal.current_amount: earned[0] + earned[1]}, synchronize_session=False)
+        complete_reached_goals(db, cur)
+    db.commit()
+
+def post(db: Session, legs: list, check_funds: bool = True):
+    """複数レッグの取引を1つのトランザクションで記帳
+
+    legs は {"currency", "amount", "type", "category", "description"} のリスト。
+    check_funds の場合、残高が足りない通貨があれば何も書き込まずNoneを返す。
+    """
+    # 各レッグの残高を条件付きUPDATEで先に動かす（残高不足なら戻してNone）
+    applied = []
+    for leg in legs:
+        delta = signed_amount(leg["type"], leg["amount"])
+        state = apply_entries(db, leg["currency"], delta, 1, require_funds=check_funds)
+        if state is None:
+            for currency, applied_delta, _ in applied:
+                apply_entries(db, currency, -applied_delta, -1)
+            return None
+        applied.append((leg["currency"], delta, state))
+
+    entries = []
+    for leg, (currency, delta, state) in zip(legs, applied):
+        _, type_field = LEDGERS[currency]
+        fields = {
+            "amount": leg["amount"],
+            type_field: leg["type"],
+            "category": leg.get("category", "other"),
+            "description": leg.get("description"),
+        }
+        entries.append(write_entry(db, currency, fields, delta, state.balance, state.entries_since_checkpoint))
+    return entries
+
+def list_entries(db: Session, currency: str, entry_type: str = None, category: str = None, limit: int = 100,
+                 before: str = None, after: str = None, from_date: datetime = None, to_date: datetime = None):
+    """取引一覧を新しい順にキーセットページングで取得（古いページはアーカイブから読む）"""
+    _, type_field = LEDGERS[currency]
+    _, table_name = LEDGER_ARCHIVES[currency]
+
+    def build_query(model):
+        query = db.query(model)
+        if entry_type:
+            query = query.filter(getattr(model, type_field) == entry_type)
+        if category:
+            query = query.filter(model.category == category)
+        return query
+
+    return archive.paginate_with_archive(db, table_name, build_query, limit, before, after, from_date, to_date)
+
+def get_entry(db: Session, currency: str, entry_id: int, include_archive: bool = False):
+    """取引をIDで取得（include_archive の場合はアーカイブ済みの取引も探す、読み取り専用）"""
+    model, _ = LEDGERS[currency]
+    entry = db.query(model).filter(model.id == entry_id).first()
+    if entry is None and include_archive:
+        _, table_name = LEDGER_ARCHIVES[currency]
+        entry = archive.get_archived(db, table_name, entry_id)
+    return entry
+
+def update_entry(db: Session, currency: str, entry_id: int, update_data: dict):
+    """取引を編集し、日次集計・目標の進捗と以降の残高チェーンを更新"""
+    db_entry = get_entry(db, currency, entry_id)
+    if db_entry:
+        record_rollup(db, currency, db_entry, sign=-1)
+        earned_before = earned_amount(currency, db_entry)
+        for field, value in update_data.items():
+            setattr(db_entry, field, value)
+        record_rollup(db, currency, db_entry)
+        add_to_goals(db, currency, earned_amount(currency, db_entry) - earned_before, db_entry.created_at)
+        # 編集した取引以降の残高を再計算
+        repair_chain(db, currency, db_entry.created_at, db_entry.id)
+        db.refresh(db_entry)
+    return db_entry
+
+def delete_entry(db: Session, currency: str, entry_id: int):
+    """取引を削除し、日次集計・目標の進捗と以降の残高チェーンを更新"""
+    db_entry = get_entry(db, currency, entry_id)
+    if db_entry:
+        record_rollup(db, currency, db_entry, sign=-1)
+        add_to_goals(db, currency, -earned_amount(currency, db_entry), db_entry.created_at)
+        db.delete(db_entry)
+        # 削除した取引以降の残高を再計算
+        repair_chain(db, currency, db_entry.created_at, db_entry.id)
+        return True
+    return False
+
+def iter_chain(db: Session, currency: str, after=None):
+    """(created_at, id) 順に取引を少しずつ読み出す（アーカイブも含む、メモリ使用量は一定）
+
+    各行の archived はその行がアーカイブテーブルにあるかを示す。
+    """
+    model, _ = LEDGERS[currency]
+    archive_model, table_name = LEDGER_ARCHIVES[currency]
+    watermark = archive.get_watermark(db, table_name)
+    hot_rows = iter_table(db, currency, model, after)
+    if watermark is None or (after is not None and after[0] >= watermark):
+        return hot_rows
+    archived_rows = iter_table(db, currency, archive_model, after)
+    return heapq.merge(archived_rows, hot_rows, key=lambda row: (row.created_at, row.id))
+
+def iter_table(db: Session, currency: str, model, after=None):
+    """1つのテーブルから (created_at, id) 順に取引を少しずつ読み出す"""
+    _, type_field = LEDGERS[currency]
+    archived = literal(model is not LEDGERS[currency][0]).label("archived")
+    columns = (model.id, model.created_at, model.amount, getattr(model, type_field), model.balance_after, archived)
+    while True:
+        query = select(*columns)
+        if after is not None:
+            query = query.where(tuple_(model.created_at, model.id) > tuple_(*after))
+        rows = db.execute(query.order_by(model.created_at, model.id).limit(CHAIN_CHUNK_SIZE)).all()
+        if not rows:
+            return
+        yield from rows
+        after = (rows[-1].created_at, rows[-1].id)
+
+def get_checkpoint_before(db: Session, currency: str, position):
+    """指定位置より前で最も近いチェックポイントを取得"""
+    checkpoint = models.BalanceCheckpoint
+    return db.query(checkpoint).filter(
+        checkpoint.currency == currency,
+        tuple_(checkpoint.entry_created_at, checkpoint.entry_id) < tuple_(*position)
+    ).order_by(checkpoint.entry_created_at.desc(), checkpoint.entry_id.desc()).first()
+
+def repair_chain(db: Session, currency: str, created_at, entry_id: int = 0):
+    """編集・削除した位置以降の balance_after を直前のチェックポイントから再計算"""
+    model, type_field = LEDGERS[currency]
+    archive_model, _ = LEDGER_ARCHIVES[currency]
+    checkpoint = models.BalanceCheckpoint
+    db.flush()
+
+    # 修正位置以降のチェックポイントは無効になる
+    position = (created_at, entry_id)
+    db.query(checkpoint).filter(
+        checkpoint.currency == currency,
+        tuple_(checkpoint.entry_created_at, checkpoint.entry_id) >= tuple_(*position)
+    ).delete(synchronize_session=False)
+
+    start = get_checkpoint_before(db, currency, position)
+    after = (start.entry_created_at, start.entry_id) if start else None
+    balance = start.balance if start else 0
+
+    # 変更は行のあるテーブルごとにまとめて書き戻す
+    changes = {model: [], archive_model: []}
+    count = 0
+    for row in iter_chain(db, currency, after):
+        balance += signed_amount(getattr(row, type_field), row.amount)
+        count += 1
+        if row.balance_after != balance:
+            target = archive_model if row.archived else model
+            changes[target].append({"id": row.id, "balance_after": balance})
+            if len(changes[target]) >= CHAIN_CHUNK_SIZE:
+                db.execute(update(target), changes[target])
+                changes[target] = []
+        # 開始チェックポイントと修正位置の間にはチェックポイントが無い（あれば開始位置になっている）ので、
+        # 修正位置より前の行も含めて歩いた範囲に置き直す
+        if count % CHECKPOINT_INTERVAL == 0:
+            db.add(checkpoint(currency=currency, entry_id=row.id, entry_created_at=row.created_at, balance=balance))
+    for target, rows in changes.items():
+        if rows:
+            db.execute(update(target), rows)
+
+    set_balance(db, currency, balance)
+    set_entries_since_checkpoint(db, currency, count % CHECKPOINT_INTERVAL)
+    return balance
+
+def verify_chain(db: Session, currency: str, write_checkpoints: bool = True):
+    """残高チェーン全体を先頭から検証（不整合が無い範囲でチェックポイントを作り直す）"""
+    _, type_field = LEDGERS[currency]
+    checkpoint = models.BalanceCheckpoint
+    if write_checkpoints:
+        db.query(checkpoint).filter(checkpoint.currency == currency).delete()
+
+    balance = 0
+    rows = 0
+    checkpointed = 0
+    first_mismatch = None
+    for row in iter_chain(db, currency):
+        balance += signed_amount(getattr(row, type_field), row.amount)
+        rows += 1
+        if first_mismatch is None and row.balance_after != balance:
+            first_mismatch = {"id": row.id, "created_at": row.created_at, "expected": balance, "actual": row.balance_after}
+        if write_checkpoints and first_mismatch is None and rows % CHECKPOINT_INTERVAL == 0:
+            db.add(checkpoint(currency=currency, entry_id=row.id, entry_created_at=row.created_at, balance=balance))
+            checkpointed = rows
+    if write_checkpoints:
+        open_account(db, currency)
+        set_entries_since_checkpoint(db, currency, rows - checkpointed)
+        db.commit()
+
+    account_balance = get_balance(db, currency)
+    return {
+        "currency": currency,
+        "rows": rows,
+        "ok": first_mismatch is None and account_balance == balance,
+        "balance": balance,
+        "account_balance": account_balance,
+        "first_mismatch": first_mismatch,
+    }
+
+def record_rollup(db: Session, currency: str, entry, sign: int = 1):
+    """取引1件分を日次集計に反映（sign=-1で取り消し）"""
+    _, type_field = LEDGERS[currency]
+    entry_type = enum_value(getattr(entry, type_field))
+    earned = entry.amount if entry_type == "earned" else 0
+    spent = entry.amount if entry_type == "spent" else 0
+    bump_rollup(db, currency, entry.created_at.date(), enum_value(entry.category),
+                sign * earned, sign * spent, sign)
+
+def bump_rollup(db: Session, currency: str, day: date, category: str, earned: int, spent: int, transactions: int):
+    """日次集計の1行に加算（無ければ作る）
+
+    読んで書き戻すと複数のレプリカから同時に加算したときに片方が失われるので、1文のUPSERTで加算する。
+    """
+    table = models.LedgerDailyRollup.__table__
+    dialect_insert = postgresql.insert if db.get_bind().dialect.name == "postgresql" else sqlite.insert
+    statement = dialect_insert(table).values(
+        currency=currency, day=day, category=category, earned=earned, spent=spent, transactions=transactions
+    )
+    db.execute(statement.on_conflict_do_update(
+        index_elements=[table.c.currency, table.c.day, table.c.category],
+        set_={name: table.c[name] + statement.excluded[name] for name in ("earned", "spent", "transactions")},
+    ))
+
+def rebuild_rollups(db: Session, currency: str = None):
+    """取引履歴から日次集計を作り直す（バックフィル用）"""
+    currencies = [currency] if currency else list(LEDGERS)
+    for cur in currencies:
+        model, type_field = LEDGERS[cur]
+        archive_model, _ = LEDGER_ARCHIVES[cur]
+        db.query(models.LedgerDailyRollup).filter(models.LedgerDailyRollup.currency == cur).delete()
+
+        rows = []
+        for source in (model, archive_model):
+            entry_type = getattr(source, type_field)
+            day = func.date(source.created_at)
+            rows += db.query(day, source.category, entry_type, func.sum(source.amount), func.count(source.id)).group_by(
+                day, source.category, entry_type
+            ).all()
+
+        rollups = {}
+        for row_day, category, row_type, amount, count in rows:
+            if isinstance(row_day, str):
+                row_day = date.fromisoformat(row_day)
+            key = (row_day, enum_value(category))
+            rollup = rollups.setdefault(key, {"currency": cur, "day": key[0], "category": key[1], "earned": 0, "spent": 0, "transactions": 0})
+            rollup["transactions"] += count
+            if enum_value(row_type) == "earned":
+                rollup["earned"] += amount
+            elif enum_value(row_type) == "spent":
+                rollup["spent"] += amount
+
+        db.bulk_insert_mappings(models.LedgerDailyRollup, list(rollups.values()))
+    db.commit()
+
+def partial_day_totals(db: Session, currency: str, since: datetime, until: datetime):
+    """日次集計では切り出せない期間（日の途中から）のカテゴリ別集計を取引履歴から求める
+
+    読むのは [since, until) の取引だけで、取引・アーカイブとも (created_at, id) のインデックスで範囲を引く
+    （query_plans の ledger.partial_day_totals で確認）。
+    """
+    model, type_field = LEDGERS[currency]
+    archive_model, _ = LEDGER_ARCHIVES[currency]
+    entries = union_all(*[
+        select(source.category, getattr(source, type_field).label("entry_type"), source.amount)
+        .where(source.created_at >= since, source.created_at < until)
+        for source in (model, archive_model)
+    ]).subquery()
+    earned = case((entries.c.entry_type == "earned", entries.c.amount), else_=0)
+    spent = case((entries.c.entry_type == "spent", entries.c.amount), else_=0)
+    return db.execute(
+        select(entries.c.category, func.sum(earned), func.sum(spent), func.count())
+        .group_by(entries.c.category)
+    ).all()
+
+def get_statistics(db: Session, currency: str, days: int = 30):
+    """統計を計算（日をまたぐ分は日次集計から、期間の最初の日の途中からの分だけ取引履歴から）
+
+    期間は now から days 日前までの移動窓なので、最初の日は since 以降の分だけを数える必要があり、
+    日次集計では切り出せない。この1日未満の範囲だけは例外として取引履歴を読む（partial_day_totals）。
+    """
+    rollup = models.LedgerDailyRollup
+    now = datetime.now()
+    since = now - timedelta(days=days)
+    first_full_day = since.date() + timedelta(days=1)
+    month_start = now.replace(day=1).date()
+
+    # 期間中のカテゴリ別集計（最初の日は since 以降の取引だけを数える）
+    totals = {}
+    rows = db.query(
+        rollup.category, func.sum(rollup.earned), func.sum(rollup.spent), func.sum(rollup.transactions)
+    ).filter(rollup.currency == currency, rollup.day >= first_full_day).group_by(rollup.category).all()
+    partial = partial_day_totals(db, currency, since, datetime.combine(first_full_day, datetime.min.time()))
+    for category, earned, spent, count in list(rows) + list(partial):
+        category = enum_value(category)
+        totals[category] = [a + b for a, b in zip(totals.get(category, (0, 0, 0)), (earned, spent, count))]
+    rows = [(category, earned, spent, count) for category, (earned, spent, count) in totals.items()]
+
+    total_earned = sum(earned for _, earned, _, _ in rows)
+    total_spent = sum(spent for _, _, spent, _ in rows)
+    total_transactions = sum(count for _, _, _, count in rows)
+
+    # 月間統計
+    monthly_earned, monthly_spent = db.query(
+        func.coalesce(func.sum(rollup.earned), 0), func.coalesce(func.sum(rollup.spent), 0)
+    ).filter(rollup.currency == currency, rollup.day >= month_start).one()
+
+    top_categories = [
+        {"category": category, "amount": earned}
+        for category, earned, _, _ in sorted((r for r in rows if r[1] > 0), key=lambda x: x[1], reverse=True)[:5]
+    ]
+
+    return {
+        "total_earned": total_earned,
+        "total_spent": total_spent,
+        "current_balance": get_balance(db, currency),
+        "total_transactions": total_transactions,
+        "monthly_earned": monthly_earned,
+        "monthly_spent": monthly_spent,
+        "top_categories": top_categories
+    }
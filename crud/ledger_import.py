@@ -0,0 +1,265 @@
+import csv
+import json
+import time
+from collections import deque
+from datetime import datetime
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
+from crud import ledger
+from models.ledger import AccountBalance
+
+class LedgerImportError(ValueError):
+    """取り込みファイルの不正な行
+
+    バッチごとにコミットするため、エラーの前のバッチは取り込み済みになる。
+    imported は取り込み済みの件数、committed_line は取り込み済みの最後の行番号で、
+    skip_lines に committed_line を渡せば続きから取り込める。
+    """
+
+    def __init__(self, line_no: int, message: str):
+        super().__init__(f"{line_no}行目: {message}")
+        self.line_no = line_no
+        self.imported = 0
+        self.committed_line = 0
+
+class LedgerImporter:
+    """NDJSON/CSVを1行ずつ受け取り、一定件数ごとにバッチとして返す"""
+
+    def __init__(self, currency: str, fmt: str = "ndjson", batch_size: int = 5000, skip_lines: int = 0):
+        if fmt not in ("ndjson", "csv"):
+            raise ValueError(f"Unsupported format: {fmt}")
+        model, type_field = ledger.LEDGERS[currency]
+        self.currency = currency
+        self.fmt = fmt
+        self.batch_size = batch_size
+        self.skip_lines = skip_lines
+        self.type_field = type_field
+        self.types = set(model.__table__.c[type_field].type.enums)
+        self.categories = set(model.__table__.c.category.type.enums)
+        self.header = None
+        self.line_no = 0  # 読み終えた物理行数
+        self.record_line = 0  # 処理中のレコードの開始行
+        self.batch_end_line = 0  # 最後に返したバッチの最終行
+        self.rows = []
+        # CSVはファイル全体を1つの csv.reader で読む（引用符内の改行を含むフィールドのため）。
+        # 引用符が閉じてレコードが揃った時だけ読み進めるので、行を受け取りながらでも途中で読み切らない
+        self.pending = deque()
+        self.quotes = 0
+        self.reader = csv.reader(iter(self.pending.popleft, None))
+
+    def feed(self, line: str):
+        """1行取り込み、バッチが溜まったら返す"""
+        self.line_no += 1
+        line = line.rstrip("\r\n")
+        if self.fmt == "csv":
+            if not self.pending:
+                self.record_line = self.line_no
+            self.pending.append(line + "\n")
+            self.quotes += line.count('"')
+            if self.quotes % 2:
+                # 引用符の中で改行している（レコードの途中）
+                return None
+            self.quotes = 0
+            values = next(self.reader)
+            if not values:
+                return None
+            if self.header is None:
+                self.header = values
+                return None
+            if self.line_no <= self.skip_lines:
+                return None
+            raw = dict(zip(self.header, values))
+        else:
+            self.record_line = self.line_no
+            if not line.strip() or self.line_no <= self.skip_lines:
+                return None
+            try:
+                raw = json.loads(line)
+            except json.JSONDecodeError as e:
+                raise LedgerImportError(self.line_no, f"JSONを解析できません ({e.msg})")
+
+        self.rows.append(self.normalize(raw))
+        if len(self.rows) >= self.batch_size:
+            return self.flush()
+        return None
+
+    def flush(self):
+        """溜まっている行をバッチとして返す"""
+        if self.pending:
+            raise LedgerImportError(self.record_line, "引用符が閉じていません")
+        rows, self.rows = self.rows, []
+        self.batch_end_line = self.line_no
+        return rows
+
+    def normalize(self, raw: dict) -> dict:
+        """1行を取引テーブルのカラムに変換"""
+        if not isinstance(raw, dict):
+            raise LedgerImportError(self.record_line, "行がオブジェクトではありません")
+        entry_type = raw.get(self.type_field) or raw.get("type") or "earned"
+        category = raw.get("category") or "other"
+        if not isinstance(entry_type, str) or entry_type not in self.types:
+            raise LedgerImportError(self.record_line, f"不正な取引タイプ: {entry_type}")
+        if not isinstance(category, str) or category not in self.categories:
+            raise LedgerImportError(self.record_line, f"不正なカテゴリ: {category}")
+        try:
+            amount = int(raw.get("amount", 0))
+            created_at = datetime.fromisoformat(raw["created_at"]) if raw.get("created_at") else datetime.now()
+        except (TypeError, ValueError) as e:
+            raise LedgerImportError(self.record_line, str(e))
+        # 増減の向きは取引タイプで決まる（signed_amount）ので、金額は正の数だけを受け付ける
+        if amount <= 0:
+            raise LedgerImportError(self.record_line, f"金額は正の数で指定してください: {amount}")
+
+        return {
+            "amount": amount,
+            self.type_field: entry_type,
+            "category": category,
+            "description": raw.get("description") or None,
+            "created_at": created_at,
+        }
+
+def import_batch(db: Session, currency: str, rows: list):
+    """バッチをまとめてINSERTし、残高と日次集計を1回の計算で更新（単一ライターから実行）
+
+    取り込んだ件数と、既存の並び（created_at順）より古い行があった場合はその最古の日時を返す。
+    """
+    model, type_field = ledger.LEDGERS[currency]
+    latest = db.execute(select(model.created_at).order_by(model.created_at.desc(), model.id.desc()).limit(1)).scalar()
+
+    # 残高レコードは取り込む行を書く前に用意する（後から作ると取り込んだ行の残高から作られ、差分が二重に加算される）
+    ledger.open_account(db, currency)
+    account = db.execute(
+        select(AccountBalance.balance, AccountBalance.entries_since_checkpoint).where(AccountBalance.currency == currency)
+    ).one()
+    start_balance = balance = account.balance
+    credited = 0
+    rollups = {}
+    out_of_order = None
+    for row in rows:
+        if latest is not None and row["created_at"] < latest:
+            out_of_order = min(out_of_order or row["created_at"], row["created_at"])
+        latest = max(latest or row["created_at"], row["created_at"])
+
+        delta = ledger.signed_amount(row[type_field], row["amount"])
+        balance += delta
+        row["balance_after"] = balance
+        if delta > 0:
+            credited += delta
+
+        key = (row["created_at"].date(), row["category"])
+        earned, spent, count = rollups.get(key, (0, 0, 0))
+        rollups[key] = (
+            earned + (row["amount"] if row[type_field] == "earned" else 0),
+            spent + (row["amount"] if row[type_field] == "spent" else 0),
+            count + 1,
+        )
+
+    db.execute(insert(model), rows)
+    ledger.apply_entries(db, currency, balance - start_balance, len(rows))
+    if out_of_order is None:
+        # 日時順に並んだバッチは末尾に付くので、その場でチェックポイントを置く（並んでいない場合は最後の組み直しで置く）
+        ledger.checkpoint_tail(db, currency, len(rows), account.entries_since_checkpoint)
+    for (day, category), (earned, spent, count) in rollups.items():
+        ledger.bump_rollup(db, currency, day, category, earned, spent, count)
+    if credited:
+        ledger.advance_goals(db, currency, credited)
+    return len(rows), out_of_order
+
+def finish_import(db: Session, currency: str, repair_from):
+    """日時順でない行があった場合はその位置以降の残高チェーンを組み直し、最終残高を返す"""
+    if repair_from is not None:
+        return ledger.repair_chain(db, currency, repair_from)
+    return ledger.get_balance(db, currency)
+
+class ImportProgress:
+    """コミット済みのバッチの集計（エラー時は続きから取り込むための位置を例外に載せる）"""
+
+    def __init__(self, importer: LedgerImporter):
+        self.importer = importer
+        self.started = time.perf_counter()
+        self.imported = 0
+        self.committed_line = importer.skip_lines
+        self.repair_from = None
+
+    def committed(self, count: int, out_of_order, end_line: int):
+        self.imported += count
+        self.committed_line = max(self.committed_line, end_line)
+        if out_of_order is not None:
+            self.repair_from = min(self.repair_from or out_of_order, out_of_order)
+
+    def failed(self, error: LedgerImportError):
+        error.imported = self.imported
+        error.committed_line = self.committed_line
+
+    def stats(self, balance: int) -> dict:
+        elapsed = time.perf_counter() - self.started
+        return {
+            "imported": self.imported,
+            "committed_line": self.committed_line,
+            "seconds": round(elapsed, 3),
+            "rows_per_second": round(self.imported / elapsed) if elapsed > 0 else self.imported,
+            "balance": balance,
+        }
+
+def import_lines(lines, currency: str, fmt: str, writer, batch_size: int = 5000, skip_lines: int = 0) -> dict:
+    """行のイテレータを取り込む（バッチは単一ライターで実行）
+
+    バッチごとにコミットする。不正な行があればそこで止め、LedgerImportError に取り込み済みの件数と行を載せる。
+    """
+    importer = LedgerImporter(currency, fmt, batch_size, skip_lines)
+    progress = ImportProgress(importer)
+
+    def run_batch(batch):
+        count, out_of_order = writer.run(import_batch, currency, batch)
+        progress.committed(count, out_of_order, importer.batch_end_line)
+
+    try:
+        for line in lines:
+            batch = importer.feed(line)
+            if batch:
+                run_batch(batch)
+        batch = importer.flush()
+        if batch:
+            run_batch(batch)
+    except LedgerImportError as e:
+        progress.failed(e)
+        raise
+    finally:
+        # 残高チェーンの組み直しは最後に1回だけ行う（途中で止まった場合もコミット済みの分は組み直す）
+        balance = writer.run(finish_import, currency, progress.repair_from)
+    return progress.stats(balance)
+
+async def aiter_lines(chunks):
+    """バイト列のチャンクを行単位に分割（ファイル全体をメモリに載せない）"""
+    buffer = b""
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            yield line.decode("utf-8-sig")
+    if buffer:
+        yield buffer.decode("utf-8-sig")
+
+async def import_stream(chunks, currency: str, fmt: str, writer, batch_size: int = 5000, skip_lines: int = 0) -> dict:
+    """リクエストボディを受信しながら取り込む（バッチは単一ライターで実行。エラー時の扱いは import_lines と同じ）"""
+    importer = LedgerImporter(currency, fmt, batch_size, skip_lines)
+    progress = ImportProgress(importer)
+
+    async def run_batch(batch):
+        count, out_of_order = await writer.run_async(import_batch, currency, batch)
+        progress.committed(count, out_of_order, importer.batch_end_line)
+
+    try:
+        async for line in aiter_lines(chunks):
+            batch = importer.feed(line)
+            if batch:
+                await run_batch(batch)
+        batch = importer.flush()
+        if batch:
+            await run_batch(batch)
+    except LedgerImportError as e:
+        progress.failed(e)
+        raise
+    finally:
+        balance = await writer.run_async(finish_import, currency, progress.repair_from)
+    return progress.stats(balance)
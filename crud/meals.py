@@ -3,7 +3,9 @@ from sqlalchemy import and_, or_, func, desc
 from datetime import datetime, timedelta
 from typing import List
 from models import meals as models
+from models import archive as archive_models
 from schemas import meals as schemas
+from crud import archive
 
 def get_meals(db: Session, meal_type: str = None, category: str = None, is_recommended: bool = None):
     query = db.query(models.Meal)
@@ -22,7 +24,6 @@ def create_meal(db: Session, meal: schemas.MealCreate):
     db_meal = models.Meal(**meal.model_dump())
     db.add(db_meal)
     db.commit()
-    db.refresh(db_meal)
     return db_meal
 
 def update_meal(db: Session, meal_id: int, meal: schemas.MealUpdate):
@@ -124,19 +125,28 @@ def get_recommendation_reason(meal: models.Meal, current_energy: int, current_fa
     
     return "、".join(reasons)
 
+def query_history_since(db: Session, start_date: datetime):
+    """start_date 以降の食事履歴を新しい順に取得（期間がアーカイブ済みの範囲に届く場合はアーカイブも読む）"""
+    sources = [models.MealHistory]
+    if archive.reaches_archive(db, "meal_history", start_date):
+        sources.append(archive_models.MealHistoryArchive)
+    history = []
+    for source in sources:
+        history += db.query(source).filter(source.consumed_at >= start_date).order_by(source.consumed_at.desc()).all()
+    if len(sources) > 1:
+        history.sort(key=lambda h: h.consumed_at, reverse=True)
+    return history
+
 def get_meal_history(db: Session, days: int = 7):
     """食事履歴を取得"""
     start_date = datetime.now() - timedelta(days=days)
-    return db.query(models.MealHistory).filter(
-        models.MealHistory.consumed_at >= start_date
-    ).order_by(models.MealHistory.consumed_at.desc()).all()
+    return query_history_since(db, start_date)
 
 def add_meal_to_history(db: Session, meal_history: schemas.MealHistoryCreate):
     """食事履歴に追加"""
     db_meal_history = models.MealHistory(**meal_history.model_dump())
     db.add(db_meal_history)
     db.commit()
-    db.refresh(db_meal_history)
     return db_meal_history
 
 def get_meal_statistics(db: Session, days: int = 7):
@@ -144,9 +154,7 @@ def get_meal_statistics(db: Session, days: int = 7):
     start_date = datetime.now() - timedelta(days=days)
     
     # 期間中の食事履歴
-    history = db.query(models.MealHistory).filter(
-        models.MealHistory.consumed_at >= start_date
-    ).all()
+    history = query_history_since(db, start_date)
     
     if not history:
         return {
@@ -0,0 +1,40 @@
+import base64
+from datetime import datetime
+from sqlalchemy import tuple_
+
+def encode_cursor(row) -> str:
+    """行の (created_at, id) をカーソル文字列にする"""
+    raw = f"{row.created_at.isoformat()}|{row.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+def decode_cursor(cursor: str):
+    """カーソル文字列を (created_at, id) に戻す（不正な場合はValueError）"""
+    try:
+        created_at, row_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(created_at), int(row_id)
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+def paginate(query, model, limit: int = 100, before: str = None, after: str = None,
+             from_date: datetime = None, to_date: datetime = None):
+    """(created_at, id) のキーセットでページングし、新しい順で返す"""
+    key = tuple_(model.created_at, model.id)
+    if from_date:
+        query = query.filter(model.created_at >= from_date)
+    if to_date:
+        query = query.filter(model.created_at <= to_date)
+    if before:
+        query = query.filter(key < tuple_(*decode_cursor(before)))
+
+    if after:
+        # 古い方から取得して並べ直す
+        query = query.filter(key > tuple_(*decode_cursor(after)))
+        rows = query.order_by(model.created_at.asc(), model.id.asc()).limit(limit).all()
+        return rows[::-1]
+    return query.order_by(model.created_at.desc(), model.id.desc()).limit(limit).all()
+
+def cursor_headers(rows) -> dict:
+    """次ページ（before）と前ページ（after）のカーソルをレスポンスヘッダー用に返す"""
+    if not rows:
+        return {}
+    return {"X-Next-Cursor": encode_cursor(rows[-1]), "X-Prev-Cursor": encode_cursor(rows[0])}
@@ -1,54 +1,31 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, func, desc
+from sqlalchemy import and_, or_, func, desc, select, update
 from datetime import datetime, timedelta
 from typing import List
 from models import points as models
 from schemas import points as schemas
+from crud import ledger
 
-def get_points(db: Session, point_type: str = None, category: str = None, limit: int = 100):
-    query = db.query(models.Point)
-    if point_type:
-        query = query.filter(models.Point.point_type == point_type)
-    if category:
-        query = query.filter(models.Point.category == category)
-    return query.order_by(models.Point.created_at.desc()).limit(limit).all()
+def get_points(db: Session, point_type: str = None, category: str = None, limit: int = 100,
+               before: str = None, after: str = None, from_date: datetime = None, to_date: datetime = None):
+    return ledger.list_entries(db, "point", point_type, category, limit, before, after, from_date, to_date)
 
 def get_point(db: Session, point_id: int):
-    return db.query(models.Point).filter(models.Point.id == point_id).first()
+    return ledger.get_entry(db, "point", point_id, include_archive=True)
 
+# 取引の書き込みは core.ledger_writer の単一ライターから呼ばれ、コミットもライターがまとめて行う
 def create_point(db: Session, point: schemas.PointCreate):
-    # 現在の残高を計算
-    current_balance = get_current_balance(db)
-    new_balance = current_balance + point.amount if point.point_type == "earned" else current_balance - point.amount
-    
-    db_point = models.Point(**point.model_dump(), balance_after=new_balance)
-    db.add(db_point)
-    db.commit()
-    db.refresh(db_point)
-    return db_point
+    return ledger.add_entry(db, "point", **point.model_dump())
 
 def update_point(db: Session, point_id: int, point: schemas.PointUpdate):
-    db_point = db.query(models.Point).filter(models.Point.id == point_id).first()
-    if db_point:
-        update_data = point.model_dump(exclude_unset=True)
-        for field, value in update_data.items():
-            setattr(db_point, field, value)
-        db.commit()
-        db.refresh(db_point)
-    return db_point
+    return ledger.update_entry(db, "point", point_id, point.model_dump(exclude_unset=True))
 
 def delete_point(db: Session, point_id: int):
-    db_point = db.query(models.Point).filter(models.Point.id == point_id).first()
-    if db_point:
-        db.delete(db_point)
-        db.commit()
-        return True
-    return False
+    return ledger.delete_entry(db, "point", point_id)
 
 def get_current_balance(db: Session):
     """現在のポイント残高を取得"""
-    latest_point = db.query(models.Point).order_by(models.Point.created_at.desc()).first()
-    return latest_point.balance_after if latest_point else 0
+    return ledger.get_balance(db, "point")
 
 def get_point_goals(db: Session, completed: bool = None):
     query = db.query(models.PointGoal)
@@ -63,19 +40,21 @@ def create_point_goal(db: Session, goal: schemas.PointGoalCreate):
     db_goal = models.PointGoal(**goal.model_dump())
     db.add(db_goal)
     db.commit()
-    db.refresh(db_goal)
     return db_goal
 
 def update_point_goal(db: Session, goal_id: int, goal: schemas.PointGoalUpdate):
     db_goal = db.query(models.PointGoal).filter(models.PointGoal.id == goal_id).first()
     if db_goal:
         update_data = goal.model_dump(exclude_unset=True)
-        for field, value in update_data.items():
-            setattr(db_goal, field, value)
         
-        # 目標達成時の処理
+        # 目標達成時の処理（手動で完了にした場合と、目標額に届いた場合）
         if update_data.get('completed') and not db_goal.completed:
-            db_goal.completed_at = datetime.now()
+            update_data['completed_at'] = datetime.now()
+        
+        for field, value in update_data.items():
+            setattr(db_goal, field, value)
+        db.flush()
+        ledger.complete_reached_goals(db, "point")
         
         db.commit()
         db.refresh(db_goal)
@@ -102,7 +81,6 @@ def create_point_reward(db: Session, reward: schemas.PointRewardCreate):
     db_reward = models.PointReward(**reward.model_dump())
     db.add(db_reward)
     db.commit()
-    db.refresh(db_reward)
     return db_reward
 
 def update_point_reward(db: Session, reward_id: int, reward: schemas.PointRewardUpdate):
@@ -123,75 +101,47 @@ def delete_point_reward(db: Session, reward_id: int):
         return True
     return False
 
+# 報酬を使用できなかった理由
+REWARD_NOT_FOUND = "not_found"
+REWARD_UNAVAILABLE = "unavailable"
+REWARD_INSUFFICIENT_FUNDS = "insufficient_funds"
+
 def use_point_reward(db: Session, reward_id: int):
-    """報酬を使用"""
-    db_reward = db.query(models.PointReward).filter(models.PointReward.id == reward_id).first()
-    if not db_reward or not db_reward.is_available:
-        return None
-    
-    current_balance = get_current_balance(db)
-    if current_balance < db_reward.cost:
-        return None
+    """報酬を使用し、(ポイント取引, 失敗理由) を返す
+
+    「利用可能なら無効化する」1文の条件付きUPDATEで確保し、同時使用でも二重に使えない。
+    """
+    reward = models.PointReward
+    reserved = db.execute(
+        update(reward)
+        .where(reward.id == reward_id, reward.is_available == True)
+        .values(used_count=reward.used_count + 1, is_available=False)  # 一度使用したら無効化
+        .returning(reward.title, reward.cost)
+        .execution_options(synchronize_session=False)
+    ).first()
+    if reserved is None:
+        exists = db.execute(select(reward.id).where(reward.id == reward_id)).first()
+        return None, REWARD_UNAVAILABLE if exists else REWARD_NOT_FOUND
     
-    # ポイントを消費
-    point_data = {
-        "amount": db_reward.cost,
-        "point_type": "spent",
+    # ポイントを消費（残高不足なら報酬を元に戻す）
+    entries = ledger.post(db, [{
+        "currency": "point",
+        "amount": reserved.cost,
+        "type": "spent",
         "category": "entertainment",
-        "description": f"報酬使用: {db_reward.title}",
-        "balance_after": current_balance - db_reward.cost
-    }
-    
-    db_point = models.Point(**point_data)
-    db.add(db_point)
+        "description": f"報酬使用: {reserved.title}"
+    }])
+    if entries is None:
+        db.execute(
+            update(reward)
+            .where(reward.id == reward_id)
+            .values(used_count=reward.used_count - 1, is_available=True)
+            .execution_options(synchronize_session=False)
+        )
+        return None, REWARD_INSUFFICIENT_FUNDS
     
-    # 報酬の使用回数を更新
-    db_reward.used_count += 1
-    db_reward.is_available = False  # 一度使用したら無効化
-    
-    db.commit()
-    db.refresh(db_point)
-    return db_point
+    return entries[0], None
 
 def get_point_statistics(db: Session, days: int = 30):
-    """ポイント統計を取得"""
-    start_date = datetime.now() - timedelta(days=days)
-    
-    # 期間中のポイント取引
-    points = db.query(models.Point).filter(
-        models.Point.created_at >= start_date
-    ).all()
-    
-    total_earned = sum(p.amount for p in points if p.point_type == "earned")
-    total_spent = sum(p.amount for p in points if p.point_type == "spent")
-    current_balance = get_current_balance(db)
-    
-    # 月間統計
-    month_start = datetime.now().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-    monthly_points = db.query(models.Point).filter(
-        models.Point.created_at >= month_start
-    ).all()
-    
-    monthly_earned = sum(p.amount for p in monthly_points if p.point_type == "earned")
-    monthly_spent = sum(p.amount for p in monthly_points if p.point_type == "spent")
-    
-    # カテゴリ別統計
-    category_stats = {}
-    for point in points:
-        if point.point_type == "earned":
-            category_stats[point.category] = category_stats.get(point.category, 0) + point.amount
-    
-    top_categories = [
-        {"category": cat, "amount": amount}
-        for cat, amount in sorted(category_stats.items(), key=lambda x: x[1], reverse=True)[:5]
-    ]
-    
-    return {
-        "total_earned": total_earned,
-        "total_spent": total_spent,
-        "current_balance": current_balance,
-        "total_transactions": len(points),
-        "monthly_earned": monthly_earned,
-        "monthly_spent": monthly_spent,
-        "top_categories": top_categories
-    }
+    """ポイント統計を取得（日次集計から計算）"""
+    return ledger.get_statistics(db, "point", days)
@@ -33,7 +33,6 @@ def create_schedule(db: Session, schedule: schemas.ScheduleCreate):
     db_schedule = models.Schedule(**schedule.model_dump())
     db.add(db_schedule)
     db.commit()
-    db.refresh(db_schedule)
     return db_schedule
 
 def update_schedule(db: Session, schedule_id: int, schedule_update: schemas.ScheduleUpdate):
@@ -50,6 +49,16 @@ def update_schedule(db: Session, schedule_id: int, schedule_update: schemas.Sche
     db.refresh(db_schedule)
     return db_schedule
 
+def set_schedule_completed(db: Session, schedule_id: int, completed: bool):
+    """スケジュールの完了状態を変更"""
+    db_schedule = db.query(models.Schedule).filter(models.Schedule.id == schedule_id).first()
+    if not db_schedule:
+        return None
+    db_schedule.completed = completed
+    db_schedule.updated_at = datetime.now()
+    db.commit()
+    return db_schedule
+
 def delete_schedule(db: Session, schedule_id: int):
     db_schedule = db.query(models.Schedule).filter(models.Schedule.id == schedule_id).first()
     if db_schedule:
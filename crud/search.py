@@ -0,0 +1,93 @@
+from sqlalchemy import String, bindparam, cast, literal, or_, select, text, union_all
+from sqlalchemy.orm import Session
+from models import tasks as task_models
+from models import study as study_models
+from models import schedules as schedule_models
+from models import meals as meal_models
+
+# 全文検索。SQLiteではマイグレーション 0007 の search_index（FTS5, trigram）をトリガーで同期している。
+
+# 検索対象（種類 → モデル, タイトル, 説明, その他の検索対象）。マイグレーション 0007 の SOURCES と同じ対応
+SOURCES = {
+    "task": (task_models.Task, "title", "description", ["category"]),
+    "study": (study_models.Study, "title", "description", ["subject"]),
+    "schedule": (schedule_models.Schedule, "title", "description", ["location", "category"]),
+    "meal": (meal_models.Meal, "name", "description", ["category"]),
+}
+# trigram で索引を引ける最短の語の長さ。これより短い語はLIKEで絞り込む
+TRIGRAM_LENGTH = 3
+# スニペットの前後に付ける印と、スニペットの語数
+SNIPPET_OPEN = "<mark>"
+SNIPPET_CLOSE = "</mark>"
+SNIPPET_TOKENS = 16
+# bm25 の列ごとの重み（タイトル, 説明, その他）
+BM25_WEIGHTS = (10.0, 2.0, 1.0)
+
+def search_terms(q: str) -> list:
+    """空白で区切った検索語（重複は除く）"""
+    return list(dict.fromkeys(q.split()))
+
+def match_expression(terms: list) -> str:
+    """FTS5のMATCH式（各語をフレーズとして引用し、ANDで結ぶ）"""
+    return " ".join('"' + term.replace('"', '""') + '"' for term in terms)
+
+def like_pattern(term: str) -> str:
+    return "%" + term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+
+def search(db: Session, q: str, types: list = None, limit: int = 20, offset: int = 0):
+    """タスク・学習・予定・食事を横断して検索し、関連度順（SQLite以外は新しい順）で返す
+
+    各行は (type, id, title, snippet, rank)。rank は小さいほど関連度が高い。
+    """
+    terms = search_terms(q)
+    types = [kind for kind in SOURCES if types is None or kind in types]
+    if not terms or not types:
+        return []
+    if db.get_bind().dialect.name == "sqlite":
+        return search_index(db, terms, types, limit, offset)
+    return search_tables(db, terms, types, limit, offset)
+
+def search_index(db: Session, terms: list, types: list, limit: int, offset: int):
+    """search_index（FTS5）から検索。3文字以上の語はMATCHで索引を引き、短い語はLIKEで絞り込む"""
+    long_terms = [term for term in terms if len(term) >= TRIGRAM_LENGTH]
+    short_terms = [term for term in terms if len(term) < TRIGRAM_LENGTH]
+    params = {"types": types, "limit": limit, "offset": offset}
+    conditions = ["type IN :types"]
+    if long_terms:
+        # bm25 の重みは索引の全列に順に対応するので、先頭の type, item_id（UNINDEXED）の分は 0 を渡す
+        weights = ", ".join(str(weight) for weight in (0.0, 0.0) + BM25_WEIGHTS)
+        columns = (f"snippet(search_index, -1, '{SNIPPET_OPEN}', '{SNIPPET_CLOSE}', '…', {SNIPPET_TOKENS}) AS snippet, "
+                   f"bm25(search_index, {weights}) AS rank")
+        conditions.append("search_index MATCH :match")
+        params["match"] = match_expression(long_terms)
+        order = "rank, rowid DESC"
+    else:
+        # 索引を引ける語がないので全件をLIKEで見る（短い語だけの検索）
+        columns = "title AS snippet, 0.0 AS rank"
+        order = "rowid DESC"
+    for i, term in enumerate(short_terms):
+        conditions.append(f"(coalesce(title, '') || ' ' || coalesce(description, '') || ' ' || extra) "
+                          f"LIKE :term{i} ESCAPE '\\'")
+        params[f"term{i}"] = like_pattern(term)
+    statement = text(
+        f"SELECT type, item_id AS id, title, {columns} FROM search_index "
+        f"WHERE {' AND '.join(conditions)} ORDER BY {order} LIMIT :limit OFFSET :offset"
+    ).bindparams(bindparam("types", expanding=True))
+    return db.execute(statement, params).all()
+
+def search_tables(db: Session, terms: list, types: list, limit: int, offset: int):
+    """索引のないデータベース向け。各テーブルを大文字小文字を無視した部分一致で検索する"""
+    queries = []
+    for kind in types:
+        model, title, description, extra = SOURCES[kind]
+        columns = [getattr(model, name) for name in [title, description] + extra]
+        queries.append(
+            select(literal(kind).label("type"), model.id.label("id"), columns[0].label("title"),
+                   columns[0].label("snippet"), literal(0.0).label("rank"))
+            .where(*[or_(*[cast(column, String).ilike(like_pattern(term), escape="\\") for column in columns])
+                     for term in terms])
+        )
+    query = union_all(*queries).subquery()
+    return db.execute(
+        select(query).order_by(query.c.type, query.c.id.desc()).limit(limit).offset(offset)
+    ).all()
@@ -1,5 +1,5 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, func, desc
+from sqlalchemy import and_, or_, func, desc, case
 from models import study as models
 from schemas import study as schemas
 from datetime import datetime, timedelta
@@ -24,7 +24,6 @@ def create_study(db: Session, study: schemas.StudyCreate):
     db_study = models.Study(**study.model_dump())
     db.add(db_study)
     db.commit()
-    db.refresh(db_study)
     return db_study
 
 def update_study(db: Session, study_id: int, study_update: schemas.StudyUpdate):
@@ -154,22 +153,23 @@ def get_study_history(db: Session, days: int = 30):
     ).order_by(desc(models.Study.completed_at)).all()
 
 def get_study_statistics(db: Session):
-    """勉強統計を取得"""
-    total_studies = db.query(models.Study).count()
-    completed_studies = db.query(models.Study).filter(models.Study.completed == True).count()
-    total_hours = db.query(func.sum(models.Study.completed_hours)).scalar() or 0
-    
+    """勉強統計を取得（科目ごとの集計を1クエリで取る）"""
+    rows = db.query(
+        models.Study.subject,
+        func.count(models.Study.id),
+        func.sum(case((models.Study.completed == True, 1), else_=0)),
+        func.sum(models.Study.completed_hours),
+    ).group_by(models.Study.subject).all()
+    by_subject = {subject: (count, completed or 0, hours or 0) for subject, count, completed, hours in rows}
+
+    total_studies = sum(count for count, _, _ in by_subject.values())
+    completed_studies = sum(completed for _, completed, _ in by_subject.values())
+    total_hours = sum(hours for _, _, hours in by_subject.values())
+
     # 科目別統計
     subject_stats = {}
     for subject in models.StudySubject:
-        count = db.query(models.Study).filter(models.Study.subject == subject).count()
-        completed = db.query(models.Study).filter(
-            and_(models.Study.subject == subject, models.Study.completed == True)
-        ).count()
-        hours = db.query(func.sum(models.Study.completed_hours)).filter(
-            models.Study.subject == subject
-        ).scalar() or 0
-        
+        count, completed, hours = by_subject.get(subject, (0, 0, 0))
         subject_stats[subject.value] = {
             "total": count,
             "completed": completed,
@@ -195,7 +195,6 @@ def create_timetable_entry(db: Session, timetable: schemas.TimetableCreate):
     db_timetable = models.Timetable(**timetable.model_dump())
     db.add(db_timetable)
     db.commit()
-    db.refresh(db_timetable)
     return db_timetable
 
 def update_timetable_entry(db: Session, timetable_id: int, timetable_update: schemas.TimetableUpdate):
@@ -1,10 +1,18 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, func
+from sqlalchemy import and_, or_, func, delete, insert, select, update
 from models import tasks as models
 from schemas import tasks as schemas
 from datetime import datetime, timedelta
+from types import SimpleNamespace
 from typing import List
 
+# リマインダー時刻: 就寝時刻（23:00を仮定）の10時間前か、期限の30分前の早い方
+SLEEP_HOUR = 23
+REMIND_HOURS_BEFORE_SLEEP = 10
+REMIND_MINUTES_BEFORE_DEADLINE = 30
+# 一括操作の作成で1文のINSERTに入れる行数（SQLiteのバインド変数の上限に収める）
+BATCH_INSERT_ROWS = 500
+
 def get_tasks(db: Session, task_type: str = None, category: str = None, completed: bool = None):
     query = db.query(models.Task)
     
@@ -45,29 +53,98 @@ def get_daily_tasks(db: Session):
     """毎日タスクを取得"""
     return db.query(models.Task).filter(models.Task.type == models.TaskType.DAILY).all()
 
+def reminder_time_for(deadline: datetime) -> datetime:
+    """期限日の就寝時刻の REMIND_HOURS_BEFORE_SLEEP 時間前か、期限の REMIND_MINUTES_BEFORE_DEADLINE 分前の早い方"""
+    sleep_time = deadline.replace(hour=SLEEP_HOUR, minute=0, second=0, microsecond=0)
+    return min(sleep_time - timedelta(hours=REMIND_HOURS_BEFORE_SLEEP),
+               deadline - timedelta(minutes=REMIND_MINUTES_BEFORE_DEADLINE))
+
+def needs_reminder(task: models.Task) -> bool:
+    return task.deadline is not None and not task.completed
+
+def sync_reminder(db: Session, task: models.Task, existing: bool = True):
+    """タスクの期限・完了状態に合わせてリマインダーを作り直す（existing=False なら削除を省く）"""
+    if existing:
+        db.execute(delete(models.TaskReminder).where(models.TaskReminder.task_id == task.id))
+    if needs_reminder(task):
+        db.execute(insert(models.TaskReminder).values(task_id=task.id, reminder_time=reminder_time_for(task.deadline)))
+
+def rebuild_reminders(db: Session) -> int:
+    """全タスクからリマインダーを作り直し、件数を返す（一括投入の後に呼ぶ。コミットは呼び出し元）"""
+    db.execute(delete(models.TaskReminder))
+    rows = db.execute(
+        select(models.Task.id, models.Task.deadline).where(
+            models.Task.deadline.isnot(None), models.Task.completed == False
+        )
+    ).all()
+    if rows:
+        db.execute(insert(models.TaskReminder),
+                   [{"task_id": task_id, "reminder_time": reminder_time_for(deadline)} for task_id, deadline in rows])
+    return len(rows)
+
+def get_upcoming_reminders(db: Session, start: datetime, end: datetime):
+    """リマインダー時刻が start〜end のタスク（リマインダー時刻順）"""
+    return db.execute(
+        select(models.Task.id, models.Task.title, models.Task.deadline, models.TaskReminder.reminder_time)
+        .join(models.Task, models.Task.id == models.TaskReminder.task_id)
+        .where(models.TaskReminder.reminder_time >= start, models.TaskReminder.reminder_time <= end)
+        .order_by(models.TaskReminder.reminder_time)
+    ).all()
+
+def get_reminder_tasks(db: Session, task_ids: list):
+    """指定タスクのうちリマインダーのあるもの（送信直前の確認用）"""
+    return db.execute(
+        select(models.Task.id, models.Task.title, models.Task.deadline, models.TaskReminder.reminder_time)
+        .join(models.Task, models.Task.id == models.TaskReminder.task_id)
+        .where(models.TaskReminder.task_id.in_(task_ids))
+    ).all()
+
+def get_open_deadlines(db: Session, start: datetime, end: datetime):
+    """期限が start〜end の未完了タスク（期限順）"""
+    return db.query(models.Task).filter(
+        and_(
+            models.Task.deadline.isnot(None),
+            models.Task.deadline >= start,
+            models.Task.deadline <= end,
+            models.Task.completed == False
+        )
+    ).order_by(models.Task.deadline.asc()).all()
+
+def get_open_tasks(db: Session, task_ids: list):
+    """指定タスクのうち未完了のもの"""
+    return db.query(models.Task).filter(
+        models.Task.id.in_(task_ids), models.Task.completed == False
+    ).all()
+
 def create_task(db: Session, task: schemas.TaskCreate):
     db_task = models.Task(**task.model_dump())
     db.add(db_task)
+    db.flush()
+    sync_reminder(db, db_task, existing=False)
     db.commit()
-    db.refresh(db_task)
     return db_task
 
+def with_completed_at(update_data: dict, was_completed: bool, now: datetime = None) -> dict:
+    """完了状態が変更された場合、completed_atを更新（未完了→完了で現在時刻、未完了にしたらNone）"""
+    if 'completed' in update_data:
+        if update_data['completed'] and not was_completed:
+            update_data['completed_at'] = now or datetime.now()
+        elif not update_data['completed']:
+            update_data['completed_at'] = None
+    return update_data
+
 def update_task(db: Session, task_id: int, task_update: schemas.TaskUpdate):
     db_task = db.query(models.Task).filter(models.Task.id == task_id).first()
     if not db_task:
         return None
     
-    update_data = task_update.model_dump(exclude_unset=True)
-    
-    # 完了状態が変更された場合、completed_atを更新
-    if 'completed' in update_data:
-        if update_data['completed'] and not db_task.completed:
-            update_data['completed_at'] = datetime.now()
-        elif not update_data['completed']:
-            update_data['completed_at'] = None
+    update_data = with_completed_at(task_update.model_dump(exclude_unset=True), db_task.completed)
     
     for key, value in update_data.items():
         setattr(db_task, key, value)
+    # 期限・完了状態が変わったときだけリマインダーを更新
+    if 'deadline' in update_data or 'completed' in update_data:
+        sync_reminder(db, db_task)
     
     db.commit()
     db.refresh(db_task)
@@ -76,11 +153,94 @@ def update_task(db: Session, task_id: int, task_update: schemas.TaskUpdate):
 def delete_task(db: Session, task_id: int):
     db_task = db.query(models.Task).filter(models.Task.id == task_id).first()
     if db_task:
+        db.execute(delete(models.TaskReminder).where(models.TaskReminder.task_id == task_id))
         db.delete(db_task)
         db.commit()
         return True
     return False
 
+def batch_tasks(db: Session, operations: List[schemas.TaskBatchOperation]) -> list:
+    """作成・更新・完了・取り消し・削除をまとめて1トランザクションで実行し、操作ごとの結果を返す
+
+    対象のタスクは1回のSELECTで読み、操作はメモリ上で順に当ててから、作成・更新・削除をそれぞれ一括で書く。
+    存在しないタスクや不正な指定はその操作だけを失敗（404 / 422）にし、他の操作は実行する。
+    """
+    now = datetime.now()
+    Op = schemas.TaskBatchOp
+    ids = {operation.id for operation in operations if operation.op != Op.CREATE and operation.id is not None}
+    current = {}
+    if ids:
+        table = models.Task.__table__
+        current = {row.id: dict(row._mapping) for row in db.execute(select(table).where(table.c.id.in_(ids)))}
+
+    results = []
+    creates = []  # (結果, 行)
+    changes = {}  # タスクID → 変更したカラム
+    deleted = set()
+    for index, operation in enumerate(operations):
+        result = {"index": index, "op": operation.op, "status": 200, "id": operation.id}
+        results.append(result)
+        if operation.op == Op.CREATE:
+            if operation.task is None:
+                result.update(status=422, detail="task is required for create")
+            else:
+                creates.append((result, operation.task.model_dump()))
+            continue
+        if operation.id is None:
+            result.update(status=422, detail=f"id is required for {operation.op.value}")
+            continue
+        if operation.id not in current or operation.id in deleted:
+            result.update(status=404, detail="Task not found")
+            continue
+        if operation.op == Op.DELETE:
+            deleted.add(operation.id)
+            changes.pop(operation.id, None)
+            continue
+        if operation.op == Op.UPDATE:
+            if operation.changes is None:
+                result.update(status=422, detail="changes is required for update")
+                continue
+            update_data = operation.changes.model_dump(exclude_unset=True)
+        else:
+            update_data = {"completed": operation.op == Op.COMPLETE}
+        task = current[operation.id]
+        update_data = with_completed_at(update_data, task["completed"], now)
+        update_data["updated_at"] = now
+        task.update(update_data)
+        changes.setdefault(operation.id, {}).update(update_data)
+        result["task"] = SimpleNamespace(**task)
+
+    if deleted:
+        db.execute(delete(models.TaskReminder).where(models.TaskReminder.task_id.in_(deleted)))
+        db.execute(delete(models.Task).where(models.Task.id.in_(deleted)))
+    if changes:
+        # 更新する列の組が変わるたびに別のUPDATE文になるので、列の組ごとにまとめて渡す
+        rows = sorted(({"id": task_id, **changed} for task_id, changed in changes.items()), key=lambda row: sorted(row))
+        db.execute(update(models.Task), rows)
+    # リマインダーは期限・完了状態が変わったタスクと新しいタスクの分だけ作り直す
+    rescheduled = [task_id for task_id, changed in changes.items() if "deadline" in changed or "completed" in changed]
+    if rescheduled:
+        db.execute(delete(models.TaskReminder).where(models.TaskReminder.task_id.in_(rescheduled)))
+    reminder_sources = [SimpleNamespace(**current[task_id]) for task_id in rescheduled]
+    if creates:
+        table = models.Task.__table__
+        created = []
+        for start in range(0, len(creates), BATCH_INSERT_ROWS):
+            # 複数行のVALUESを1文で入れる。IDは行の順に採番されるが、RETURNINGの順序は保証されないのでIDで並べ直す
+            rows = db.execute(
+                insert(table).values([row for _, row in creates[start:start + BATCH_INSERT_ROWS]]).returning(*table.c)
+            ).all()
+            created += [SimpleNamespace(**row._mapping) for row in sorted(rows, key=lambda row: row.id)]
+        for (result, _), task in zip(creates, created):
+            result.update(id=task.id, task=task)
+        reminder_sources.extend(created)
+    reminders = [{"task_id": task.id, "reminder_time": reminder_time_for(task.deadline)}
+                 for task in reminder_sources if needs_reminder(task)]
+    if reminders:
+        db.execute(insert(models.TaskReminder), reminders)
+    db.commit()
+    return results
+
 def get_task_history(db: Session, limit: int = 50):
     """完了したタスクの履歴を取得"""
     return db.query(models.Task).filter(
@@ -1,17 +1,26 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from routers import tasks, reminders, schedules, study, meals, points, coins
-from core.database import Base, engine
+from routers import tasks, reminders, schedules, study, meals, points, coins, search, debug
+from core.database import async_read_engine
+from core.instrumentation import QueryCountMiddleware
+from core.reminder_scheduler import reminder_scheduler
+from core.migrations import upgrade_database
 from models import tasks as models
-from init_data import init_data
 
-# データベーステーブルの作成
-Base.metadata.create_all(bind=engine)
+# データベースのスキーマを最新のマイグレーションまで上げる（データには触れない。サンプルデータは manage.py seed で投入）
+upgrade_database()
 
-# 初期データの挿入
-init_data()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # リマインダーの配信（/reminders/stream）の発火を待つタスク
+    await reminder_scheduler.start()
+    yield
+    await reminder_scheduler.stop()
+    # aiosqliteの接続（と接続ごとのスレッド）を閉じる
+    await async_read_engine.dispose()
 
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 
 # CORS設定を追加
 import os
@@ -36,8 +45,12 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-Prev-Cursor", "X-Next-Offset", "X-Query-Count", "X-Query-Time"],
 )
 
+# リクエストごとのクエリ数・時間をレスポンスヘッダに付ける
+app.add_middleware(QueryCountMiddleware)
+
 app.include_router(tasks.router)
 app.include_router(reminders.router)
 app.include_router(schedules.router)
@@ -45,3 +58,8 @@ app.include_router(study.router)
 app.include_router(meals.router)
 app.include_router(points.router)
 app.include_router(coins.router)
+app.include_router(search.router)
+
+# ルートごとのクエリ数の累計（/debug/queries）と遅いクエリの記録（/debug/slow-queries）は開発時だけ公開する
+if os.getenv("DEBUG_ENDPOINTS", "false").lower() in ("1", "true", "yes"):
+    app.include_router(debug.router)
@@ -0,0 +1,223 @@
+"""管理コマンド
+
+    python manage.py rebuild-rollups [--currency coin|point]
+    python manage.py import coin|point FILE [--format ndjson|csv] [--batch-size N] [--skip-lines N]
+    python manage.py verify-ledger [--currency coin|point] [--repair]
+    python manage.py recompute-goals [--currency coin|point]
+    python manage.py archive [--days N]
+    python manage.py migrate [REVISION]
+    python manage.py explain [--verbose]
+    python manage.py seed [FILE ...] [--reset]
+    python manage.py generate [--scale X] [--seed N] [--anchor YYYY-MM-DD] [--reset]
+    python manage.py reset-daily
+"""
+import argparse
+import sys
+import time
+from datetime import datetime
+from core.database import SessionLocal
+from core.migrations import upgrade_database
+from core.query_plans import check_query_plans
+from core.ledger_writer import writer
+from crud import ledger, archive, fixtures, generate, jobs
+from crud.ledger_import import LedgerImportError, import_lines
+
+def rebuild_rollups(args):
+    """取引履歴から日次集計を作り直す"""
+    db = SessionLocal()
+    try:
+        ledger.rebuild_rollups(db, args.currency)
+        print("日次集計を再構築しました")
+    finally:
+        db.close()
+
+def import_ledger(args):
+    """NDJSON/CSVファイルから取引を取り込む"""
+    fmt = args.format or ("csv" if args.file.endswith(".csv") else "ndjson")
+    with open(args.file, encoding="utf-8-sig") as f:
+        try:
+            stats = import_lines(f, args.currency, fmt, writer, args.batch_size, args.skip_lines)
+        except LedgerImportError as e:
+            # エラーの前のバッチはコミット済み。続きは --skip-lines で取り込む
+            print(f"取り込みを中断しました: {e}", file=sys.stderr)
+            print(f"{e.imported}件（{e.committed_line}行目まで）を取り込み済みです。"
+                  f"修正後に --skip-lines {e.committed_line} を付けて再実行してください", file=sys.stderr)
+            sys.exit(1)
+    print(f"{stats['imported']}件を取り込みました ({stats['rows_per_second']}件/秒, 残高 {stats['balance']})")
+
+def verify_ledger(args):
+    """残高チェーンを検証し、必要なら不整合箇所から修復する"""
+    currencies = [args.currency] if args.currency else list(ledger.LEDGERS)
+    failed = False
+    for currency in currencies:
+        db = SessionLocal()
+        try:
+            result = ledger.verify_chain(db, currency)
+            print(f"{currency}: {result['rows']}件 残高 {result['balance']} (記録上 {result['account_balance']}) {'OK' if result['ok'] else 'NG'}")
+            mismatch = result["first_mismatch"]
+            if result["ok"]:
+                continue
+            if mismatch:
+                print(f"  最初の不整合: id={mismatch['id']} 期待値 {mismatch['expected']} 実際 {mismatch['actual']}")
+            if args.repair:
+                # 書き込み用の接続は1本なので、修復をライターに渡す前に手放す
+                db.close()
+                position = (mismatch["created_at"], mismatch["id"]) if mismatch else (datetime.max, 0)
+                balance = writer.run(ledger.repair_chain, currency, *position)
+                print(f"  修復しました（残高 {balance}）")
+            else:
+                failed = True
+        finally:
+            db.close()
+    if failed:
+        sys.exit(1)
+
+def recompute_goals(args):
+    """目標の進捗を取引履歴から計算し直す"""
+    db = SessionLocal()
+    try:
+        ledger.recompute_goals(db, args.currency)
+        print("目標の進捗を再計算しました")
+    finally:
+        db.close()
+
+def archive_rows(args):
+    """古い取引・履歴をアーカイブテーブルへ移す"""
+    cutoff = archive.archive_cutoff(args.days)
+    for table_name in archive.ARCHIVES:
+        moved = writer.run(archive.archive_table, table_name, cutoff)
+        print(f"{table_name}: {moved}件をアーカイブしました ({cutoff:%Y-%m-%d %H:%M} より前)")
+
+def migrate(args):
+    """スキーマを指定のリビジョンまで更新する"""
+    upgrade_database(args.revision)
+    print(f"スキーマを {args.revision} まで更新しました")
+
+def explain(args):
+    """主要なクエリの実行計画を調べ、インデックスを使わない全件走査があれば失敗する"""
+    db = SessionLocal()
+    try:
+        results = check_query_plans(db)
+    finally:
+        db.close()
+    failed = [result for result in results if result["full_scans"]]
+    for result in results:
+        if args.verbose or result["full_scans"]:
+            status = "SCAN " + ", ".join(result["full_scans"]) if result["full_scans"] else "OK"
+            print(f"{result['probe']}: {status}")
+            print("  " + " ".join(result["statement"].split()))
+            for line in result["plan"]:
+                print(f"    {line}")
+    print(f"{len(results)}件のクエリを確認しました（全件走査 {len(failed)}件）")
+    if failed:
+        sys.exit(1)
+
+def seed(args):
+    """フィクスチャを投入する（投入済みのバージョンは飛ばす）"""
+    db = SessionLocal()
+    try:
+        if args.reset:
+            fixtures.clear_data(db)
+            print("既存のデータを削除しました")
+        for path in args.files or fixtures.fixture_files():
+            fixture = fixtures.read_fixture(path)
+            label = f"{fixture['name']} v{fixture['version']}"
+            rows = fixtures.load_fixture(db, fixture)
+            if rows is None:
+                print(f"{label}: 投入済みのため飛ばしました")
+            else:
+                print(f"{label}: {rows}件を投入しました")
+    finally:
+        db.close()
+
+def generate_data(args):
+    """負荷試験用の合成データを空のDBに書き込む"""
+    db = SessionLocal()
+    try:
+        if args.reset:
+            fixtures.clear_data(db)
+        elif not generate.is_empty(db):
+            print("DBにデータがあります（--reset で削除してから生成します）")
+            sys.exit(1)
+        anchor = datetime.fromisoformat(args.anchor) if args.anchor else None
+        started = time.perf_counter()
+        written = generate.generate(
+            db, args.scale, args.seed, anchor, args.chunk_size,
+            progress=lambda table, rows, seconds: print(f"{table}: {rows}件 ({seconds:.1f}秒)")
+        )
+        print(f"合計 {sum(written.values())}件 ({time.perf_counter() - started:.1f}秒)")
+    finally:
+        db.close()
+
+def reset_daily(args):
+    """直近のリセット時刻の回がまだなら毎日タスクをリセットする（サーバーは DAILY_RESET_TIME に自動で実行する）"""
+    db = SessionLocal()
+    try:
+        run, executed = jobs.reset_daily_tasks(db)
+        if executed:
+            print(f"{run.run_key}: 毎日タスクを{run.rows}件リセットしました ({run.duration_ms:.1f} ms)")
+        else:
+            print(f"{run.run_key}: 実行済みです（{run.finished_at}、{run.rows}件）")
+    finally:
+        db.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="manager_backend 管理コマンド")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    parser_rollups = subparsers.add_parser("rebuild-rollups", help="日次集計を取引履歴から作り直す")
+    parser_rollups.add_argument("--currency", choices=list(ledger.LEDGERS), default=None)
+    parser_rollups.set_defaults(func=rebuild_rollups)
+
+    parser_import = subparsers.add_parser("import", help="NDJSON/CSVから取引を一括取り込み")
+    parser_import.add_argument("currency", choices=list(ledger.LEDGERS))
+    parser_import.add_argument("file")
+    parser_import.add_argument("--format", choices=["ndjson", "csv"], default=None)
+    parser_import.add_argument("--batch-size", type=int, default=5000)
+    parser_import.add_argument("--skip-lines", type=int, default=0, help="この行までは取り込み済みとして読み飛ばす")
+    parser_import.set_defaults(func=import_ledger)
+
+    parser_verify = subparsers.add_parser("verify-ledger", help="残高チェーンを検証（チェックポイントも作り直す）")
+    parser_verify.add_argument("--currency", choices=list(ledger.LEDGERS), default=None)
+    parser_verify.add_argument("--repair", action="store_true", help="不整合があれば修復する")
+    parser_verify.set_defaults(func=verify_ledger)
+
+    parser_goals = subparsers.add_parser("recompute-goals", help="目標の進捗を取引履歴から計算し直す")
+    parser_goals.add_argument("--currency", choices=list(ledger.LEDGERS), default=None)
+    parser_goals.set_defaults(func=recompute_goals)
+
+    parser_archive = subparsers.add_parser("archive", help="古い取引・履歴をアーカイブテーブルへ移す")
+    parser_archive.add_argument("--days", type=int, default=archive.ARCHIVE_HORIZON_DAYS, help="この日数より古い行を移す")
+    parser_archive.set_defaults(func=archive_rows)
+
+    parser_migrate = subparsers.add_parser("migrate", help="スキーマをマイグレーションで更新する")
+    parser_migrate.add_argument("revision", nargs="?", default="head")
+    parser_migrate.set_defaults(func=migrate)
+
+    parser_explain = subparsers.add_parser("explain", help="主要なクエリが全件走査していないか実行計画で確認する")
+    parser_explain.add_argument("--verbose", action="store_true", help="すべてのクエリの実行計画を表示する")
+    parser_explain.set_defaults(func=explain)
+
+    parser_seed = subparsers.add_parser("seed", help="サンプルデータ（fixtures/*.json）を投入する")
+    parser_seed.add_argument("files", nargs="*", help="投入するフィクスチャ（省略時は fixtures/ の全ファイル）")
+    parser_seed.add_argument("--reset", action="store_true", help="投入前に全テーブルのデータを削除する")
+    parser_seed.set_defaults(func=seed)
+
+    parser_generate = subparsers.add_parser("generate", help="負荷試験用の合成データを生成する")
+    parser_generate.add_argument("--scale", type=float, default=1.0, help="行数の倍率（1で約50万行）")
+    parser_generate.add_argument("--seed", type=int, default=0)
+    parser_generate.add_argument("--anchor", default=None, help="「現在」とみなす日時（省略時は今日の0時）")
+    parser_generate.add_argument("--chunk-size", type=int, default=generate.CHUNK_SIZE)
+    parser_generate.add_argument("--reset", action="store_true", help="生成前に全テーブルのデータを削除する")
+    parser_generate.set_defaults(func=generate_data)
+
+    parser_reset = subparsers.add_parser("reset-daily", help="毎日タスクのリセットを今すぐ実行する（実行済みの回なら何もしない）")
+    parser_reset.set_defaults(func=reset_daily)
+
+    args = parser.parse_args()
+    if args.func is not migrate:
+        upgrade_database()
+    args.func(args)
+
+if __name__ == "__main__":
+    main()
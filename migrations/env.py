@@ -0,0 +1,43 @@
+from logging.config import fileConfig
+from alembic import context
+from core.database import Base, engine
+# 全モデルを読み込んでメタデータに登録する
+from models import tasks, schedules, study, meals, points, coins, ledger, archive, fixtures, jobs  # noqa: F401
+
+config = context.config
+if config.config_file_name is not None and config.attributes.get("configure_logger", True):
+    fileConfig(config.config_file_name, disable_existing_loggers=False)
+
+target_metadata = Base.metadata
+
+def run_migrations_offline():
+    """SQLを出力するだけのモード（alembic upgrade --sql）"""
+    context.configure(
+        url=str(engine.url), target_metadata=target_metadata, literal_binds=True,
+        render_as_batch=engine.dialect.name == "sqlite",
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+def run_migrations_online():
+    """アプリの書き込み用エンジン（または呼び出し元が渡した接続）で実行"""
+    connection = config.attributes.get("connection")
+    if connection is None:
+        with engine.connect() as connection:
+            configure_and_run(connection)
+    else:
+        configure_and_run(connection)
+
+def configure_and_run(connection):
+    # SQLiteはALTERが限られるため、テーブル作り直し方式（batch）で変更する
+    context.configure(
+        connection=connection, target_metadata=target_metadata,
+        render_as_batch=connection.dialect.name == "sqlite",
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
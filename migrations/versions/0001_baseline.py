@@ -0,0 +1,302 @@
+"""ベースライン（create_all で作っていた既存スキーマ。台帳・アーカイブのテーブルは 0002 で追加）
+
+Revision ID: 0001
+Revises: 
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0001'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.create_table('coin_exchanges',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('from_currency', sa.String(), nullable=True),
+    sa.Column('to_currency', sa.String(), nullable=True),
+    sa.Column('from_amount', sa.Integer(), nullable=True),
+    sa.Column('to_amount', sa.Integer(), nullable=True),
+    sa.Column('exchange_rate', sa.Float(), nullable=True),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('coin_exchanges', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_coin_exchanges_id'), ['id'], unique=False)
+
+    op.create_table('coin_goals',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('title', sa.String(), nullable=True),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('target_amount', sa.Integer(), nullable=True),
+    sa.Column('current_amount', sa.Integer(), nullable=True),
+    sa.Column('deadline', sa.DateTime(), nullable=True),
+    sa.Column('completed', sa.Boolean(), nullable=True),
+    sa.Column('completed_at', sa.DateTime(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('coin_goals', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_coin_goals_id'), ['id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_coin_goals_title'), ['title'], unique=False)
+
+    op.create_table('coin_shop',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('title', sa.String(), nullable=True),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('cost', sa.Integer(), nullable=True),
+    sa.Column('is_available', sa.Boolean(), nullable=True),
+    sa.Column('stock', sa.Integer(), nullable=True),
+    sa.Column('used_count', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('coin_shop', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_coin_shop_id'), ['id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_coin_shop_title'), ['title'], unique=False)
+
+    op.create_table('coins',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('amount', sa.Integer(), nullable=True),
+    sa.Column('coin_type', sa.Enum('earned', 'spent', 'bonus', 'penalty', 'exchange', name='cointype'), nullable=True),
+    sa.Column('category', sa.Enum('task_completion', 'study_progress', 'daily_login', 'weekly_goal', 'monthly_goal', 'shopping', 'gaming', 'entertainment', 'other', name='coincategory'), nullable=True),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('balance_after', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('coins', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_coins_id'), ['id'], unique=False)
+
+    op.create_table('meal_history',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('meal_id', sa.Integer(), nullable=True),
+    sa.Column('meal_name', sa.String(), nullable=True),
+    sa.Column('meal_type', sa.Enum('breakfast', 'lunch', 'dinner', 'snack', name='mealtype'), nullable=True),
+    sa.Column('category', sa.Enum('japanese', 'western', 'chinese', 'italian', 'fast_food', 'healthy', 'other', name='mealcategory'), nullable=True),
+    sa.Column('calories', sa.Integer(), nullable=True),
+    sa.Column('energy_boost', sa.Integer(), nullable=True),
+    sa.Column('fatigue_reduction', sa.Integer(), nullable=True),
+    sa.Column('consumed_at', sa.DateTime(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('meal_history', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_meal_history_id'), ['id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_meal_history_meal_id'), ['meal_id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_meal_history_meal_name'), ['meal_name'], unique=False)
+
+    op.create_table('meals',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(), nullable=True),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('meal_type', sa.Enum('breakfast', 'lunch', 'dinner', 'snack', name='mealtype'), nullable=True),
+    sa.Column('category', sa.Enum('japanese', 'western', 'chinese', 'italian', 'fast_food', 'healthy', 'other', name='mealcategory'), nullable=True),
+    sa.Column('calories', sa.Integer(), nullable=True),
+    sa.Column('protein', sa.Float(), nullable=True),
+    sa.Column('carbs', sa.Float(), nullable=True),
+    sa.Column('fat', sa.Float(), nullable=True),
+    sa.Column('energy_boost', sa.Integer(), nullable=True),
+    sa.Column('fatigue_reduction', sa.Integer(), nullable=True),
+    sa.Column('is_recommended', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('meals', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_meals_id'), ['id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_meals_name'), ['name'], unique=False)
+
+    op.create_table('point_goals',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('title', sa.String(), nullable=True),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('target_amount', sa.Integer(), nullable=True),
+    sa.Column('current_amount', sa.Integer(), nullable=True),
+    sa.Column('deadline', sa.DateTime(), nullable=True),
+    sa.Column('completed', sa.Boolean(), nullable=True),
+    sa.Column('completed_at', sa.DateTime(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('point_goals', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_point_goals_id'), ['id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_point_goals_title'), ['title'], unique=False)
+
+    op.create_table('point_rewards',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('title', sa.String(), nullable=True),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('cost', sa.Integer(), nullable=True),
+    sa.Column('is_available', sa.Boolean(), nullable=True),
+    sa.Column('used_count', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('point_rewards', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_point_rewards_id'), ['id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_point_rewards_title'), ['title'], unique=False)
+
+    op.create_table('points',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('amount', sa.Integer(), nullable=True),
+    sa.Column('point_type', sa.Enum('earned', 'spent', 'bonus', 'penalty', name='pointtype'), nullable=True),
+    sa.Column('category', sa.Enum('task_completion', 'study_progress', 'meal_healthy', 'exercise', 'daily_goal', 'weekly_goal', 'shopping', 'entertainment', 'other', name='pointcategory'), nullable=True),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('balance_after', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('points', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_points_id'), ['id'], unique=False)
+
+    op.create_table('schedules',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('title', sa.String(), nullable=True),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('start_time', sa.DateTime(), nullable=False),
+    sa.Column('end_time', sa.DateTime(), nullable=False),
+    sa.Column('schedule_type', sa.Enum('fixed', 'flexible', name='scheduletype'), nullable=True),
+    sa.Column('priority', sa.Integer(), nullable=True),
+    sa.Column('fatigue', sa.Integer(), nullable=True),
+    sa.Column('completed', sa.Boolean(), nullable=True),
+    sa.Column('category', sa.String(), nullable=True),
+    sa.Column('location', sa.String(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('schedules', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_schedules_id'), ['id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_schedules_title'), ['title'], unique=False)
+
+    op.create_table('studies',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('title', sa.String(), nullable=True),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('subject', sa.Enum('math', 'science', 'language', 'programming', 'literature', 'history', 'other', name='studysubject'), nullable=False),
+    sa.Column('study_type', sa.Enum('lecture', 'assignment', 'exam', 'self_study', name='studytype'), nullable=True),
+    sa.Column('priority', sa.Integer(), nullable=True),
+    sa.Column('difficulty', sa.Integer(), nullable=True),
+    sa.Column('estimated_hours', sa.Float(), nullable=True),
+    sa.Column('completed_hours', sa.Float(), nullable=True),
+    sa.Column('deadline', sa.DateTime(), nullable=True),
+    sa.Column('completed', sa.Boolean(), nullable=True),
+    sa.Column('progress_percentage', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.Column('completed_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('studies', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_studies_id'), ['id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_studies_title'), ['title'], unique=False)
+
+    op.create_table('tasks',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('title', sa.String(), nullable=True),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('deadline', sa.DateTime(), nullable=True),
+    sa.Column('fatigue', sa.Integer(), nullable=True),
+    sa.Column('reward', sa.Integer(), nullable=True),
+    sa.Column('completed', sa.Boolean(), nullable=True),
+    sa.Column('type', sa.Enum('daily', 'normal', name='tasktype'), nullable=True),
+    sa.Column('category', sa.String(), nullable=True),
+    sa.Column('duration', sa.Integer(), nullable=True),
+    sa.Column('priority', sa.Integer(), nullable=True),
+    sa.Column('completed_at', sa.DateTime(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('tasks', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_tasks_id'), ['id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_tasks_title'), ['title'], unique=False)
+
+    op.create_table('timetable',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('day_of_week', sa.Integer(), nullable=False),
+    sa.Column('start_time', sa.String(), nullable=False),
+    sa.Column('end_time', sa.String(), nullable=False),
+    sa.Column('subject', sa.Enum('math', 'science', 'language', 'programming', 'literature', 'history', 'other', name='studysubject'), nullable=False),
+    sa.Column('title', sa.String(), nullable=False),
+    sa.Column('room', sa.String(), nullable=True),
+    sa.Column('teacher', sa.String(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('timetable', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_timetable_id'), ['id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('timetable', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_timetable_id'))
+
+    op.drop_table('timetable')
+    with op.batch_alter_table('tasks', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_tasks_title'))
+        batch_op.drop_index(batch_op.f('ix_tasks_id'))
+
+    op.drop_table('tasks')
+    with op.batch_alter_table('studies', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_studies_title'))
+        batch_op.drop_index(batch_op.f('ix_studies_id'))
+
+    op.drop_table('studies')
+    with op.batch_alter_table('schedules', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_schedules_title'))
+        batch_op.drop_index(batch_op.f('ix_schedules_id'))
+
+    op.drop_table('schedules')
+    with op.batch_alter_table('points', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_points_id'))
+
+    op.drop_table('points')
+    with op.batch_alter_table('point_rewards', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_point_rewards_title'))
+        batch_op.drop_index(batch_op.f('ix_point_rewards_id'))
+
+    op.drop_table('point_rewards')
+    with op.batch_alter_table('point_goals', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_point_goals_title'))
+        batch_op.drop_index(batch_op.f('ix_point_goals_id'))
+
+    op.drop_table('point_goals')
+    with op.batch_alter_table('meals', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_meals_name'))
+        batch_op.drop_index(batch_op.f('ix_meals_id'))
+
+    op.drop_table('meals')
+    with op.batch_alter_table('meal_history', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_meal_history_meal_name'))
+        batch_op.drop_index(batch_op.f('ix_meal_history_meal_id'))
+        batch_op.drop_index(batch_op.f('ix_meal_history_id'))
+
+    op.drop_table('meal_history')
+    with op.batch_alter_table('coins', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_coins_id'))
+
+    op.drop_table('coins')
+    with op.batch_alter_table('coin_shop', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_coin_shop_title'))
+        batch_op.drop_index(batch_op.f('ix_coin_shop_id'))
+
+    op.drop_table('coin_shop')
+    with op.batch_alter_table('coin_goals', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_coin_goals_title'))
+        batch_op.drop_index(batch_op.f('ix_coin_goals_id'))
+
+    op.drop_table('coin_goals')
+    with op.batch_alter_table('coin_exchanges', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_coin_exchanges_id'))
+
+    op.drop_table('coin_exchanges')
@@ -0,0 +1,158 @@
+"""台帳の残高・日次集計・チェックポイントとアーカイブのテーブル
+
+ベースライン（0001）の後に追加したテーブルとキーセットページング用のインデックス。
+既存の取引から日次集計を作る（残高レコードは最初の書き込み時に取引テーブルから作られる）。
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+# 通貨 → (取引テーブル, 取引タイプのカラム)
+LEDGERS = {
+    'coin': ('coins', 'coin_type'),
+    'point': ('points', 'point_type'),
+}
+
+def existing_enum(*values, name: str):
+    """0001 で作った列挙型（PostgreSQLでは型を作り直さない）"""
+    return postgresql.ENUM(*values, name=name, create_type=False)
+
+def upgrade():
+    op.create_table('account_balances',
+    sa.Column('currency', sa.String(), nullable=False),
+    sa.Column('balance', sa.Integer(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('currency')
+    )
+    op.create_table('archive_state',
+    sa.Column('table_name', sa.String(), nullable=False),
+    sa.Column('archived_before', sa.DateTime(), nullable=False),
+    sa.Column('archived_rows', sa.Integer(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('table_name')
+    )
+    op.create_table('balance_checkpoints',
+    sa.Column('currency', sa.String(), nullable=False),
+    sa.Column('entry_id', sa.Integer(), nullable=False),
+    sa.Column('entry_created_at', sa.DateTime(), nullable=False),
+    sa.Column('balance', sa.Integer(), nullable=True),
+    sa.PrimaryKeyConstraint('currency', 'entry_id')
+    )
+    with op.batch_alter_table('balance_checkpoints', schema=None) as batch_op:
+        batch_op.create_index('ix_balance_checkpoints_position', ['currency', 'entry_created_at', 'entry_id'], unique=False)
+
+    op.create_table('coin_exchanges_archive',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('from_currency', sa.String(), nullable=True),
+    sa.Column('to_currency', sa.String(), nullable=True),
+    sa.Column('from_amount', sa.Integer(), nullable=True),
+    sa.Column('to_amount', sa.Integer(), nullable=True),
+    sa.Column('exchange_rate', sa.Float(), nullable=True),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('coin_exchanges_archive', schema=None) as batch_op:
+        batch_op.create_index('ix_coin_exchanges_archive_created_at_id', ['created_at', 'id'], unique=False)
+
+    op.create_table('coins_archive',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('amount', sa.Integer(), nullable=True),
+    sa.Column('coin_type', existing_enum('earned', 'spent', 'bonus', 'penalty', 'exchange', name='cointype'), nullable=True),
+    sa.Column('category', existing_enum('task_completion', 'study_progress', 'daily_login', 'weekly_goal', 'monthly_goal', 'shopping', 'gaming', 'entertainment', 'other', name='coincategory'), nullable=True),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('balance_after', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('coins_archive', schema=None) as batch_op:
+        batch_op.create_index('ix_coins_archive_created_at_id', ['created_at', 'id'], unique=False)
+
+    op.create_table('ledger_daily_rollups',
+    sa.Column('currency', sa.String(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('category', sa.String(), nullable=False),
+    sa.Column('earned', sa.Integer(), nullable=True),
+    sa.Column('spent', sa.Integer(), nullable=True),
+    sa.Column('transactions', sa.Integer(), nullable=True),
+    sa.PrimaryKeyConstraint('currency', 'day', 'category')
+    )
+    op.create_table('meal_history_archive',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('meal_id', sa.Integer(), nullable=True),
+    sa.Column('meal_name', sa.String(), nullable=True),
+    sa.Column('meal_type', existing_enum('breakfast', 'lunch', 'dinner', 'snack', name='mealtype'), nullable=True),
+    sa.Column('category', existing_enum('japanese', 'western', 'chinese', 'italian', 'fast_food', 'healthy', 'other', name='mealcategory'), nullable=True),
+    sa.Column('calories', sa.Integer(), nullable=True),
+    sa.Column('energy_boost', sa.Integer(), nullable=True),
+    sa.Column('fatigue_reduction', sa.Integer(), nullable=True),
+    sa.Column('consumed_at', sa.DateTime(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('meal_history_archive', schema=None) as batch_op:
+        batch_op.create_index('ix_meal_history_archive_consumed_at', ['consumed_at'], unique=False)
+
+    op.create_table('points_archive',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('amount', sa.Integer(), nullable=True),
+    sa.Column('point_type', existing_enum('earned', 'spent', 'bonus', 'penalty', name='pointtype'), nullable=True),
+    sa.Column('category', existing_enum('task_completion', 'study_progress', 'meal_healthy', 'exercise', 'daily_goal', 'weekly_goal', 'shopping', 'entertainment', 'other', name='pointcategory'), nullable=True),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('balance_after', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('points_archive', schema=None) as batch_op:
+        batch_op.create_index('ix_points_archive_created_at_id', ['created_at', 'id'], unique=False)
+
+    # キーセットページング・最新残高の取得用
+    op.create_index('ix_coins_created_at_id', 'coins', ['created_at', 'id'], unique=False)
+    op.create_index('ix_points_created_at_id', 'points', ['created_at', 'id'], unique=False)
+    op.create_index('ix_coin_exchanges_created_at_id', 'coin_exchanges', ['created_at', 'id'], unique=False)
+
+    for currency, (table, type_column) in LEDGERS.items():
+        op.execute(sa.text(
+            f"INSERT INTO ledger_daily_rollups (currency, day, category, earned, spent, transactions) "
+            f"SELECT :currency, date(created_at), CAST(category AS VARCHAR), "
+            f"sum(CASE WHEN CAST({type_column} AS VARCHAR) = 'earned' THEN amount ELSE 0 END), "
+            f"sum(CASE WHEN CAST({type_column} AS VARCHAR) = 'spent' THEN amount ELSE 0 END), count(*) "
+            f"FROM {table} WHERE created_at IS NOT NULL GROUP BY date(created_at), CAST(category AS VARCHAR)"
+        ).bindparams(currency=currency))
+
+def downgrade():
+    op.drop_index('ix_coin_exchanges_created_at_id', table_name='coin_exchanges')
+    op.drop_index('ix_points_created_at_id', table_name='points')
+    op.drop_index('ix_coins_created_at_id', table_name='coins')
+    with op.batch_alter_table('points_archive', schema=None) as batch_op:
+        batch_op.drop_index('ix_points_archive_created_at_id')
+
+    op.drop_table('points_archive')
+    with op.batch_alter_table('meal_history_archive', schema=None) as batch_op:
+        batch_op.drop_index('ix_meal_history_archive_consumed_at')
+
+    op.drop_table('meal_history_archive')
+    op.drop_table('ledger_daily_rollups')
+    with op.batch_alter_table('coins_archive', schema=None) as batch_op:
+        batch_op.drop_index('ix_coins_archive_created_at_id')
+
+    op.drop_table('coins_archive')
+    with op.batch_alter_table('coin_exchanges_archive', schema=None) as batch_op:
+        batch_op.drop_index('ix_coin_exchanges_archive_created_at_id')
+
+    op.drop_table('coin_exchanges_archive')
+    with op.batch_alter_table('balance_checkpoints', schema=None) as batch_op:
+        batch_op.drop_index('ix_balance_checkpoints_position')
+
+    op.drop_table('balance_checkpoints')
+    op.drop_table('archive_state')
+    op.drop_table('account_balances')
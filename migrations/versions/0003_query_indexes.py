@@ -0,0 +1,59 @@
+"""よく使う絞り込み・並び順に合わせたインデックス
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+def where(sqlite_condition: str, postgresql_condition: str) -> dict:
+    """部分インデックスの条件（真偽値の表記がSQLiteとPostgreSQLで異なる）"""
+    return {"sqlite_where": sa.text(sqlite_condition), "postgresql_where": sa.text(postgresql_condition)}
+
+def desc(column: str):
+    return sa.literal_column(f"{column} DESC")
+
+# (インデックス名, テーブル, カラム, 部分インデックスの条件)
+INDEXES = [
+    # タスク一覧の並び順（優先度の高い順、期限の近い順）
+    ("ix_tasks_priority_deadline", "tasks", [desc("priority"), "deadline"], {}),
+    # 期限間近・期限切れの未完了タスク
+    ("ix_tasks_open_deadline", "tasks", ["deadline"],
+     where("completed = 0 AND deadline IS NOT NULL", "completed = false AND deadline IS NOT NULL")),
+    # 完了履歴
+    ("ix_tasks_completed_at", "tasks", [desc("completed_at")], where("completed = 1", "completed = true")),
+    ("ix_tasks_type", "tasks", ["type"], {}),
+    # 期間の重なり判定
+    ("ix_schedules_start_time", "schedules", ["start_time"], {}),
+    ("ix_schedules_end_time", "schedules", ["end_time"], {}),
+    ("ix_studies_created_at", "studies", [desc("created_at")], {}),
+    ("ix_studies_completed_at", "studies", [desc("completed_at")], where("completed = 1", "completed = true")),
+    ("ix_studies_open", "studies", ["priority"], where("completed = 0", "completed = false")),
+    ("ix_studies_subject_completed", "studies", ["subject", "completed"], {}),
+    ("ix_timetable_start_time", "timetable", ["start_time"], {}),
+    ("ix_timetable_day_start", "timetable", ["day_of_week", "start_time"], {}),
+    ("ix_meals_meal_type", "meals", ["meal_type"], {}),
+    ("ix_meal_history_consumed_at", "meal_history", [desc("consumed_at")], {}),
+    ("ix_coin_goals_created_at", "coin_goals", [desc("created_at")], {}),
+    ("ix_coin_goals_completed_created_at", "coin_goals", ["completed", desc("created_at")], {}),
+    ("ix_point_goals_created_at", "point_goals", [desc("created_at")], {}),
+    ("ix_point_goals_completed_created_at", "point_goals", ["completed", desc("created_at")], {}),
+    ("ix_coin_shop_cost", "coin_shop", ["cost"], {}),
+    ("ix_coin_shop_available_cost", "coin_shop", ["is_available", "cost"], {}),
+    ("ix_point_rewards_cost", "point_rewards", ["cost"], {}),
+    ("ix_point_rewards_available_cost", "point_rewards", ["is_available", "cost"], {}),
+]
+
+def upgrade():
+    for name, table, columns, options in INDEXES:
+        op.create_index(name, table, columns, **options)
+
+def downgrade():
+    for name, table, _, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,25 @@
+"""投入済みフィクスチャの記録
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0004'
+down_revision = '0003'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.create_table('fixture_versions',
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.Column('rows', sa.Integer(), nullable=True),
+    sa.Column('loaded_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('name', 'version')
+    )
+
+def downgrade():
+    op.drop_table('fixture_versions')
@@ -0,0 +1,41 @@
+"""タスクのリマインダー時刻
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18
+"""
+from datetime import timedelta
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0005'
+down_revision = '0004'
+branch_labels = None
+depends_on = None
+
+def reminder_time(deadline):
+    """crud/tasks.reminder_time_for と同じ計算（期限日の就寝23時の10時間前か、期限の30分前の早い方）"""
+    before_sleep = deadline.replace(hour=23, minute=0, second=0, microsecond=0) - timedelta(hours=10)
+    return min(before_sleep, deadline - timedelta(minutes=30))
+
+def upgrade():
+    reminders = op.create_table('task_reminders',
+    sa.Column('task_id', sa.Integer(), nullable=False),
+    sa.Column('reminder_time', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['task_id'], ['tasks.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('task_id')
+    )
+    op.create_index('ix_task_reminders_reminder_time', 'task_reminders', ['reminder_time'], unique=False)
+
+    # 既存の未完了で期限のあるタスクから作る
+    tasks = sa.table('tasks', sa.column('id', sa.Integer), sa.column('deadline', sa.DateTime),
+                     sa.column('completed', sa.Boolean))
+    rows = op.get_bind().execute(
+        sa.select(tasks.c.id, tasks.c.deadline).where(tasks.c.completed == sa.false(), tasks.c.deadline.isnot(None))
+    ).all()
+    if rows:
+        op.bulk_insert(reminders, [{"task_id": id, "reminder_time": reminder_time(deadline)} for id, deadline in rows])
+
+def downgrade():
+    op.drop_index('ix_task_reminders_reminder_time', table_name='task_reminders')
+    op.drop_table('task_reminders')
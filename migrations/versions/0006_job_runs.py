@@ -0,0 +1,31 @@
+"""定期ジョブの実行記録
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0006'
+down_revision = '0005'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.create_table('job_runs',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('job', sa.String(), nullable=False),
+    sa.Column('run_key', sa.String(), nullable=False),
+    sa.Column('started_at', sa.DateTime(), nullable=True),
+    sa.Column('finished_at', sa.DateTime(), nullable=True),
+    sa.Column('duration_ms', sa.Float(), nullable=True),
+    sa.Column('rows', sa.Integer(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('job', 'run_key', name='uq_job_runs_job_run_key')
+    )
+    op.create_index('ix_job_runs_job_started_at', 'job_runs', ['job', sa.literal_column('started_at DESC')], unique=False)
+
+def downgrade():
+    op.drop_index('ix_job_runs_job_started_at', table_name='job_runs')
+    op.drop_table('job_runs')
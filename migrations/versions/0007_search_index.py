@@ -0,0 +1,67 @@
+"""全文検索用のFTS5インデックス（SQLiteのみ）
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18
+"""
+from alembic import op
+
+revision = '0007'
+down_revision = '0006'
+branch_labels = None
+depends_on = None
+
+# crud/search.SOURCES と同じ対応（種類, テーブル, rowidのオフセット, タイトル, 説明, その他の検索対象）
+# rowid は id * 4 + オフセット にして、トリガーから主キーで消せるようにする
+SOURCES = [
+    ("task", "tasks", 0, "title", "description", ["category"]),
+    ("study", "studies", 1, "title", "description", ["subject"]),
+    ("schedule", "schedules", 2, "title", "description", ["location", "category"]),
+    ("meal", "meals", 3, "name", "description", ["category"]),
+]
+
+def extra(prefix: str, columns: list) -> str:
+    return " || ' ' || ".join(f"coalesce({prefix}{column}, '')" for column in columns)
+
+def row_values(kind: str, offset: int, title: str, description: str, columns: list, prefix: str) -> str:
+    return (f"{prefix}id * 4 + {offset}, '{kind}', {prefix}id, {prefix}{title}, {prefix}{description}, "
+            f"{extra(prefix, columns)}")
+
+def upgrade():
+    if op.get_bind().dialect.name != "sqlite":
+        return
+    # trigram トークナイザで日本語も部分一致で検索できる（3文字以上の語）
+    op.execute(
+        "CREATE VIRTUAL TABLE search_index USING fts5("
+        "type UNINDEXED, item_id UNINDEXED, title, description, extra, tokenize = 'trigram')"
+    )
+    columns = "rowid, type, item_id, title, description, extra"
+    for kind, table, offset, title, description, extra_columns in SOURCES:
+        op.execute(
+            f"INSERT INTO search_index ({columns}) "
+            f"SELECT {row_values(kind, offset, title, description, extra_columns, '')} FROM {table}"
+        )
+        op.execute(
+            f"CREATE TRIGGER search_{table}_insert AFTER INSERT ON {table} BEGIN "
+            f"INSERT INTO search_index ({columns}) "
+            f"VALUES ({row_values(kind, offset, title, description, extra_columns, 'NEW.')}); END"
+        )
+        watched = ", ".join([title, description] + extra_columns)
+        op.execute(
+            f"CREATE TRIGGER search_{table}_update AFTER UPDATE OF {watched} ON {table} BEGIN "
+            f"DELETE FROM search_index WHERE rowid = OLD.id * 4 + {offset}; "
+            f"INSERT INTO search_index ({columns}) "
+            f"VALUES ({row_values(kind, offset, title, description, extra_columns, 'NEW.')}); END"
+        )
+        op.execute(
+            f"CREATE TRIGGER search_{table}_delete AFTER DELETE ON {table} BEGIN "
+            f"DELETE FROM search_index WHERE rowid = OLD.id * 4 + {offset}; END"
+        )
+
+def downgrade():
+    if op.get_bind().dialect.name != "sqlite":
+        return
+    for _, table, _, _, _, _ in SOURCES:
+        for action in ("insert", "update", "delete"):
+            op.execute(f"DROP TRIGGER IF EXISTS search_{table}_{action}")
+    op.execute("DROP TABLE IF EXISTS search_index")
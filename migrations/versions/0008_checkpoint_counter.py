@@ -0,0 +1,22 @@
+"""残高レコードに前回のチェックポイントからの取引件数を持たせる
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0008'
+down_revision = '0007'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    with op.batch_alter_table('account_balances', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('entries_since_checkpoint', sa.Integer(), server_default='0', nullable=False))
+    # 既存の台帳は次の verify-ledger か修復でチェックポイントと件数が揃う
+
+def downgrade():
+    with op.batch_alter_table('account_balances', schema=None) as batch_op:
+        batch_op.drop_column('entries_since_checkpoint')
@@ -0,0 +1,50 @@
+"""アーカイブするテーブルのIDを再利用しない（SQLiteのAUTOINCREMENT）
+
+アーカイブは元のIDのまま行を移すため、AUTOINCREMENTでないSQLiteのテーブルでは
+最大IDの行を移した後に同じIDが再び採番され、アーカイブやチェックポイントと衝突する。
+PostgreSQLのシーケンスはIDを再利用しないので何もしない。
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0009'
+down_revision = '0008'
+branch_labels = None
+depends_on = None
+
+# 元テーブル → アーカイブテーブル
+ARCHIVED_TABLES = {
+    'coins': 'coins_archive',
+    'points': 'points_archive',
+    'coin_exchanges': 'coin_exchanges_archive',
+    'meal_history': 'meal_history_archive',
+}
+
+def recreate_tables(autoincrement: bool):
+    for table in ARCHIVED_TABLES:
+        with op.batch_alter_table(table, recreate='always', table_kwargs={'sqlite_autoincrement': autoincrement}) as batch_op:
+            pass
+    # 作り直しでは降順の指定が引き継がれない
+    op.drop_index('ix_meal_history_consumed_at', table_name='meal_history')
+    op.create_index('ix_meal_history_consumed_at', 'meal_history', [sa.literal_column('consumed_at DESC')], unique=False)
+
+def upgrade():
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    recreate_tables(True)
+    for table, archive in ARCHIVED_TABLES.items():
+        # 採番をアーカイブ済みのIDより後から始める
+        op.execute(sa.text("DELETE FROM sqlite_sequence WHERE name = :name").bindparams(name=table))
+        op.execute(sa.text(
+            f"INSERT INTO sqlite_sequence (name, seq) SELECT :name, max("
+            f"coalesce((SELECT max(id) FROM {table}), 0), coalesce((SELECT max(id) FROM {archive}), 0))"
+        ).bindparams(name=table))
+
+def downgrade():
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    recreate_tables(False)
@@ -0,0 +1,72 @@
+from sqlalchemy import Column, Integer, String, DateTime, Text, Enum, Float, Index
+from sqlalchemy.sql import func
+from core.database import Base
+from models.coins import CoinType, CoinCategory
+from models.points import PointType, PointCategory
+from models.meals import MealType, MealCategory
+
+# アーカイブ先のテーブル（元テーブルと同じカラム構成、IDも元のまま保持する）
+
+class CoinArchive(Base):
+    __tablename__ = "coins_archive"
+
+    id = Column(Integer, primary_key=True)
+    amount = Column(Integer, default=0)
+    coin_type = Column(Enum(CoinType, values_callable=lambda x: [e.value for e in x]), default=CoinType.EARNED)
+    category = Column(Enum(CoinCategory, values_callable=lambda x: [e.value for e in x]), default=CoinCategory.OTHER)
+    description = Column(Text, nullable=True)
+    balance_after = Column(Integer, default=0)
+    created_at = Column(DateTime)
+
+    __table_args__ = (Index("ix_coins_archive_created_at_id", "created_at", "id"),)
+
+class PointArchive(Base):
+    __tablename__ = "points_archive"
+
+    id = Column(Integer, primary_key=True)
+    amount = Column(Integer, default=0)
+    point_type = Column(Enum(PointType, values_callable=lambda x: [e.value for e in x]), default=PointType.EARNED)
+    category = Column(Enum(PointCategory, values_callable=lambda x: [e.value for e in x]), default=PointCategory.OTHER)
+    description = Column(Text, nullable=True)
+    balance_after = Column(Integer, default=0)
+    created_at = Column(DateTime)
+
+    __table_args__ = (Index("ix_points_archive_created_at_id", "created_at", "id"),)
+
+class CoinExchangeArchive(Base):
+    __tablename__ = "coin_exchanges_archive"
+
+    id = Column(Integer, primary_key=True)
+    from_currency = Column(String, default="coin")
+    to_currency = Column(String, default="point")
+    from_amount = Column(Integer, default=0)
+    to_amount = Column(Integer, default=0)
+    exchange_rate = Column(Float, default=1.0)
+    description = Column(Text, nullable=True)
+    created_at = Column(DateTime)
+
+    __table_args__ = (Index("ix_coin_exchanges_archive_created_at_id", "created_at", "id"),)
+
+class MealHistoryArchive(Base):
+    __tablename__ = "meal_history_archive"
+
+    id = Column(Integer, primary_key=True)
+    meal_id = Column(Integer)
+    meal_name = Column(String)
+    meal_type = Column(Enum(MealType, values_callable=lambda x: [e.value for e in x]))
+    category = Column(Enum(MealCategory, values_callable=lambda x: [e.value for e in x]))
+    calories = Column(Integer, default=0)
+    energy_boost = Column(Integer, default=0)
+    fatigue_reduction = Column(Integer, default=0)
+    consumed_at = Column(DateTime)
+    created_at = Column(DateTime)
+
+    __table_args__ = (Index("ix_meal_history_archive_consumed_at", "consumed_at"),)
+
+class ArchiveState(Base):
+    __tablename__ = "archive_state"
+
+    table_name = Column(String, primary_key=True)  # 元テーブル名
+    archived_before = Column(DateTime, nullable=False)  # この日時より前の行はアーカイブ済み
+    archived_rows = Column(Integer, default=0)
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, Enum, Float
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, Enum, Float, Index
 from sqlalchemy.sql import func
 from core.database import Base
 import enum
@@ -32,6 +32,10 @@ class Coin(Base):
     balance_after = Column(Integer, default=0)  # 取引後の残高
     created_at = Column(DateTime, default=func.now())
 
+    # キーセットページング・最新残高の取得用。
+    # IDはアーカイブへ移した行と重複させない（SQLiteのAUTOINCREMENT）
+    __table_args__ = (Index("ix_coins_created_at_id", "created_at", "id"), {"sqlite_autoincrement": True})
+
 class CoinGoal(Base):
     __tablename__ = "coin_goals"
 
@@ -46,6 +50,12 @@ class CoinGoal(Base):
     created_at = Column(DateTime, default=func.now())
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
 
+    __table_args__ = (
+        Index("ix_coin_goals_created_at", created_at.desc()),
+        # 完了状態での絞り込みと、取引ごとの未達成目標の更新
+        Index("ix_coin_goals_completed_created_at", completed, created_at.desc()),
+    )
+
 class CoinShop(Base):
     __tablename__ = "coin_shop"
 
@@ -59,6 +69,11 @@ class CoinShop(Base):
     created_at = Column(DateTime, default=func.now())
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
 
+    __table_args__ = (
+        Index("ix_coin_shop_cost", cost),
+        Index("ix_coin_shop_available_cost", is_available, cost),
+    )
+
 class CoinExchange(Base):
     __tablename__ = "coin_exchanges"
 
@@ -70,3 +85,5 @@ class CoinExchange(Base):
     exchange_rate = Column(Float, default=1.0)
     description = Column(Text, nullable=True)
     created_at = Column(DateTime, default=func.now())
+
+    __table_args__ = (Index("ix_coin_exchanges_created_at_id", "created_at", "id"), {"sqlite_autoincrement": True})
@@ -0,0 +1,11 @@
+from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy.sql import func
+from core.database import Base
+
+class FixtureVersion(Base):
+    __tablename__ = "fixture_versions"
+
+    name = Column(String, primary_key=True)  # フィクスチャ名（fixtures/<name>_v<version>.json）
+    version = Column(Integer, primary_key=True)
+    rows = Column(Integer, default=0)  # 投入した行数
+    loaded_at = Column(DateTime, default=func.now())
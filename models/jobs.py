@@ -0,0 +1,21 @@
+from sqlalchemy import Column, Integer, String, DateTime, Float, Index, UniqueConstraint
+from sqlalchemy.sql import func
+from core.database import Base
+
+class JobRun(Base):
+    """定期ジョブの実行記録。(job, run_key) が一意なので、同じ回を二度実行しない"""
+    __tablename__ = "job_runs"
+
+    id = Column(Integer, primary_key=True)
+    job = Column(String, nullable=False)  # ジョブ名（daily_reset など）
+    run_key = Column(String, nullable=False)  # 実行する回（daily_reset ならリセット時刻）
+    started_at = Column(DateTime, default=func.now())
+    finished_at = Column(DateTime, nullable=True)
+    duration_ms = Column(Float, nullable=True)
+    rows = Column(Integer, default=0)  # 更新した行数
+
+    __table_args__ = (
+        UniqueConstraint("job", "run_key", name="uq_job_runs_job_run_key"),
+        # ジョブごとの最後の実行
+        Index("ix_job_runs_job_started_at", job, started_at.desc()),
+    )
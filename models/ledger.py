@@ -0,0 +1,32 @@
+from sqlalchemy import Column, Integer, String, DateTime, Date, Index
+from sqlalchemy.sql import func
+from core.database import Base
+
+class AccountBalance(Base):
+    __tablename__ = "account_balances"
+
+    currency = Column(String, primary_key=True)  # coin, point
+    balance = Column(Integer, default=0)  # 現在の残高
+    entries_since_checkpoint = Column(Integer, nullable=False, default=0, server_default="0")  # 前回のチェックポイント以降の取引件数
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+
+class LedgerDailyRollup(Base):
+    __tablename__ = "ledger_daily_rollups"
+
+    currency = Column(String, primary_key=True)  # coin, point
+    day = Column(Date, primary_key=True)
+    category = Column(String, primary_key=True)
+    earned = Column(Integer, default=0)  # 獲得量（earned）
+    spent = Column(Integer, default=0)  # 消費量（spent）
+    transactions = Column(Integer, default=0)  # 取引件数
+
+class BalanceCheckpoint(Base):
+    __tablename__ = "balance_checkpoints"
+
+    currency = Column(String, primary_key=True)  # coin, point
+    entry_id = Column(Integer, primary_key=True)  # この取引の時点の残高
+    entry_created_at = Column(DateTime, nullable=False)
+    balance = Column(Integer, default=0)
+
+    # 修正位置の直前のチェックポイント検索用
+    __table_args__ = (Index("ix_balance_checkpoints_position", "currency", "entry_created_at", "entry_id"),)
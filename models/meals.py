@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, Enum, Float
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, Enum, Float, Index
 from sqlalchemy.sql import func
 from core.database import Base
 import enum
@@ -36,6 +36,8 @@ class Meal(Base):
     created_at = Column(DateTime, default=func.now())
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
 
+    __table_args__ = (Index("ix_meals_meal_type", meal_type),)
+
 class MealHistory(Base):
     __tablename__ = "meal_history"
 
@@ -49,3 +51,5 @@ class MealHistory(Base):
     fatigue_reduction = Column(Integer, default=0)
     consumed_at = Column(DateTime, default=func.now())
     created_at = Column(DateTime, default=func.now())
+
+    __table_args__ = (Index("ix_meal_history_consumed_at", consumed_at.desc()), {"sqlite_autoincrement": True})
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, Enum, Float
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, Enum, Float, Index
 from sqlalchemy.sql import func
 from core.database import Base
 import enum
@@ -31,6 +31,9 @@ class Point(Base):
     balance_after = Column(Integer, default=0)  # 取引後の残高
     created_at = Column(DateTime, default=func.now())
 
+    # キーセットページング・最新残高の取得用
+    __table_args__ = (Index("ix_points_created_at_id", "created_at", "id"), {"sqlite_autoincrement": True})
+
 class PointGoal(Base):
     __tablename__ = "point_goals"
 
@@ -45,6 +48,12 @@ class PointGoal(Base):
     created_at = Column(DateTime, default=func.now())
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
 
+    __table_args__ = (
+        Index("ix_point_goals_created_at", created_at.desc()),
+        # 完了状態での絞り込みと、取引ごとの未達成目標の更新
+        Index("ix_point_goals_completed_created_at", completed, created_at.desc()),
+    )
+
 class PointReward(Base):
     __tablename__ = "point_rewards"
 
@@ -56,3 +65,8 @@ class PointReward(Base):
     used_count = Column(Integer, default=0)
     created_at = Column(DateTime, default=func.now())
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+
+    __table_args__ = (
+        Index("ix_point_rewards_cost", cost),
+        Index("ix_point_rewards_available_cost", is_available, cost),
+    )
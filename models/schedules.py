@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, Enum
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, Enum, Index
 from sqlalchemy.sql import func
 from core.database import Base
 import enum
@@ -23,3 +23,9 @@ class Schedule(Base):
     location = Column(String, nullable=True)
     created_at = Column(DateTime, default=func.now())
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+
+    # 期間の重なり判定（開始・終了それぞれの範囲検索）
+    __table_args__ = (
+        Index("ix_schedules_start_time", start_time),
+        Index("ix_schedules_end_time", end_time),
+    )
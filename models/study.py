@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, Enum, Float
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, Enum, Float, Index
 from sqlalchemy.sql import func
 from core.database import Base
 import enum
@@ -37,6 +37,17 @@ class Study(Base):
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
     completed_at = Column(DateTime, nullable=True)
 
+    __table_args__ = (
+        Index("ix_studies_created_at", created_at.desc()),
+        # 完了履歴（完了日時の新しい順）
+        Index("ix_studies_completed_at", completed_at.desc(),
+              sqlite_where=completed == True, postgresql_where=completed == True),
+        # 未完了のおすすめ候補
+        Index("ix_studies_open", priority,
+              sqlite_where=completed == False, postgresql_where=completed == False),
+        Index("ix_studies_subject_completed", subject, completed),
+    )
+
 class Timetable(Base):
     __tablename__ = "timetable"
 
@@ -51,3 +62,7 @@ class Timetable(Base):
     created_at = Column(DateTime, default=func.now())
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
 
+    __table_args__ = (
+        Index("ix_timetable_start_time", start_time),
+        Index("ix_timetable_day_start", day_of_week, start_time),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, Enum
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, Enum, Index, ForeignKey
 from sqlalchemy.sql import func
 from core.database import Base
 import enum
@@ -24,3 +24,28 @@ class Task(Base):
     completed_at = Column(DateTime, nullable=True)
     created_at = Column(DateTime, default=func.now())
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+
+    __table_args__ = (
+        # 一覧の並び順（優先度の高い順、期限の近い順）
+        Index("ix_tasks_priority_deadline", priority.desc(), deadline),
+        # 期限間近・期限切れの未完了タスク
+        Index("ix_tasks_open_deadline", deadline,
+              sqlite_where=(completed == False) & deadline.isnot(None),
+              postgresql_where=(completed == False) & deadline.isnot(None)),
+        # 完了履歴（完了日時の新しい順）
+        Index("ix_tasks_completed_at", completed_at.desc(),
+              sqlite_where=completed == True, postgresql_where=completed == True),
+        Index("ix_tasks_type", type),
+    )
+
+class TaskReminder(Base):
+    """未完了で期限のあるタスクのリマインダー時刻（crud/tasks.py がタスクの変更に合わせて更新する）"""
+    __tablename__ = "task_reminders"
+
+    task_id = Column(Integer, ForeignKey("tasks.id", ondelete="CASCADE"), primary_key=True)
+    reminder_time = Column(DateTime, nullable=False)
+
+    __table_args__ = (
+        # 指定時間内のリマインダー（範囲検索）
+        Index("ix_task_reminders_reminder_time", reminder_time),
+    )
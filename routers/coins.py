@@ -1,152 +1,201 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
-from core.database import get_db
+from datetime import datetime
+from core.database import get_read_db
+from core.ledger_writer import WriterProxy, get_db, writer
 from models import coins as models
 from schemas import coins as schemas
 from crud import coins as crud
+from crud.pagination import cursor_headers
+from crud.ledger_import import LedgerImportError, import_stream
 
 router = APIRouter(prefix="/coins", tags=["coins"])
 
 # コイン取引関連
 @router.get("/", response_model=List[schemas.Coin])
-def read_coins(
+async def read_coins(
+    response: Response,
     coin_type: Optional[str] = Query(None, description="コインタイプでフィルタ"),
     category: Optional[str] = Query(None, description="カテゴリでフィルタ"),
     limit: int = Query(100, description="取得件数"),
-    db: Session = Depends(get_db)
+    before: Optional[str] = Query(None, description="このカーソルより古い取引を取得"),
+    after: Optional[str] = Query(None, description="このカーソルより新しい取引を取得"),
+    from_date: Optional[datetime] = Query(None, alias="from", description="この日時以降の取引"),
+    to_date: Optional[datetime] = Query(None, alias="to", description="この日時以前の取引"),
+    db: AsyncSession = Depends(get_read_db)
 ):
-    return crud.get_coins(db, coin_type, category, limit)
+    try:
+        coins = await db.run_sync(crud.get_coins, coin_type, category, limit, before, after, from_date, to_date)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    response.headers.update(cursor_headers(coins))
+    return coins
 
 @router.get("/{coin_id}", response_model=schemas.Coin)
-def read_coin(coin_id: int, db: Session = Depends(get_db)):
-    coin = crud.get_coin(db, coin_id)
+async def read_coin(coin_id: int, db: AsyncSession = Depends(get_read_db)):
+    coin = await db.run_sync(crud.get_coin, coin_id)
     if coin is None:
         raise HTTPException(status_code=404, detail="Coin not found")
     return coin
 
 @router.post("/", response_model=schemas.Coin)
-def create_coin(coin: schemas.CoinCreate, db: Session = Depends(get_db)):
-    return crud.create_coin(db, coin)
+async def create_coin(coin: schemas.CoinCreate):
+    return await writer.run_async(crud.create_coin, coin)
 
 @router.put("/{coin_id}", response_model=schemas.Coin)
-def update_coin(coin_id: int, coin: schemas.CoinUpdate, db: Session = Depends(get_db)):
-    db_coin = crud.update_coin(db, coin_id, coin)
+async def update_coin(coin_id: int, coin: schemas.CoinUpdate):
+    db_coin = await writer.run_async(crud.update_coin, coin_id, coin)
     if db_coin is None:
         raise HTTPException(status_code=404, detail="Coin not found")
     return db_coin
 
 @router.delete("/{coin_id}")
-def delete_coin(coin_id: int, db: Session = Depends(get_db)):
-    success = crud.delete_coin(db, coin_id)
+async def delete_coin(coin_id: int):
+    success = await writer.run_async(crud.delete_coin, coin_id)
     if not success:
         raise HTTPException(status_code=404, detail="Coin not found")
     return {"detail": "Coin deleted"}
 
+@router.post("/import")
+async def import_coins(
+    request: Request,
+    fmt: str = Query("ndjson", alias="format", description="ndjson または csv"),
+    batch_size: int = Query(5000, description="1回のコミットで取り込む件数"),
+    skip_lines: int = Query(0, ge=0, description="この行までは取り込み済みとして読み飛ばす（エラー時の committed_line）")
+):
+    """コイン取引をNDJSON/CSVからストリーミングで一括取り込み
+
+    バッチごとにコミットする。不正な行があれば400で、取り込み済みの件数と続きの位置（committed_line）を返す。
+    """
+    try:
+        return await import_stream(request.stream(), "coin", fmt, writer, batch_size, skip_lines)
+    except LedgerImportError as e:
+        raise HTTPException(status_code=400, detail={
+            "message": str(e), "line": e.line_no, "imported": e.imported, "committed_line": e.committed_line
+        })
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
 @router.get("/balance/")
-def get_current_balance(db: Session = Depends(get_db)):
-    return {"balance": crud.get_current_balance(db)}
+async def get_current_balance(db: AsyncSession = Depends(get_read_db)):
+    return {"balance": await db.run_sync(crud.get_current_balance)}
 
 # コイン目標関連
 @router.get("/goals/", response_model=List[schemas.CoinGoal])
-def read_coin_goals(
+async def read_coin_goals(
     completed: Optional[bool] = Query(None, description="完了状態でフィルタ"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
-    return crud.get_coin_goals(db, completed)
+    return await db.run_sync(crud.get_coin_goals, completed)
 
 @router.get("/goals/{goal_id}", response_model=schemas.CoinGoal)
-def read_coin_goal(goal_id: int, db: Session = Depends(get_db)):
-    goal = crud.get_coin_goal(db, goal_id)
+async def read_coin_goal(goal_id: int, db: AsyncSession = Depends(get_read_db)):
+    goal = await db.run_sync(crud.get_coin_goal, goal_id)
     if goal is None:
         raise HTTPException(status_code=404, detail="Coin goal not found")
     return goal
 
 @router.post("/goals/", response_model=schemas.CoinGoal)
-def create_coin_goal(goal: schemas.CoinGoalCreate, db: Session = Depends(get_db)):
-    return crud.create_coin_goal(db, goal)
+async def create_coin_goal(goal: schemas.CoinGoalCreate, db: WriterProxy = Depends(get_db)):
+    return await db.run_sync(crud.create_coin_goal, goal)
 
 @router.put("/goals/{goal_id}", response_model=schemas.CoinGoal)
-def update_coin_goal(goal_id: int, goal: schemas.CoinGoalUpdate, db: Session = Depends(get_db)):
-    db_goal = crud.update_coin_goal(db, goal_id, goal)
+async def update_coin_goal(goal_id: int, goal: schemas.CoinGoalUpdate, db: WriterProxy = Depends(get_db)):
+    db_goal = await db.run_sync(crud.update_coin_goal, goal_id, goal)
     if db_goal is None:
         raise HTTPException(status_code=404, detail="Coin goal not found")
     return db_goal
 
 @router.delete("/goals/{goal_id}")
-def delete_coin_goal(goal_id: int, db: Session = Depends(get_db)):
-    success = crud.delete_coin_goal(db, goal_id)
+async def delete_coin_goal(goal_id: int, db: WriterProxy = Depends(get_db)):
+    success = await db.run_sync(crud.delete_coin_goal, goal_id)
     if not success:
         raise HTTPException(status_code=404, detail="Coin goal not found")
     return {"detail": "Coin goal deleted"}
 
 # コインショップ関連
 @router.get("/shop/", response_model=List[schemas.CoinShop])
-def read_coin_shop_items(
+async def read_coin_shop_items(
     is_available: Optional[bool] = Query(None, description="利用可能状態でフィルタ"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
-    return crud.get_coin_shop_items(db, is_available)
+    return await db.run_sync(crud.get_coin_shop_items, is_available)
 
 @router.get("/shop/{item_id}", response_model=schemas.CoinShop)
-def read_coin_shop_item(item_id: int, db: Session = Depends(get_db)):
-    item = crud.get_coin_shop_item(db, item_id)
+async def read_coin_shop_item(item_id: int, db: AsyncSession = Depends(get_read_db)):
+    item = await db.run_sync(crud.get_coin_shop_item, item_id)
     if item is None:
         raise HTTPException(status_code=404, detail="Shop item not found")
     return item
 
 @router.post("/shop/", response_model=schemas.CoinShop)
-def create_coin_shop_item(item: schemas.CoinShopCreate, db: Session = Depends(get_db)):
-    return crud.create_coin_shop_item(db, item)
+async def create_coin_shop_item(item: schemas.CoinShopCreate, db: WriterProxy = Depends(get_db)):
+    return await db.run_sync(crud.create_coin_shop_item, item)
 
 @router.put("/shop/{item_id}", response_model=schemas.CoinShop)
-def update_coin_shop_item(item_id: int, item: schemas.CoinShopUpdate, db: Session = Depends(get_db)):
-    db_item = crud.update_coin_shop_item(db, item_id, item)
+async def update_coin_shop_item(item_id: int, item: schemas.CoinShopUpdate, db: WriterProxy = Depends(get_db)):
+    db_item = await db.run_sync(crud.update_coin_shop_item, item_id, item)
     if db_item is None:
         raise HTTPException(status_code=404, detail="Shop item not found")
     return db_item
 
 @router.delete("/shop/{item_id}")
-def delete_coin_shop_item(item_id: int, db: Session = Depends(get_db)):
-    success = crud.delete_coin_shop_item(db, item_id)
+async def delete_coin_shop_item(item_id: int, db: WriterProxy = Depends(get_db)):
+    success = await db.run_sync(crud.delete_coin_shop_item, item_id)
     if not success:
         raise HTTPException(status_code=404, detail="Shop item not found")
     return {"detail": "Shop item deleted"}
 
 @router.post("/shop/{item_id}/purchase")
-def purchase_coin_shop_item(item_id: int, db: Session = Depends(get_db)):
-    result = crud.purchase_coin_shop_item(db, item_id)
-    if result is None:
+async def purchase_coin_shop_item(item_id: int):
+    result, reason = await writer.run_async(crud.purchase_coin_shop_item, item_id)
+    if reason == crud.PURCHASE_NOT_FOUND:
+        raise HTTPException(status_code=404, detail="Shop item not found")
+    if reason == crud.PURCHASE_OUT_OF_STOCK:
+        raise HTTPException(status_code=409, detail="Item is out of stock")
+    if reason == crud.PURCHASE_INSUFFICIENT_FUNDS:
+        raise HTTPException(status_code=400, detail="Not enough coins")
+    if reason is not None:
         raise HTTPException(status_code=400, detail="Cannot purchase item")
     return {"detail": "Item purchased successfully", "coin_transaction": result}
 
 # 通貨交換関連
 @router.get("/exchanges/", response_model=List[schemas.CoinExchange])
-def read_coin_exchanges(
+async def read_coin_exchanges(
+    response: Response,
     limit: int = Query(50, description="取得件数"),
-    db: Session = Depends(get_db)
+    before: Optional[str] = Query(None, description="このカーソルより古い履歴を取得"),
+    after: Optional[str] = Query(None, description="このカーソルより新しい履歴を取得"),
+    from_date: Optional[datetime] = Query(None, alias="from", description="この日時以降の履歴"),
+    to_date: Optional[datetime] = Query(None, alias="to", description="この日時以前の履歴"),
+    db: AsyncSession = Depends(get_read_db)
 ):
-    return crud.get_coin_exchanges(db, limit)
+    try:
+        exchanges = await db.run_sync(crud.get_coin_exchanges, limit, before, after, from_date, to_date)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    response.headers.update(cursor_headers(exchanges))
+    return exchanges
 
 @router.post("/exchanges/", response_model=schemas.CoinExchange)
-def create_coin_exchange(exchange: schemas.CoinExchangeCreate, db: Session = Depends(get_db)):
-    return crud.create_coin_exchange(db, exchange)
+async def create_coin_exchange(exchange: schemas.CoinExchangeCreate, db: WriterProxy = Depends(get_db)):
+    return await db.run_sync(crud.create_coin_exchange, exchange)
 
 @router.post("/exchange-to-points/")
-def exchange_coins_to_points(
+async def exchange_coins_to_points(
     coin_amount: int = Query(..., description="交換するコイン数"),
-    exchange_rate: float = Query(1.0, description="交換レート"),
-    db: Session = Depends(get_db)
+    exchange_rate: float = Query(1.0, description="交換レート")
 ):
-    result = crud.exchange_coins_to_points(db, coin_amount, exchange_rate)
+    result = await writer.run_async(crud.exchange_coins_to_points, coin_amount, exchange_rate)
     if result is None:
         raise HTTPException(status_code=400, detail="Cannot exchange coins")
     return {"detail": "Exchange successful", "result": result}
 
 # 統計関連
 @router.get("/statistics/")
-def get_coin_statistics(
+async def get_coin_statistics(
     days: int = Query(30, description="過去何日分の統計を取得するか"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
-    return crud.get_coin_statistics(db, days)
+    return await db.run_sync(crud.get_coin_statistics, days)
@@ -0,0 +1,35 @@
+from fastapi import APIRouter, HTTPException, Query
+from core.instrumentation import route_totals
+from core.slow_queries import slow_query_log
+
+# 開発用。main.py で環境変数 DEBUG_ENDPOINTS が有効なときだけ登録する
+router = APIRouter(
+    prefix="/debug",
+    tags=["debug"]
+)
+
+@router.get("/queries")
+async def get_query_totals():
+    """ルートごとのクエリ数・クエリ時間の累計（プロセス起動から、またはリセットから）"""
+    return route_totals.snapshot()
+
+@router.delete("/queries")
+async def reset_query_totals():
+    """累計をリセット"""
+    route_totals.reset()
+    return {"message": "Query totals reset"}
+
+@router.get("/slow-queries")
+async def get_slow_queries(limit: int = Query(50, ge=1, description="Number of entries (newest first)")):
+    """しきい値（SLOW_QUERY_MS）を超えたクエリの直近の記録"""
+    if slow_query_log is None:
+        raise HTTPException(status_code=404, detail="Slow query log is disabled (set SLOW_QUERY_MS)")
+    return slow_query_log.recent(limit)
+
+@router.delete("/slow-queries")
+async def clear_slow_queries():
+    """リングバッファを空にする（ファイルには残る）"""
+    if slow_query_log is None:
+        raise HTTPException(status_code=404, detail="Slow query log is disabled (set SLOW_QUERY_MS)")
+    slow_query_log.clear()
+    return {"message": "Slow query buffer cleared"}
@@ -1,129 +1,167 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
-from core.database import get_db
+from datetime import datetime
+from core.database import get_read_db
+from core.ledger_writer import WriterProxy, get_db, writer
 from models import points as models
 from schemas import points as schemas
 from crud import points as crud
+from crud.pagination import cursor_headers
+from crud.ledger_import import LedgerImportError, import_stream
 
 router = APIRouter(prefix="/points", tags=["points"])
 
 # ポイント取引関連
 @router.get("/", response_model=List[schemas.Point])
-def read_points(
+async def read_points(
+    response: Response,
     point_type: Optional[str] = Query(None, description="ポイントタイプでフィルタ"),
     category: Optional[str] = Query(None, description="カテゴリでフィルタ"),
     limit: int = Query(100, description="取得件数"),
-    db: Session = Depends(get_db)
+    before: Optional[str] = Query(None, description="このカーソルより古い取引を取得"),
+    after: Optional[str] = Query(None, description="このカーソルより新しい取引を取得"),
+    from_date: Optional[datetime] = Query(None, alias="from", description="この日時以降の取引"),
+    to_date: Optional[datetime] = Query(None, alias="to", description="この日時以前の取引"),
+    db: AsyncSession = Depends(get_read_db)
 ):
-    return crud.get_points(db, point_type, category, limit)
+    try:
+        points = await db.run_sync(crud.get_points, point_type, category, limit, before, after, from_date, to_date)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    response.headers.update(cursor_headers(points))
+    return points
 
 @router.get("/{point_id}", response_model=schemas.Point)
-def read_point(point_id: int, db: Session = Depends(get_db)):
-    point = crud.get_point(db, point_id)
+async def read_point(point_id: int, db: AsyncSession = Depends(get_read_db)):
+    point = await db.run_sync(crud.get_point, point_id)
     if point is None:
         raise HTTPException(status_code=404, detail="Point not found")
     return point
 
 @router.post("/", response_model=schemas.Point)
-def create_point(point: schemas.PointCreate, db: Session = Depends(get_db)):
-    return crud.create_point(db, point)
+async def create_point(point: schemas.PointCreate):
+    return await writer.run_async(crud.create_point, point)
 
 @router.put("/{point_id}", response_model=schemas.Point)
-def update_point(point_id: int, point: schemas.PointUpdate, db: Session = Depends(get_db)):
-    db_point = crud.update_point(db, point_id, point)
+async def update_point(point_id: int, point: schemas.PointUpdate):
+    db_point = await writer.run_async(crud.update_point, point_id, point)
     if db_point is None:
         raise HTTPException(status_code=404, detail="Point not found")
     return db_point
 
 @router.delete("/{point_id}")
-def delete_point(point_id: int, db: Session = Depends(get_db)):
-    success = crud.delete_point(db, point_id)
+async def delete_point(point_id: int):
+    success = await writer.run_async(crud.delete_point, point_id)
     if not success:
         raise HTTPException(status_code=404, detail="Point not found")
     return {"detail": "Point deleted"}
 
+@router.post("/import")
+async def import_points(
+    request: Request,
+    fmt: str = Query("ndjson", alias="format", description="ndjson または csv"),
+    batch_size: int = Query(5000, description="1回のコミットで取り込む件数"),
+    skip_lines: int = Query(0, ge=0, description="この行までは取り込み済みとして読み飛ばす（エラー時の committed_line）")
+):
+    """ポイント取引をNDJSON/CSVからストリーミングで一括取り込み
+
+    バッチごとにコミットする。不正な行があれば400で、取り込み済みの件数と続きの位置（committed_line）を返す。
+    """
+    try:
+        return await import_stream(request.stream(), "point", fmt, writer, batch_size, skip_lines)
+    except LedgerImportError as e:
+        raise HTTPException(status_code=400, detail={
+            "message": str(e), "line": e.line_no, "imported": e.imported, "committed_line": e.committed_line
+        })
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
 @router.get("/balance/")
-def get_current_balance(db: Session = Depends(get_db)):
-    return {"balance": crud.get_current_balance(db)}
+async def get_current_balance(db: AsyncSession = Depends(get_read_db)):
+    return {"balance": await db.run_sync(crud.get_current_balance)}
 
 # ポイント目標関連
 @router.get("/goals/", response_model=List[schemas.PointGoal])
-def read_point_goals(
+async def read_point_goals(
     completed: Optional[bool] = Query(None, description="完了状態でフィルタ"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
-    return crud.get_point_goals(db, completed)
+    return await db.run_sync(crud.get_point_goals, completed)
 
 @router.get("/goals/{goal_id}", response_model=schemas.PointGoal)
-def read_point_goal(goal_id: int, db: Session = Depends(get_db)):
-    goal = crud.get_point_goal(db, goal_id)
+async def read_point_goal(goal_id: int, db: AsyncSession = Depends(get_read_db)):
+    goal = await db.run_sync(crud.get_point_goal, goal_id)
     if goal is None:
         raise HTTPException(status_code=404, detail="Point goal not found")
     return goal
 
 @router.post("/goals/", response_model=schemas.PointGoal)
-def create_point_goal(goal: schemas.PointGoalCreate, db: Session = Depends(get_db)):
-    return crud.create_point_goal(db, goal)
+async def create_point_goal(goal: schemas.PointGoalCreate, db: WriterProxy = Depends(get_db)):
+    return await db.run_sync(crud.create_point_goal, goal)
 
 @router.put("/goals/{goal_id}", response_model=schemas.PointGoal)
-def update_point_goal(goal_id: int, goal: schemas.PointGoalUpdate, db: Session = Depends(get_db)):
-    db_goal = crud.update_point_goal(db, goal_id, goal)
+async def update_point_goal(goal_id: int, goal: schemas.PointGoalUpdate, db: WriterProxy = Depends(get_db)):
+    db_goal = await db.run_sync(crud.update_point_goal, goal_id, goal)
     if db_goal is None:
         raise HTTPException(status_code=404, detail="Point goal not found")
     return db_goal
 
 @router.delete("/goals/{goal_id}")
-def delete_point_goal(goal_id: int, db: Session = Depends(get_db)):
-    success = crud.delete_point_goal(db, goal_id)
+async def delete_point_goal(goal_id: int, db: WriterProxy = Depends(get_db)):
+    success = await db.run_sync(crud.delete_point_goal, goal_id)
     if not success:
         raise HTTPException(status_code=404, detail="Point goal not found")
     return {"detail": "Point goal deleted"}
 
 # ポイント報酬関連
 @router.get("/rewards/", response_model=List[schemas.PointReward])
-def read_point_rewards(
+async def read_point_rewards(
     is_available: Optional[bool] = Query(None, description="利用可能状態でフィルタ"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
-    return crud.get_point_rewards(db, is_available)
+    return await db.run_sync(crud.get_point_rewards, is_available)
 
 @router.get("/rewards/{reward_id}", response_model=schemas.PointReward)
-def read_point_reward(reward_id: int, db: Session = Depends(get_db)):
-    reward = crud.get_point_reward(db, reward_id)
+async def read_point_reward(reward_id: int, db: AsyncSession = Depends(get_read_db)):
+    reward = await db.run_sync(crud.get_point_reward, reward_id)
     if reward is None:
         raise HTTPException(status_code=404, detail="Point reward not found")
     return reward
 
 @router.post("/rewards/", response_model=schemas.PointReward)
-def create_point_reward(reward: schemas.PointRewardCreate, db: Session = Depends(get_db)):
-    return crud.create_point_reward(db, reward)
+async def create_point_reward(reward: schemas.PointRewardCreate, db: WriterProxy = Depends(get_db)):
+    return await db.run_sync(crud.create_point_reward, reward)
 
 @router.put("/rewards/{reward_id}", response_model=schemas.PointReward)
-def update_point_reward(reward_id: int, reward: schemas.PointRewardUpdate, db: Session = Depends(get_db)):
-    db_reward = crud.update_point_reward(db, reward_id, reward)
+async def update_point_reward(reward_id: int, reward: schemas.PointRewardUpdate, db: WriterProxy = Depends(get_db)):
+    db_reward = await db.run_sync(crud.update_point_reward, reward_id, reward)
     if db_reward is None:
         raise HTTPException(status_code=404, detail="Point reward not found")
     return db_reward
 
 @router.delete("/rewards/{reward_id}")
-def delete_point_reward(reward_id: int, db: Session = Depends(get_db)):
-    success = crud.delete_point_reward(db, reward_id)
+async def delete_point_reward(reward_id: int, db: WriterProxy = Depends(get_db)):
+    success = await db.run_sync(crud.delete_point_reward, reward_id)
     if not success:
         raise HTTPException(status_code=404, detail="Point reward not found")
     return {"detail": "Point reward deleted"}
 
 @router.post("/rewards/{reward_id}/use")
-def use_point_reward(reward_id: int, db: Session = Depends(get_db)):
-    result = crud.use_point_reward(db, reward_id)
-    if result is None:
+async def use_point_reward(reward_id: int):
+    result, reason = await writer.run_async(crud.use_point_reward, reward_id)
+    if reason == crud.REWARD_NOT_FOUND:
+        raise HTTPException(status_code=404, detail="Point reward not found")
+    if reason == crud.REWARD_INSUFFICIENT_FUNDS:
+        raise HTTPException(status_code=400, detail="Not enough points")
+    if reason is not None:
         raise HTTPException(status_code=400, detail="Cannot use reward")
     return {"detail": "Reward used successfully", "point_transaction": result}
 
 # 統計関連
 @router.get("/statistics/")
-def get_point_statistics(
+async def get_point_statistics(
     days: int = Query(30, description="過去何日分の統計を取得するか"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
-    return crud.get_point_statistics(db, days)
+    return await db.run_sync(crud.get_point_statistics, days)
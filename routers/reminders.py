@@ -1,84 +1,90 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
-from core.database import get_db
+from core.database import get_read_db
+from core.reminder_scheduler import reminder_scheduler, reminder_event, overdue_event, daily_reset_event
 from crud import tasks as crud
+from crud import jobs as job_crud
 from datetime import datetime, timedelta
+import asyncio
 import json
 
+# 配信のない間に送るコメント行の間隔（秒）。プロキシにアイドル接続を切られないようにする
+STREAM_KEEPALIVE_SECONDS = 15
+
 router = APIRouter(
     prefix="/reminders",
     tags=["reminders"]
 )
 
 @router.get("/upcoming")
-def get_upcoming_reminders(
-    db: Session = Depends(get_db),
+async def get_upcoming_reminders(
+    db: AsyncSession = Depends(get_read_db),
     hours: int = Query(24, description="Hours ahead to check for reminders")
 ):
-    """指定時間内のリマインダーを取得"""
+    """指定時間内のリマインダーを取得（リマインダー時刻はタスクの変更時に task_reminders に保存済み）"""
     now = datetime.now()
     end_time = now + timedelta(hours=hours)
     
-    # 期限があるタスクを取得
-    tasks_with_deadline = crud.get_tasks_by_deadline(db, days=hours//24)
-    
-    reminders = []
-    for task in tasks_with_deadline:
-        if task.deadline:
-            # 睡眠時間を考慮したリマインダー時間を計算
-            # 予定睡眠時間から10時間前、または期限の30分前の早い方
-            sleep_time = datetime.now().replace(hour=23, minute=0, second=0, microsecond=0)  # 23:00を仮定
-            reminder_time_1 = sleep_time - timedelta(hours=10)  # 睡眠10時間前
-            reminder_time_2 = task.deadline - timedelta(minutes=30)  # 期限30分前
-            
-            reminder_time = min(reminder_time_1, reminder_time_2)
-            
-            if now <= reminder_time <= end_time:
-                reminders.append({
-                    "task_id": task.id,
-                    "task_title": task.title,
-                    "deadline": task.deadline.isoformat(),
-                    "reminder_time": reminder_time.isoformat(),
-                    "type": "deadline_reminder",
-                    "message": f"タスク「{task.title}」の期限が近づいています"
-                })
+    upcoming = await db.run_sync(crud.get_upcoming_reminders, now, end_time)
     
-    return reminders
+    return [reminder_event(task, task.reminder_time) for task in upcoming]
 
 @router.get("/overdue")
-def get_overdue_reminders(db: Session = Depends(get_db)):
+async def get_overdue_reminders(db: AsyncSession = Depends(get_read_db)):
     """期限切れのリマインダーを取得"""
-    overdue_tasks = crud.get_overdue_tasks(db)
-    
-    reminders = []
-    for task in overdue_tasks:
-        reminders.append({
-            "task_id": task.id,
-            "task_title": task.title,
-            "deadline": task.deadline.isoformat() if task.deadline else None,
-            "overdue_hours": int((datetime.now() - task.deadline).total_seconds() / 3600) if task.deadline else 0,
-            "type": "overdue_reminder",
-            "message": f"タスク「{task.title}」の期限が過ぎています"
-        })
+    overdue_tasks = await db.run_sync(crud.get_overdue_tasks)
     
-    return reminders
+    now = datetime.now()
+    return [overdue_event(task, now) for task in overdue_tasks]
 
 @router.get("/daily-reset")
-def get_daily_reset_reminders(db: Session = Depends(get_db)):
+async def get_daily_reset_reminders(db: AsyncSession = Depends(get_read_db)):
     """毎日タスクのリセットリマインダー"""
-    daily_tasks = crud.get_daily_tasks(db)
-    
-    reminders = []
-    for task in daily_tasks:
-        if task.completed:
-            # 完了した毎日タスクのリセットリマインダー
-            reminders.append({
-                "task_id": task.id,
-                "task_title": task.title,
-                "completed_at": task.completed_at.isoformat() if task.completed_at else None,
-                "type": "daily_reset",
-                "message": f"毎日タスク「{task.title}」をリセットできます"
-            })
+    daily_tasks = await db.run_sync(crud.get_daily_tasks)
     
-    return reminders
+    # 完了した毎日タスクのリセットリマインダー
+    return [daily_reset_event(task) for task in daily_tasks if task.completed]
+
+@router.get("/daily-reset/last-run")
+async def get_daily_reset_last_run(db: AsyncSession = Depends(get_read_db)):
+    """毎日タスクのリセットの最後の実行と次の予定"""
+    run = await db.run_sync(job_crud.get_last_run, job_crud.DAILY_RESET)
+    return {
+        "reset_time": job_crud.DAILY_RESET_TIME,
+        "next_run_at": job_crud.next_reset(datetime.now()).isoformat(),
+        "last_run": None if run is None else {
+            "run_key": run.run_key,
+            "started_at": run.started_at.isoformat() if run.started_at else None,
+            "finished_at": run.finished_at.isoformat() if run.finished_at else None,
+            "duration_ms": run.duration_ms,
+            "reset_tasks": run.rows,
+        },
+    }
+
+@router.get("/stream")
+async def stream_reminders():
+    """リマインダー・期限切れ・毎日タスクのリセットを発生時にServer-Sent Eventsで配信
+
+    イベント名は reminder / overdue / daily_reset。reminder・overdue の data は /upcoming・/overdue の各要素と同じJSON、
+    daily_reset は毎日タスクのリセット（DAILY_RESET_TIME）の実行結果。
+    """
+    async def events():
+        queue = reminder_scheduler.subscribe()
+        try:
+            yield "retry: 5000\n: connected\n\n"
+            while True:
+                try:
+                    event_id, kind, payload = await asyncio.wait_for(queue.get(), STREAM_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                yield f"id: {event_id}\nevent: {kind}\ndata: {json.dumps(payload, ensure_ascii=False)}\n\n"
+        finally:
+            reminder_scheduler.unsubscribe(queue)
+
+    return StreamingResponse(
+        events(), media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
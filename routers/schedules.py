@@ -1,7 +1,8 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
-from core.database import get_db
+from core.database import get_read_db
+from core.ledger_writer import WriterProxy, get_db
 from schemas import schedules as schemas
 from crud import schedules as crud
 from datetime import datetime, timedelta
@@ -12,8 +13,8 @@ router = APIRouter(
 )
 
 @router.get("/", response_model=List[schemas.Schedule])
-def read_schedules(
-    db: Session = Depends(get_db),
+async def read_schedules(
+    db: AsyncSession = Depends(get_read_db),
     start_date: Optional[str] = Query(None, description="Start date (YYYY-MM-DD)"),
     end_date: Optional[str] = Query(None, description="End date (YYYY-MM-DD)"),
     schedule_type: Optional[str] = Query(None, description="Schedule type: fixed or flexible")
@@ -27,69 +28,51 @@ def read_schedules(
     if end_date:
         end_dt = datetime.fromisoformat(end_date)
     
-    return crud.get_schedules(db, start_dt, end_dt, schedule_type)
-
-@router.get("/{schedule_id}", response_model=schemas.Schedule)
-def read_schedule(schedule_id: int, db: Session = Depends(get_db)):
-    """特定のスケジュールを取得"""
-    schedule = crud.get_schedule(db, schedule_id)
-    if not schedule:
-        raise HTTPException(status_code=404, detail="Schedule not found")
-    return schedule
+    return await db.run_sync(crud.get_schedules, start_dt, end_dt, schedule_type)
 
 @router.post("/", response_model=schemas.Schedule)
-def create_schedule(schedule: schemas.ScheduleCreate, db: Session = Depends(get_db)):
+async def create_schedule(schedule: schemas.ScheduleCreate, db: WriterProxy = Depends(get_db)):
     """新しいスケジュールを作成"""
-    return crud.create_schedule(db, schedule)
+    return await db.run_sync(crud.create_schedule, schedule)
 
 @router.put("/{schedule_id}", response_model=schemas.Schedule)
-def update_schedule(schedule_id: int, schedule_update: schemas.ScheduleUpdate, db: Session = Depends(get_db)):
+async def update_schedule(schedule_id: int, schedule_update: schemas.ScheduleUpdate, db: WriterProxy = Depends(get_db)):
     """スケジュールを更新"""
-    updated_schedule = crud.update_schedule(db, schedule_id, schedule_update)
+    updated_schedule = await db.run_sync(crud.update_schedule, schedule_id, schedule_update)
     if not updated_schedule:
         raise HTTPException(status_code=404, detail="Schedule not found")
     return updated_schedule
 
 @router.delete("/{schedule_id}")
-def delete_schedule(schedule_id: int, db: Session = Depends(get_db)):
+async def delete_schedule(schedule_id: int, db: WriterProxy = Depends(get_db)):
     """スケジュールを削除"""
-    success = crud.delete_schedule(db, schedule_id)
+    success = await db.run_sync(crud.delete_schedule, schedule_id)
     if not success:
         raise HTTPException(status_code=404, detail="Schedule not found")
     return {"detail": "Schedule deleted"}
 
 @router.patch("/{schedule_id}/complete", response_model=schemas.Schedule)
-def complete_schedule(schedule_id: int, db: Session = Depends(get_db)):
+async def complete_schedule(schedule_id: int, db: WriterProxy = Depends(get_db)):
     """スケジュールを完了にする"""
-    schedule = crud.get_schedule(db, schedule_id)
+    schedule = await db.run_sync(crud.set_schedule_completed, schedule_id, True)
     if not schedule:
         raise HTTPException(status_code=404, detail="Schedule not found")
-    
-    schedule.completed = True
-    schedule.updated_at = datetime.now()
-    db.commit()
-    db.refresh(schedule)
     return schedule
 
 @router.patch("/{schedule_id}/undo", response_model=schemas.Schedule)
-def undo_schedule(schedule_id: int, db: Session = Depends(get_db)):
+async def undo_schedule(schedule_id: int, db: WriterProxy = Depends(get_db)):
     """スケジュールの完了を取り消す"""
-    schedule = crud.get_schedule(db, schedule_id)
+    schedule = await db.run_sync(crud.set_schedule_completed, schedule_id, False)
     if not schedule:
         raise HTTPException(status_code=404, detail="Schedule not found")
-    
-    schedule.completed = False
-    schedule.updated_at = datetime.now()
-    db.commit()
-    db.refresh(schedule)
     return schedule
 
 @router.get("/free-time/{date}", response_model=List[schemas.FreeTimeSlot])
-def get_free_time_slots(
+async def get_free_time_slots(
     date: str,
     min_duration: int = Query(30, description="Minimum duration in minutes"),
     max_fatigue: int = Query(10, description="Maximum fatigue level"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """指定日の空き時間を取得"""
     try:
@@ -97,19 +80,19 @@ def get_free_time_slots(
     except ValueError:
         raise HTTPException(status_code=400, detail="Invalid date format. Use YYYY-MM-DD")
     
-    return crud.find_free_time_slots(db, target_date, min_duration, max_fatigue)
+    return await db.run_sync(crud.find_free_time_slots, target_date, min_duration, max_fatigue)
 
 @router.get("/today", response_model=List[schemas.Schedule])
-def get_today_schedules(db: Session = Depends(get_db)):
+async def get_today_schedules(db: AsyncSession = Depends(get_read_db)):
     """今日のスケジュールを取得"""
     today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
     tomorrow = today + timedelta(days=1)
-    return crud.get_schedules(db, today, tomorrow)
+    return await db.run_sync(crud.get_schedules, today, tomorrow)
 
 @router.get("/week", response_model=List[schemas.Schedule])
-def get_week_schedules(
+async def get_week_schedules(
     start_date: Optional[str] = Query(None, description="Start date (YYYY-MM-DD)"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """週間スケジュールを取得"""
     if start_date:
@@ -124,4 +107,13 @@ def get_week_schedules(
         start_dt = start_dt.replace(hour=0, minute=0, second=0, microsecond=0)
     
     end_dt = start_dt + timedelta(days=7)
-    return crud.get_schedules(db, start_dt, end_dt)
+    return await db.run_sync(crud.get_schedules, start_dt, end_dt)
+
+# IDで取得するルートは /today などの固定パスより後に登録する（先にあると固定パスがIDとして解釈され422になる）
+@router.get("/{schedule_id}", response_model=schemas.Schedule)
+async def read_schedule(schedule_id: int, db: AsyncSession = Depends(get_read_db)):
+    """特定のスケジュールを取得"""
+    schedule = await db.run_sync(crud.get_schedule, schedule_id)
+    if not schedule:
+        raise HTTPException(status_code=404, detail="Schedule not found")
+    return schedule
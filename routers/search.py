@@ -0,0 +1,24 @@
+from fastapi import APIRouter, Depends, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from core.database import get_read_db
+from schemas import search as schemas
+from crud import search as crud
+
+router = APIRouter(prefix="/search", tags=["search"])
+
+@router.get("", response_model=List[schemas.SearchResult])
+async def search(
+    response: Response,
+    q: str = Query(..., min_length=1, description="検索語（空白区切りで全語を含むものを検索）"),
+    types: Optional[List[schemas.SearchType]] = Query(None, description="種類で絞り込み（複数指定可）"),
+    limit: int = Query(20, ge=1, le=100, description="取得件数"),
+    offset: int = Query(0, ge=0, description="読み飛ばす件数"),
+    db: AsyncSession = Depends(get_read_db)
+):
+    kinds = [kind.value for kind in types] if types else None
+    # 1件多く取り、続きがあれば次ページのオフセットをヘッダーで返す
+    results = await db.run_sync(crud.search, q, kinds, limit + 1, offset)
+    if len(results) > limit:
+        response.headers["X-Next-Offset"] = str(offset + limit)
+    return results[:limit]
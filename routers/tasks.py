@@ -1,7 +1,9 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
-from core.database import get_db
+from core.database import get_read_db
+from core.ledger_writer import WriterProxy, get_db
+from core.reminder_scheduler import reminder_scheduler
 from schemas import tasks as schemas
 from crud import tasks as crud
 
@@ -11,82 +13,101 @@ router = APIRouter(
 )
 
 @router.get("/", response_model=List[schemas.Task])
-def read_tasks(
-    db: Session = Depends(get_db),
+async def read_tasks(
+    db: AsyncSession = Depends(get_read_db),
     task_type: Optional[str] = Query(None, description="Task type: daily or normal"),
     category: Optional[str] = Query(None, description="Task category"),
     completed: Optional[bool] = Query(None, description="Filter by completion status")
 ):
-    return crud.get_tasks(db, task_type, category, completed)
+    return await db.run_sync(crud.get_tasks, task_type, category, completed)
 
 @router.get("/daily", response_model=List[schemas.Task])
-def read_daily_tasks(db: Session = Depends(get_db)):
-    return crud.get_daily_tasks(db)
+async def read_daily_tasks(db: AsyncSession = Depends(get_read_db)):
+    return await db.run_sync(crud.get_daily_tasks)
 
 @router.get("/overdue", response_model=List[schemas.Task])
-def read_overdue_tasks(db: Session = Depends(get_db)):
-    return crud.get_overdue_tasks(db)
+async def read_overdue_tasks(db: AsyncSession = Depends(get_read_db)):
+    return await db.run_sync(crud.get_overdue_tasks)
 
 @router.get("/deadline/{days}", response_model=List[schemas.Task])
-def read_tasks_by_deadline(days: int, db: Session = Depends(get_db)):
-    return crud.get_tasks_by_deadline(db, days)
+async def read_tasks_by_deadline(days: int, db: AsyncSession = Depends(get_read_db)):
+    return await db.run_sync(crud.get_tasks_by_deadline, days)
 
 @router.get("/history", response_model=List[schemas.Task])
-def read_task_history(
+async def read_task_history(
     limit: int = Query(50, description="Number of history items to return"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
-    return crud.get_task_history(db, limit)
+    return await db.run_sync(crud.get_task_history, limit)
 
 @router.get("/statistics")
-def read_task_statistics(db: Session = Depends(get_db)):
-    return crud.get_task_statistics(db)
+async def read_task_statistics(db: AsyncSession = Depends(get_read_db)):
+    return await db.run_sync(crud.get_task_statistics)
 
 @router.get("/{task_id}", response_model=schemas.Task)
-def read_task(task_id: int, db: Session = Depends(get_db)):
-    task = crud.get_task(db, task_id)
+async def read_task(task_id: int, db: AsyncSession = Depends(get_read_db)):
+    task = await db.run_sync(crud.get_task, task_id)
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
     return task
 
 @router.post("/", response_model=schemas.Task)
-def create_task(task: schemas.TaskCreate, db: Session = Depends(get_db)):
-    return crud.create_task(db, task)
+async def create_task(task: schemas.TaskCreate, db: WriterProxy = Depends(get_db)):
+    created_task = await db.run_sync(crud.create_task, task)
+    # 配信中のリマインダーの予定に加える
+    reminder_scheduler.task_changed(created_task)
+    return created_task
+
+@router.post("/batch", response_model=List[schemas.TaskBatchResult])
+async def batch_tasks(batch: schemas.TaskBatchRequest, db: WriterProxy = Depends(get_db)):
+    """作成・更新・完了・取り消し・削除をまとめて1トランザクションで実行（結果は操作ごと）"""
+    results = await db.run_sync(crud.batch_tasks, batch.operations)
+    for result in results:
+        if result.get("task") is not None:
+            reminder_scheduler.task_changed(result["task"])
+        elif result["op"] == schemas.TaskBatchOp.DELETE and result["status"] == 200:
+            reminder_scheduler.task_removed(result["id"])
+    return results
 
 @router.put("/{task_id}", response_model=schemas.Task)
-def update_task(task_id: int, task_update: schemas.TaskUpdate, db: Session = Depends(get_db)):
-    updated_task = crud.update_task(db, task_id, task_update)
+async def update_task(task_id: int, task_update: schemas.TaskUpdate, db: WriterProxy = Depends(get_db)):
+    updated_task = await db.run_sync(crud.update_task, task_id, task_update)
     if not updated_task:
         raise HTTPException(status_code=404, detail="Task not found")
+    reminder_scheduler.task_changed(updated_task)
     return updated_task
 
 @router.patch("/{task_id}/complete")
-def complete_task(task_id: int, db: Session = Depends(get_db)):
+async def complete_task(task_id: int, db: WriterProxy = Depends(get_db)):
     task_update = schemas.TaskUpdate(completed=True)
-    updated_task = crud.update_task(db, task_id, task_update)
+    updated_task = await db.run_sync(crud.update_task, task_id, task_update)
     if not updated_task:
         raise HTTPException(status_code=404, detail="Task not found")
+    # 完了したタスクのリマインダー・期限切れの通知を予定から外す
+    reminder_scheduler.task_changed(updated_task)
     return {"message": "Task completed successfully"}
 
 @router.patch("/{task_id}/undo")
-def undo_task(task_id: int, db: Session = Depends(get_db)):
+async def undo_task(task_id: int, db: WriterProxy = Depends(get_db)):
     task_update = schemas.TaskUpdate(completed=False)
-    updated_task = crud.update_task(db, task_id, task_update)
+    updated_task = await db.run_sync(crud.update_task, task_id, task_update)
     if not updated_task:
         raise HTTPException(status_code=404, detail="Task not found")
+    reminder_scheduler.task_changed(updated_task)
     return {"message": "Task undone successfully"}
 
 @router.delete("/{task_id}")
-def delete_task(task_id: int, db: Session = Depends(get_db)):
-    success = crud.delete_task(db, task_id)
+async def delete_task(task_id: int, db: WriterProxy = Depends(get_db)):
+    success = await db.run_sync(crud.delete_task, task_id)
     if not success:
         raise HTTPException(status_code=404, detail="Task not found")
+    reminder_scheduler.task_removed(task_id)
     return {"detail": "Task deleted"}
 
 @router.post("/from-history/{task_id}")
-def create_task_from_history(task_id: int, db: Session = Depends(get_db)):
+async def create_task_from_history(task_id: int, db: WriterProxy = Depends(get_db)):
     """履歴から新しいタスクを作成"""
-    original_task = crud.get_task(db, task_id)
+    original_task = await db.run_sync(crud.get_task, task_id)
     if not original_task:
         raise HTTPException(status_code=404, detail="Task not found")
     
@@ -104,4 +125,4 @@ def create_task_from_history(task_id: int, db: Session = Depends(get_db)):
         completed=False
     )
     
-    return crud.create_task(db, new_task_data)
+    return await db.run_sync(crud.create_task, new_task_data)
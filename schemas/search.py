@@ -0,0 +1,18 @@
+from pydantic import BaseModel
+from enum import Enum
+
+class SearchType(str, Enum):
+    TASK = "task"
+    STUDY = "study"
+    SCHEDULE = "schedule"
+    MEAL = "meal"
+
+class SearchResult(BaseModel):
+    type: SearchType
+    id: int
+    title: str
+    snippet: str
+    rank: float
+
+    class Config:
+        from_attributes = True
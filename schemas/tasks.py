@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Union, Optional
+from typing import Union, Optional, List
 from datetime import datetime
 from enum import Enum
 
@@ -42,3 +42,28 @@ class Task(TaskBase):
 
     class Config:
         from_attributes = True
+
+# 一括操作（POST /tasks/batch）
+class TaskBatchOp(str, Enum):
+    CREATE = "create"
+    UPDATE = "update"
+    COMPLETE = "complete"
+    UNDO = "undo"
+    DELETE = "delete"
+
+class TaskBatchOperation(BaseModel):
+    op: TaskBatchOp
+    id: Optional[int] = None  # create 以外で必須
+    task: Optional[TaskCreate] = None  # create で必須
+    changes: Optional[TaskUpdate] = None  # update で必須
+
+class TaskBatchRequest(BaseModel):
+    operations: List[TaskBatchOperation]
+
+class TaskBatchResult(BaseModel):
+    index: int  # operations 内の位置
+    op: TaskBatchOp
+    status: int  # 200 / 404（タスクがない） / 422（操作の指定が不正）
+    id: Optional[int] = None
+    task: Optional[Task] = None  # その操作を当てた後のタスク（delete では返さない）
+    detail: Optional[str] = None
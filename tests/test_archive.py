@@ -0,0 +1,24 @@
+from datetime import datetime, timedelta
+from sqlalchemy import func, select
+from core.ledger_writer import writer
+from crud import archive, coins, ledger
+from models import archive as archive_models
+from models import coins as coin_models
+from schemas import coins as schemas
+
+def add_coins(amounts):
+    return [writer.run(coins.create_coin, schemas.CoinCreate(amount=amount)) for amount in amounts]
+
+def test_archive_insert_archive_does_not_reuse_ids(read_db):
+    """最大IDの行をアーカイブした後に追加した行が、アーカイブ済みのIDと重ならない"""
+    first = add_coins([10, 20, 30])
+    assert writer.run(archive.archive_table, "coins", datetime.now() + timedelta(days=1)) >= len(first)
+
+    (entry,) = add_coins([40])
+    assert entry.id > max(coin.id for coin in first)
+    assert writer.run(archive.archive_table, "coins", datetime.now() + timedelta(days=2)) == 1
+
+    archived_ids = read_db.execute(select(archive_models.CoinArchive.id)).scalars().all()
+    assert len(archived_ids) == len(set(archived_ids))
+    assert read_db.execute(select(func.count()).select_from(coin_models.Coin)).scalar() == 0
+    assert writer.run(ledger.verify_chain, "coin")["ok"]
@@ -0,0 +1,62 @@
+import json
+from datetime import datetime, timedelta
+from core.ledger_writer import writer
+from crud import ledger
+
+def ndjson(rows: list) -> str:
+    return "\n".join(row if isinstance(row, str) else json.dumps(row) for row in rows) + "\n"
+
+def post_import(client, body: str, **params):
+    return client.post("/points/import", params=dict({"batch_size": 2}, **params), content=body.encode())
+
+def balance(client) -> int:
+    return client.get("/points/balance/").json()["balance"]
+
+def test_import_batch(client):
+    start = balance(client)
+    response = post_import(client, ndjson([
+        {"amount": 10, "point_type": "earned", "category": "exercise"},
+        {"amount": 4, "point_type": "spent"},
+        {"amount": 7},
+    ]))
+    assert response.status_code == 200
+    assert response.json()["imported"] == 3
+    assert response.json()["committed_line"] == 3
+    assert response.json()["balance"] == balance(client) == start + 13
+    assert writer.run(ledger.verify_chain, "point")["ok"]
+
+def test_bad_line_reports_committed_line_and_resumes(client):
+    start = balance(client)
+    rows = [{"amount": 1}, {"amount": 2}, {"amount": 3}, {"amount": -50, "point_type": "earned"}, {"amount": 5}]
+    response = post_import(client, ndjson(rows))
+    assert response.status_code == 400
+    detail = response.json()["detail"]
+    # 2件ずつコミットするので、4行目で止まると1・2行目だけが取り込み済み
+    assert (detail["line"], detail["imported"], detail["committed_line"]) == (4, 2, 2)
+    assert balance(client) == start + 3
+
+    rows[3] = {"amount": 4}
+    response = post_import(client, ndjson(rows), skip_lines=detail["committed_line"])
+    assert response.status_code == 200
+    assert response.json()["imported"] == 3
+    assert balance(client) == start + 15
+    assert writer.run(ledger.verify_chain, "point")["ok"]
+
+def test_non_object_line_is_rejected(client):
+    response = post_import(client, ndjson([{"amount": 1}, "[1, 2]"]))
+    assert response.status_code == 400
+    assert response.json()["detail"]["line"] == 2
+
+def test_out_of_order_rows_repair_chain(client):
+    """既存の取引より古い行を取り込むと、その位置以降の残高チェーンを組み直す"""
+    client.post("/points/", json={"amount": 20})
+    start = balance(client)
+    past = datetime.now() - timedelta(days=3)
+    response = post_import(client, ndjson([
+        {"amount": 6, "created_at": past.isoformat()},
+        {"amount": 2, "point_type": "spent", "created_at": (past - timedelta(hours=1)).isoformat()},
+    ]))
+    assert response.status_code == 200
+    assert response.json()["balance"] == balance(client) == start + 4
+    result = writer.run(ledger.verify_chain, "point", False)
+    assert result["ok"], result["first_mismatch"]
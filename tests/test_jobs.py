@@ -0,0 +1,28 @@
+from datetime import datetime
+from sqlalchemy import select, update
+from core.ledger_writer import writer
+from crud import jobs
+from crud import tasks as task_crud
+from models import tasks as task_models
+from schemas import tasks as task_schemas
+
+def create_completed_daily_task(db, completed_at: datetime) -> int:
+    task = task_crud.create_task(db, task_schemas.TaskCreate(title="daily reset test", type="daily"))
+    db.execute(update(task_models.Task).where(task_models.Task.id == task.id).values(completed=True, completed_at=completed_at))
+    db.commit()
+    return task.id
+
+def test_late_reset_keeps_tasks_completed_after_boundary(read_db):
+    """再起動後の遅れた実行（09:00）でも、リセット時刻（00:00）の後に完了したタスクは戻さない"""
+    before = writer.run(create_completed_daily_task, datetime(2030, 1, 1, 23, 0), batch=False)
+    after = writer.run(create_completed_daily_task, datetime(2030, 1, 2, 8, 0), batch=False)
+
+    run, ran = writer.run(jobs.reset_daily_tasks, datetime(2030, 1, 2, 9, 0), batch=False)
+    assert ran and run.run_key == "2030-01-02T00:00"
+    completed = dict(read_db.execute(
+        select(task_models.Task.id, task_models.Task.completed).where(task_models.Task.id.in_([before, after]))
+    ).all())
+    assert completed == {before: False, after: True}
+
+    # 同じ回は2度実行しない
+    assert writer.run(jobs.reset_daily_tasks, datetime(2030, 1, 2, 10, 0), batch=False)[1] is False
@@ -0,0 +1,131 @@
+import threading
+from datetime import date, datetime, timedelta
+import pytest
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+from core.database import SessionLocal, engine
+from core.ledger_writer import LedgerWriter, writer
+from core.query_plans import check_query_plans
+from crud import fixtures, ledger, points
+from models import ledger as models
+from models import points as point_models
+from schemas import points as point_schemas
+
+def get_rollup(db, currency: str, day: date, category: str):
+    rollup = models.LedgerDailyRollup
+    return db.execute(
+        select(rollup.earned, rollup.spent, rollup.transactions)
+        .where(rollup.currency == currency, rollup.day == day, rollup.category == category)
+    ).first()
+
+def test_balance_follows_entries(read_db):
+    start = ledger.get_balance(read_db, "point")
+    entries = [writer.run(points.create_point, point_schemas.PointCreate(amount=amount)) for amount in (5, 7, 11)]
+    read_db.expire_all()
+    assert ledger.get_balance(read_db, "point") == start + 23
+    assert entries[-1].balance_after == start + 23
+    assert writer.run(ledger.verify_chain, "point")["ok"]
+
+def create_point_goal(db, target_amount: int):
+    goal = point_models.PointGoal(title="goal test", target_amount=target_amount,
+                                  created_at=datetime.now() - timedelta(minutes=1))
+    db.add(goal)
+    db.flush()
+    return goal.id
+
+def get_goal_progress(read_db, goal_id: int):
+    goal = point_models.PointGoal
+    return tuple(read_db.execute(select(goal.current_amount, goal.completed).where(goal.id == goal_id)).one())
+
+def test_goals_follow_edited_and_deleted_entries(read_db):
+    """取引の編集・削除で獲得量が減ると目標の進捗も減り、目標額を割れば未達成に戻る"""
+    goal_id = writer.run(create_point_goal, 100)
+    first, second = [writer.run(points.create_point, point_schemas.PointCreate(amount=amount)) for amount in (60, 50)]
+    assert get_goal_progress(read_db, goal_id) == (110, True)
+
+    writer.run(points.update_point, second.id, point_schemas.PointUpdate(amount=20))
+    assert get_goal_progress(read_db, goal_id) == (80, False)
+    writer.run(points.update_point, first.id, point_schemas.PointUpdate(point_type="spent"))
+    assert get_goal_progress(read_db, goal_id) == (20, False)
+    writer.run(points.delete_point, second.id)
+    assert get_goal_progress(read_db, goal_id) == (0, False)
+
+def test_seeded_entries_advance_goals(read_db):
+    """SessionLocal で投入するフィクスチャの取引も、投入前からある目標に加算する"""
+    goal_id = writer.run(create_point_goal, 1000)
+    fixture = {"name": "goal-progress-test", "version": 1,
+               "tables": {"points": [{"amount": 30, "point_type": "earned", "category": "exercise"},
+                                     {"amount": 12, "point_type": "spent", "category": "exercise"}]}}
+    with SessionLocal() as db:
+        assert fixtures.load_fixture(db, fixture) == 2
+    assert get_goal_progress(read_db, goal_id) == (30, False)
+
+def add_dated_coins(db, entries: list):
+    """日時を指定して取引を追加し、残高チェーンを組み直す"""
+    for amount, coin_type, created_at in entries:
+        ledger.add_entry(db, "coin", amount=amount, coin_type=coin_type, category="other", created_at=created_at)
+    ledger.repair_chain(db, "coin", min(created_at for _, _, created_at in entries))
+
+def test_partial_day_totals_reads_only_the_window(read_db):
+    day = datetime(2001, 2, 3)
+    writer.run(add_dated_coins, [
+        (5, "earned", day.replace(hour=10)),
+        (7, "earned", day.replace(hour=14)),
+        (2, "spent", day.replace(hour=23, minute=59)),
+        (100, "earned", day + timedelta(days=1)),
+    ])
+    totals = ledger.partial_day_totals(read_db, "coin", day.replace(hour=12), day + timedelta(days=1))
+    assert [(ledger.enum_value(category), earned, spent, count) for category, earned, spent, count in totals] == [("other", 7, 2, 2)]
+
+def test_partial_day_totals_uses_created_at_index():
+    """統計で取引履歴を読む1日未満の範囲は、取引・アーカイブとも created_at のインデックスで引く"""
+    with SessionLocal() as db:
+        results = [result for result in check_query_plans(db) if result["probe"] == "ledger.partial_day_totals"]
+    assert results
+    assert all(result["full_scans"] == [] for result in results)
+
+def test_bump_rollup_adds_to_existing_row(read_db):
+    day = date(2001, 1, 1)
+    writer.run(ledger.bump_rollup, "coin", day, "test", 3, 0, 1)
+    writer.run(ledger.bump_rollup, "coin", day, "test", 4, 2, 2)
+    assert tuple(get_rollup(read_db, "coin", day, "test")) == (7, 2, 3)
+
+def test_bump_rollup_concurrent_writers(read_db):
+    """別々の接続（レプリカ相当）から同じ行へ同時に加算しても、加算が失われない"""
+    if engine.dialect.name == "sqlite":
+        pytest.skip("SQLiteの書き込みは単一ライターで直列化される")
+    day, writers, bumps = date(2001, 1, 2), 4, 25
+    replicas = create_engine(engine.url, pool_size=writers)
+    sessions = sessionmaker(bind=replicas)
+    errors = []
+
+    def bump():
+        try:
+            for _ in range(bumps):
+                with sessions() as db:
+                    ledger.bump_rollup(db, "coin", day, "test", 1, 0, 1)
+                    db.commit()
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=bump) for _ in range(writers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    replicas.dispose()
+    assert errors == []
+    assert tuple(get_rollup(read_db, "coin", day, "test")) == (writers * bumps, 0, writers * bumps)
+
+def test_writer_skips_cancelled_jobs():
+    """待つのをやめた書き込みは実行せず、ライターはその後の書き込みを続ける"""
+    local_writer = LedgerWriter()
+    started, release, ran = threading.Event(), threading.Event(), []
+    blocking = local_writer.submit(lambda db: (started.set(), release.wait(5)), batch=False)
+    assert started.wait(5)
+    cancelled = local_writer.submit(lambda db: ran.append("cancelled"))
+    assert cancelled.cancel()
+    release.set()
+    blocking.result(5)
+    assert local_writer.submit(lambda db: "next").result(5) == "next"
+    assert ran == []
@@ -0,0 +1,30 @@
+from datetime import datetime
+from alembic import command
+from sqlalchemy import create_engine, inspect, text
+from core.migrations import alembic_config, upgrade_database
+
+def test_upgrade_legacy_database(tmp_path):
+    """マイグレーション導入前のDB（ベースラインのテーブルだけで alembic_version が無い）を最新まで上げる"""
+    legacy = create_engine(f"sqlite:///{tmp_path}/legacy.db")
+    with legacy.begin() as connection:
+        command.upgrade(alembic_config(connection), "0001")
+        connection.execute(text("DROP TABLE alembic_version"))
+        connection.execute(
+            text("INSERT INTO coins (amount, coin_type, category, balance_after, created_at) "
+                 "VALUES (100, 'earned', 'daily_login', 100, :at), (30, 'spent', 'gaming', 70, :at)"),
+            {"at": datetime(2025, 9, 9, 6, 0)},
+        )
+    assert "account_balances" not in inspect(legacy).get_table_names()
+
+    upgrade_database(target_engine=legacy)
+
+    tables = set(inspect(legacy).get_table_names())
+    assert {"account_balances", "ledger_daily_rollups", "balance_checkpoints", "coins_archive"} <= tables
+    with legacy.connect() as connection:
+        rollups = connection.execute(
+            text("SELECT category, earned, spent, transactions FROM ledger_daily_rollups WHERE currency = 'coin' ORDER BY category")
+        ).all()
+        sequence = connection.execute(text("SELECT seq FROM sqlite_sequence WHERE name = 'coins'")).scalar()
+    assert [tuple(row) for row in rollups] == [("daily_login", 100, 0, 1), ("gaming", 0, 30, 1)]
+    assert sequence == 2
+    legacy.dispose()
@@ -0,0 +1,53 @@
+import base64
+from datetime import datetime
+import pytest
+from core.ledger_writer import writer
+from crud import ledger
+
+# 同じ created_at の取引だけを from/to で切り出してページングする
+CREATED_AT = datetime(2002, 3, 4, 5, 6, 7)
+
+def add_same_time_coins(db, count: int) -> list:
+    entries = [ledger.add_entry(db, "coin", amount=1, coin_type="earned", category="other", created_at=CREATED_AT)
+               for _ in range(count)]
+    ledger.repair_chain(db, "coin", CREATED_AT)
+    return [entry.id for entry in entries]
+
+@pytest.fixture(scope="module")
+def ids():
+    """新しい順（created_at が同じなのでIDの降順）"""
+    return writer.run(add_same_time_coins, 5)[::-1]
+
+def page(client, **params):
+    window = CREATED_AT.isoformat()
+    return client.get("/coins/", params=dict({"from": window, "to": window, "limit": 2}, **params))
+
+def page_ids(response) -> list:
+    assert response.status_code == 200
+    return [row["id"] for row in response.json()]
+
+def test_before_walks_rows_with_equal_created_at(client, ids):
+    pages = []
+    response = page(client)
+    while response.json():
+        pages.append(page_ids(response))
+        response = page(client, before=response.headers["x-next-cursor"])
+    assert pages == [ids[0:2], ids[2:4], ids[4:5]]
+    assert "x-next-cursor" not in response.headers and "x-prev-cursor" not in response.headers
+
+def test_after_returns_to_the_previous_page(client, ids):
+    first = page(client)
+    second = page(client, before=first.headers["x-next-cursor"])
+    assert page_ids(second) == ids[2:4]
+    # 前ページのカーソルから新しい側へ戻ると、最初のページと同じ行が同じ順で返る
+    back = page(client, after=second.headers["x-prev-cursor"])
+    assert page_ids(back) == page_ids(first) == ids[0:2]
+    assert back.headers["x-next-cursor"] == first.headers["x-next-cursor"]
+    assert back.headers["x-prev-cursor"] == first.headers["x-prev-cursor"]
+
+@pytest.mark.parametrize("cursor", ["not-a-cursor", base64.urlsafe_b64encode(b"2002-03-04|x").decode()])
+@pytest.mark.parametrize("direction", ["before", "after"])
+def test_malformed_cursor_is_400(client, ids, cursor, direction):
+    response = page(client, **{direction: cursor})
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid cursor"
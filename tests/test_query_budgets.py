@@ -0,0 +1,58 @@
+import pytest
+from sqlalchemy import text
+from core.instrumentation import assert_max_queries, assert_route_queries
+from core.ledger_writer import writer
+from crud import coins as coin_crud
+from crud import study as study_crud
+from schemas import coins as coin_schemas
+from schemas import study as study_schemas
+
+# 残高チェーンを直す取引の編集・削除のクエリ数の上限。直す範囲の件数でクエリ数が変わるため
+# ベンチマーク（benchmarks/query_budgets.json）では見ず、ここで決まった件数の取引に対して確かめる。
+# アーカイブ済みの台帳では、アーカイブの境界の確認で2クエリ増える。獲得量が変わると目標の更新で1クエリ増える
+LEDGER_EDIT_BUDGETS = {"PUT": 17, "DELETE": 15}
+
+def test_assert_max_queries_lists_statements(read_db):
+    with pytest.raises(AssertionError, match="2 queries"):
+        with assert_max_queries(1):
+            read_db.execute(text("SELECT 1"))
+            read_db.execute(text("SELECT 2"))
+
+def test_study_statistics_is_one_query(read_db):
+    """科目の数によらず1クエリ"""
+    for subject in ("math", "science", "programming"):
+        writer.run(study_crud.create_study, study_schemas.StudyCreate(title=f"{subject} drill", subject=subject), batch=False)
+    with assert_max_queries(1):
+        statistics = study_crud.get_study_statistics(read_db)
+    assert statistics["total_studies"] >= 3
+
+def test_study_statistics_route(client):
+    response = client.get("/study/statistics")
+    assert response.status_code == 200
+    assert_route_queries(response, 1)
+
+@pytest.mark.parametrize("ledger", ["coins", "points"])
+def test_ledger_edit_routes(client, ledger):
+    ids = [client.post(f"/{ledger}/", json={"amount": amount}).json()["id"] for amount in (10, 20, 30, 40, 50)]
+    balance = client.get(f"/{ledger}/balance/").json()["balance"]
+
+    response = client.put(f"/{ledger}/{ids[1]}", json={"amount": 25})
+    assert response.status_code == 200
+    assert_route_queries(response, LEDGER_EDIT_BUDGETS["PUT"])
+    response = client.delete(f"/{ledger}/{ids[2]}")
+    assert response.status_code == 200
+    assert_route_queries(response, LEDGER_EDIT_BUDGETS["DELETE"])
+
+    assert client.get(f"/{ledger}/balance/").json()["balance"] == balance + 5 - 30
+
+def test_ledger_post_counts_its_writes(client):
+    """取引の追加と目標の加算（コミット時にまとめて発行する文）も依頼元のリクエストに数える"""
+    with assert_max_queries(20) as stats:
+        writer.run(coin_crud.create_coin, coin_schemas.CoinCreate(amount=5))
+    statements = [statement.lstrip().upper() for statement in stats.statements]
+    assert any(statement.startswith("INSERT INTO COINS") for statement in statements)
+    assert any(statement.startswith("UPDATE COIN_GOALS") for statement in statements)
+
+    response = client.post("/coins/", json={"amount": 5})
+    assert response.status_code == 200
+    assert int(response.headers["x-query-count"]) == stats.count
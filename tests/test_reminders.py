@@ -0,0 +1,39 @@
+import time
+from datetime import datetime, timedelta
+from core.reminder_scheduler import reminder_scheduler
+
+def wait_until_loaded(timeout: float = 5.0):
+    """起動直後の予定の読み込みを待つ"""
+    deadline = time.monotonic() + timeout
+    while not reminder_scheduler.ready and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert reminder_scheduler.ready
+
+def create_task_due_soon(client) -> int:
+    deadline = (datetime.now() + timedelta(hours=2)).isoformat(timespec="seconds")
+    response = client.post("/tasks/", json={"title": "reminder test", "deadline": deadline})
+    assert response.status_code == 200
+    task_id = response.json()["id"]
+    assert reminder_scheduler.scheduled("overdue", task_id) == datetime.fromisoformat(deadline)
+    return task_id
+
+def test_completed_task_leaves_schedule(client):
+    wait_until_loaded()
+    task_id = create_task_due_soon(client)
+    assert client.patch(f"/tasks/{task_id}/complete").status_code == 200
+    assert reminder_scheduler.scheduled("overdue", task_id) is None
+    assert client.patch(f"/tasks/{task_id}/undo").status_code == 200
+    assert reminder_scheduler.scheduled("overdue", task_id) is not None
+
+def test_deleted_task_leaves_schedule(client):
+    wait_until_loaded()
+    task_id = create_task_due_soon(client)
+    assert client.delete(f"/tasks/{task_id}").status_code == 200
+    assert reminder_scheduler.scheduled("overdue", task_id) is None
+
+def test_batch_delete_leaves_schedule(client):
+    wait_until_loaded()
+    task_id = create_task_due_soon(client)
+    response = client.post("/tasks/batch", json={"operations": [{"op": "delete", "id": task_id}]})
+    assert response.status_code == 200
+    assert reminder_scheduler.scheduled("overdue", task_id) is None
@@ -0,0 +1,60 @@
+import pytest
+from core.database import SessionLocal, engine
+from core.query_plans import check_query_plans
+
+@pytest.fixture(scope="module")
+def items(client):
+    """検索対象（タイトル・説明に "zephyr" を含むタスクと学習、短い語 "qz" を含むタスク）"""
+    def create(path: str, **fields) -> int:
+        response = client.post(path, json=fields)
+        assert response.status_code == 200
+        return response.json()["id"]
+
+    return {
+        "title": create("/tasks/", title="Quarterly zephyr report"),
+        "description": create("/tasks/", title="Notes", description="mentions zephyr once"),
+        "study": create("/study/", title="Zephyr drills", subject="science"),
+        "short": create("/tasks/", title="qz zephyr inbox"),
+        "short_only": create("/tasks/", title="qz cleanup"),
+    }
+
+def search(client, **params):
+    response = client.get("/search", params=params)
+    assert response.status_code == 200
+    return response
+
+def found(response) -> set:
+    return {(result["type"], result["id"]) for result in response.json()}
+
+def test_trigram_search(client, items):
+    response = search(client, q="zephyr")
+    assert found(response) == {
+        ("task", items["title"]), ("task", items["description"]), ("study", items["study"]), ("task", items["short"]),
+    }
+    if engine.dialect.name == "sqlite":
+        # FTS5: タイトルに含むものが説明だけに含むものより上位で、スニペットに印が付く
+        order = [(result["type"], result["id"]) for result in response.json()]
+        assert order.index(("task", items["title"])) < order.index(("task", items["description"]))
+        assert all("<mark>" in result["snippet"] for result in response.json())
+
+    assert found(search(client, q="zephyr", types="study")) == {("study", items["study"])}
+
+def test_short_terms_fall_back_to_like(client, items):
+    """trigram で引けない3文字未満の語は部分一致で絞り込む（長い語と組み合わせた場合も）"""
+    assert found(search(client, q="qz")) == {("task", items["short"]), ("task", items["short_only"])}
+    assert found(search(client, q="zephyr qz")) == {("task", items["short"])}
+
+def test_next_offset_paging(client, items):
+    first = search(client, q="zephyr", limit=3)
+    assert first.headers["x-next-offset"] == "3"
+    second = search(client, q="zephyr", limit=3, offset=3)
+    assert "x-next-offset" not in second.headers
+    assert len(first.json()) == 3 and len(second.json()) == 1
+    assert found(first) | found(second) == found(search(client, q="zephyr"))
+
+def test_search_probes_use_the_index():
+    """manage.py explain の検索プローブ（PostgreSQLの部分一致は全件走査が前提）"""
+    with SessionLocal() as db:
+        results = [result for result in check_query_plans(db) if result["probe"].startswith("search.search")]
+    assert results
+    assert all(result["full_scans"] == [] for result in results)
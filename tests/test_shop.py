@@ -0,0 +1,33 @@
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+# 在庫付きアイテムへの同時購入（benchmarks/shop_purchase_stress.py の縮小版）
+PURCHASES = 20
+
+def purchase_concurrently(client, item_id: int) -> Counter:
+    with ThreadPoolExecutor(max_workers=PURCHASES) as pool:
+        responses = list(pool.map(lambda _: client.post(f"/coins/shop/{item_id}/purchase"), range(PURCHASES)))
+    return Counter(response.status_code for response in responses)
+
+def get_item(client, item_id: int) -> dict:
+    return client.get(f"/coins/shop/{item_id}").json()
+
+def test_concurrent_purchases_do_not_oversell(client):
+    stock, cost = 5, 3
+    client.post("/coins/", json={"amount": cost * PURCHASES})
+    item = client.post("/coins/shop/", json={"title": "limited", "cost": cost, "stock": stock}).json()
+    balance = client.get("/coins/balance/").json()["balance"]
+
+    assert purchase_concurrently(client, item["id"]) == {200: stock, 409: PURCHASES - stock}
+    item = get_item(client, item["id"])
+    assert (item["stock"], item["used_count"], item["is_available"]) == (0, stock, False)
+    assert client.get("/coins/balance/").json()["balance"] == balance - stock * cost
+
+def test_purchases_without_funds_release_stock(client):
+    balance = client.get("/coins/balance/").json()["balance"]
+    item = client.post("/coins/shop/", json={"title": "too expensive", "cost": balance + 1, "stock": 3}).json()
+
+    assert purchase_concurrently(client, item["id"]) == {400: PURCHASES}
+    item = get_item(client, item["id"])
+    assert (item["stock"], item["used_count"], item["is_available"]) == (3, 0, True)
+    assert client.get("/coins/balance/").json()["balance"] == balance
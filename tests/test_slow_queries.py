@@ -0,0 +1,15 @@
+from core import instrumentation
+from core.slow_queries import SlowQueryLog
+
+def test_slow_write_carries_route(client, monkeypatch):
+    """単一ライターがまとめて書く取引の追加・目標の加算も、遅いクエリのログに発行元のルートが残る"""
+    log = SlowQueryLog(0)
+    monkeypatch.setattr(instrumentation, "slow_query_log", log)
+    assert client.post("/points/", json={"amount": 7}).status_code == 200
+
+    routes = {}
+    for entry in log.recent():
+        routes.setdefault(entry["statement"].lstrip().upper().split("(")[0].strip(), set()).add(entry["route"])
+    assert routes["INSERT INTO POINTS"] == {"POST /points/"}
+    goal_updates = [statement for statement in routes if statement.startswith("UPDATE POINT_GOALS")]
+    assert goal_updates and all(routes[statement] == {"POST /points/"} for statement in goal_updates)
@@ -0,0 +1,21 @@
+from datetime import datetime, timedelta
+from core.instrumentation import assert_route_queries
+
+def test_batch_creates_keep_operation_order(client):
+    """作成は1文の複数行INSERTで入れ、結果のIDと内容は操作の順に対応する"""
+    deadline = (datetime.now() + timedelta(days=2)).isoformat(timespec="seconds")
+    existing = [client.post("/tasks/", json={"title": f"existing {i}"}).json()["id"] for i in range(2)]
+    operations = [{"op": "create", "task": {"title": f"new {i}", "priority": i, "deadline": deadline}} for i in range(10)]
+    operations += [{"op": "complete", "id": existing[0]}, {"op": "delete", "id": existing[1]}]
+
+    response = client.post("/tasks/batch", json={"operations": operations})
+    assert response.status_code == 200
+    # 対象の読み込み・更新・削除（リマインダーとタスク）・リマインダーの削除・作成・リマインダーの作成
+    assert_route_queries(response, 7)
+    results = response.json()
+    created = results[:10]
+    assert [result["task"]["title"] for result in created] == [f"new {i}" for i in range(10)]
+    assert [result["id"] for result in created] == sorted(result["id"] for result in created)
+    assert all(result["task"]["id"] == result["id"] for result in created)
+    assert [result["status"] for result in results[10:]] == [200, 200]
+    assert client.get(f"/tasks/{created[3]['id']}").json()["priority"] == 3